@@ -0,0 +1,54 @@
+"""
+Bulk API valuation throughput: sequential sync calls vs avaluate_many.
+
+The stub adds a fixed per-request latency so the gain from overlapping
+requests is visible. Run from the repo root:
+    python -m benchmarks.bench_async_valuation --items 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_server import StubServer
+from math_based_approach.async_api_valuation import AsyncAssetValuationUsingAPIs
+from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+from math_based_approach.price_cache import TTLCache
+
+
+def make_items(count):
+    names = ('used laptop', 'phone', 'road bike', 'oak table', 'antique coin')
+    return [(f'{names[i % len(names)]} #{i}', i % 8, 500.0) for i in range(count)]
+
+
+async def run_async(stub, items, concurrency):
+    async with stub.configure(AsyncAssetValuationUsingAPIs(concurrency=concurrency, price_cache=TTLCache())) as valuator:
+        return await valuator.avaluate_many(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=2000)
+    parser.add_argument('--sync-items', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.02, help='stub response delay in seconds')
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        items = make_items(args.items)
+
+        with stub.configure(AssetValuationUsingAPIs(price_cache=TTLCache())) as valuator:
+            start = time.perf_counter()
+            expected = [valuator.calculate_valuation(*item) for item in items[:args.sync_items]]
+            sync_rate = args.sync_items / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = asyncio.run(run_async(stub, items, args.concurrency))
+        async_rate = len(items) / (time.perf_counter() - start)
+
+    assert results[:args.sync_items] == expected, "async results differ from the sync path"
+    print(f"sync sequential : {sync_rate:10,.1f} items/sec")
+    print(f"avaluate_many   : {async_rate:10,.1f} items/sec  ({async_rate / sync_rate:,.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Many threads predicting single rows: direct model.predict per call vs the
+micro-batching BatchPredictor. Reports throughput and p50/p99 latency.
+
+Run from the repo root:  python -m benchmarks.bench_batch_predictor --threads 32
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+import warnings
+
+import numpy as np
+
+from train_model.batch_predictor import BatchPredictor
+from train_model.model_registry import load_model
+from train_model.model_training import train_depreciation_model
+
+
+def hammer(predict, threads, calls_per_thread):
+    latencies = [[] for _ in range(threads)]
+    rng = np.random.default_rng(0)
+    rows = rng.uniform([0, 0, 0.5, 0], [1, 1, 1.5, 10], size=(calls_per_thread, 4)).tolist()
+
+    def worker(out):
+        for row in rows:
+            start = time.perf_counter()
+            predict(row)
+            out.append(time.perf_counter() - start)
+
+    pool = [threading.Thread(target=worker, args=(latencies[i],)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    flat = sorted(x for per_thread in latencies for x in per_thread)
+    return len(flat) / elapsed, statistics.median(flat), flat[int(len(flat) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--calls', type=int, default=50, help='predictions per thread')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--max-delay', type=float, default=0.002)
+    parser.add_argument('--model', default='depreciation_model.pkl')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        train_depreciation_model()
+    model = load_model(args.model)
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    def direct(row):
+        return model.predict(np.array([row]))[0]
+
+    predictor = BatchPredictor(model, max_batch_size=args.batch_size, max_delay=args.max_delay)
+    for label, predict in (('direct predict', direct), ('BatchPredictor', predictor.predict)):
+        rate, p50, p99 = hammer(predict, args.threads, args.calls)
+        print(f"{label:15}: {rate:10,.0f} rows/sec  p50 {p50 * 1e3:7.2f} ms  p99 {p99 * 1e3:7.2f} ms")
+    print(f"mean batch size: {predictor.rows / predictor.batches:.1f}")
+    predictor.close()
+
+
+if __name__ == '__main__':
+    main()
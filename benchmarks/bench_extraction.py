@@ -0,0 +1,104 @@
+"""
+LLM response extraction: the old three-regex extract_values vs lenden.extraction.
+
+Uses recorded responses (one raw response body per line) when --corpus is
+given, otherwise a synthetic corpus shaped like Vext replies.
+
+Run from the repo root:  python -m benchmarks.bench_extraction --responses 20000
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from lenden.extraction import response_extractor
+
+REASONING = (
+    "The item shows normal wear for its age. Demand for this model is steady in the used market, "
+    "and comparable listings sell close to their asking price. Storage and condition matter most here. "
+) * 100
+
+
+def legacy_extract_values(response_text):
+    # extract_values as it was in test.py
+    try:
+        data = json.loads(response_text)
+        return legacy_extract_text(data.get("text", ""))
+    except json.JSONDecodeError:
+        return "Invalid JSON"
+
+
+def legacy_extract_text(text):
+    market_trend_factor = re.search(r'"market_trend_factor"\s*:\s*([\d.]+)', text)
+    uniqueness_score = re.search(r'"uniqueness_score"\s*:\s*([\d.]+)', text)
+    preciousness_score = re.search(r'"preciousness_score"\s*:\s*([\d.]+)', text)
+    return {
+        "market_trend_factor": float(market_trend_factor.group(1)) if market_trend_factor else None,
+        "uniqueness_score": float(uniqueness_score.group(1)) if uniqueness_score else None,
+        "preciousness_score": float(preciousness_score.group(1)) if preciousness_score else None
+    }
+
+
+def synthetic_corpus(size, max_reasoning=4000, seed=0):
+    # Answers explain themselves before the JSON block, at very different lengths
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        scores = {
+            "market_trend_factor": round(rng.uniform(0.5, 1.5), 2),
+            "uniqueness_score": round(rng.random(), 2),
+            "preciousness_score": round(rng.random(), 2),
+        }
+        block = json.dumps(scores, indent=2)
+        reasoning = REASONING[:rng.randint(0, max_reasoning)]
+        text = f"{reasoning}\n```json\n{block}\n```\nLet me know if you need anything else."
+        corpus.append(json.dumps({"text": text, "status": "ok"}))
+    return corpus
+
+
+def time_both(first, second, corpus, repeat=7):
+    # Interleaved, best of `repeat`, so machine noise hits both sides alike
+    best = [float("inf"), float("inf")]
+    for _ in range(repeat):
+        for i, fn in enumerate((first, second)):
+            start = time.perf_counter()
+            for response in corpus:
+                fn(response)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--responses", type=int, default=20000)
+    parser.add_argument("--corpus", help="file with one recorded raw response per line")
+    parser.add_argument("--max-reasoning", type=int, default=4000, help="synthetic: longest text before the JSON block")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.responses, args.max_reasoning)
+
+    mismatches = 0
+    for response in corpus:
+        legacy = legacy_extract_values(response)
+        if isinstance(legacy, dict) and legacy != response_extractor.extract(response).values:
+            mismatches += 1
+    print(f"{len(corpus):,} responses, {mismatches} where valid legacy results differ (range checks, quoted values)")
+
+    legacy, new = time_both(legacy_extract_values, response_extractor.extract, corpus)
+    print(f"whole response  legacy {legacy * 1e6 / len(corpus):6.2f} us   extractor {new * 1e6 / len(corpus):6.2f} us"
+          f"  ({legacy / new:.2f}x)")
+
+    # The envelope json.loads is the same on both sides; this isolates the field scan itself
+    texts = [json.loads(response).get("text", "") for response in corpus]
+    legacy, new = time_both(legacy_extract_text, response_extractor.extract_text, texts)
+    print(f"text only       legacy {legacy * 1e6 / len(texts):6.2f} us   extractor {new * 1e6 / len(texts):6.2f} us"
+          f"  ({legacy / new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+sklearn RandomForestRegressor vs its FlatForest export: parity, memory and
+predict latency per batch size.
+
+Run from the repo root:  python -m benchmarks.bench_flat_forest
+"""
+import argparse
+import os
+import pickle
+import time
+import warnings
+
+import numpy as np
+
+from train_model.flat_forest import export_forest
+from train_model.model_registry import load_model
+from train_model.model_training import train_depreciation_model
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default='depreciation_model.pkl')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        train_depreciation_model()
+    model = load_model(args.model)
+    flat = export_forest(model)
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    X = np.random.default_rng(0).uniform([0, 0, 0.5, 0], [1, 1, 1.5, 10], size=(max(args.batch_sizes), 4))
+    max_diff = np.abs(model.predict(X) - flat.predict(X)).max()
+    print(f"max |sklearn - flat| over {len(X):,} rows: {max_diff:.3g}")
+    print(f"memory: pickled sklearn {len(pickle.dumps(model)) / 1e6:.2f} MB, flat arrays {flat.nbytes / 1e6:.2f} MB")
+
+    for size in args.batch_sizes:
+        batch = X[:size]
+        sk = best_of(lambda: model.predict(batch))
+        fl = best_of(lambda: flat.predict(batch))
+        print(f"batch {size:>6}: sklearn {sk * 1e3:9.3f} ms   flat {fl * 1e3:9.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-call latency of the API valuator: a fresh connection per request
+(module-level requests.get) vs the pooled keep-alive session.
+
+Run from the repo root:  python -m benchmarks.bench_http_session --calls 500
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+from math_based_approach.price_cache import TTLCache
+
+
+class _NoPoolSession:
+    """Mimics the old behaviour: every call goes through the module-level helpers"""
+
+    def get(self, *args, **kwargs):
+        return requests.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return requests.post(*args, **kwargs)
+
+
+def time_calls(valuator, calls):
+    timings = []
+    for i in range(calls):
+        start = time.perf_counter()
+        valuator.get_inflation_adjusted(100.0, 1 + i % 10)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=500)
+    args = parser.parse_args()
+
+    with StubServer() as stub:
+        for label, session in (('fresh connection', _NoPoolSession()), ('pooled session', None)):
+            with stub.configure(AssetValuationUsingAPIs(price_cache=TTLCache(), session=session)) as valuator:
+                timings = time_calls(valuator, args.calls)
+            print(f"{label:17}: median {statistics.median(timings) * 1e3:.3f} ms, "
+                  f"p99 {statistics.quantiles(timings, n=100)[98] * 1e3:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Cost of the instrumentation hooks: a plain method vs an @timed one while
+disabled and enabled, and a warm (cached) AssetValuationUsingAPIs.calculate_valuation.
+
+Run from the repo root:  python -m benchmarks.bench_instrumentation
+"""
+import argparse
+import timeit
+
+from benchmarks.stub_server import StubServer
+from math_based_approach import instrumentation
+from math_based_approach.instrumentation import timed
+from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+
+
+class Plain:
+    def value(self, x):
+        return x + 1
+
+
+class Timed:
+    @timed("bench")
+    def value(self, x):
+        return x + 1
+
+
+@timed("bench")
+def timed_function(x):
+    return x + 1
+
+
+def per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=7)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    plain, wrapped = Plain(), Timed()
+    instrumentation.disable()
+    base = per_call(lambda: plain.value(1), args.number)
+    off = per_call(lambda: wrapped.value(1), args.number)
+    function_off = per_call(lambda: timed_function(1), args.number)
+    instrumentation.enable()
+    on = per_call(lambda: wrapped.value(1), args.number)
+    instrumentation.disable()
+    print(f"plain method             {base * 1e9:8.1f} ns")
+    print(f"@timed method, disabled  {off * 1e9:8.1f} ns  (+{(off - base) * 1e9:.1f} ns)")
+    print(f"@timed method, enabled   {on * 1e9:8.1f} ns  (+{(on - base) * 1e9:.1f} ns)")
+    print(f"@timed function, disabled {function_off * 1e9:7.1f} ns  (flag check in a wrapper)")
+
+    with StubServer() as stub, stub.configure(AssetValuationUsingAPIs()) as valuator:
+        valuator.calculate_valuation("iphone 12", 2)  # Warm the price cache
+        number = args.number // 10
+        off = per_call(lambda: valuator.calculate_valuation("iphone 12", 2), number)
+        instrumentation.enable()
+        on = per_call(lambda: valuator.calculate_valuation("iphone 12", 2), number)
+        instrumentation.disable()
+    print(f"warm calculate_valuation: disabled {off * 1e6:.2f} us, enabled {on * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Vext LLM flow behind LLMScoreCache, against the local stub hook: concurrent
+identical requests (coalesced into one call), warm hits, distinct payloads.
+
+Run from the repo root:  python -m benchmarks.bench_llm_cache --llm-latency 0.5
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from lenden.extraction import extract_values
+from lenden.llm_cache import LLMScoreCache
+from math_based_approach.price_cache import SQLiteCache, TTLCache
+
+DATA = {
+    "payload": "Iphone 12 that has been used roughly for 3 years. It has some scratches on its screen.",
+    "brand": "Apple",
+    "category": "Mobiles and Electronics",
+    "product_name": "Iphone 12",
+    "original_value": "$500",
+}
+
+
+def variants(data, count):
+    # Same request as far as the key is concerned: only case and spacing differ
+    for i in range(count):
+        yield {**data, "payload": data["payload"].upper() if i % 2 else "  " + data["payload"].replace(" ", "  ")}
+
+
+def timed_wave(scorer, payloads, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(scorer.get_scores, payloads))
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds the stub takes per answer")
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--disk", action="store_true", help="SQLiteCache instead of the in-memory TTLCache")
+    args = parser.parse_args()
+
+    with StubServer(llm_latency=args.llm_latency) as stub, tempfile.TemporaryDirectory() as tmp, \
+            requests.Session() as session:
+        def fetch(data):
+            return extract_values(session.post(stub.vext_url, json=data, timeout=30).text)
+
+        cache = SQLiteCache(os.path.join(tmp, "llm.sqlite3")) if args.disk else TTLCache()
+        scorer = LLMScoreCache(fetch, cache=cache)
+
+        elapsed, results = timed_wave(scorer, list(variants(DATA, args.requests)), args.requests)
+        assert all(r.values == results[0].values for r in results)
+        print(f"cold, {args.requests} identical concurrent: {elapsed:6.3f} s, upstream calls {stub.counts['vext']}")
+
+        before = stub.counts["vext"]
+        elapsed, _ = timed_wave(scorer, list(variants(DATA, args.requests)), args.requests)
+        print(f"warm, {args.requests} identical concurrent: {elapsed:6.3f} s, upstream calls {stub.counts['vext'] - before}")
+
+        before = stub.counts["vext"]
+        distinct = [{**DATA, "product_name": f"Pixel {i}"} for i in range(args.requests)]
+        elapsed, _ = timed_wave(scorer, distinct, args.requests)
+        print(f"cold, {args.requests} distinct concurrent:  {elapsed:6.3f} s, upstream calls {stub.counts['vext'] - before}")
+        print(scorer.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Bulk valuation throughput (rows/sec) from 1 to N worker processes.
+
+Run from the repo root:  python -m benchmarks.bench_parallel_bulk --rows 200000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from lenden.parallel import run_parallel
+from train_model.model_training import train_depreciation_model
+
+
+def write_assets(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("product_name,years,initial_cost,salvage_percentage,depreciation_method,useful_life,annual_depreciation\n")
+        for _ in range(rows):
+            method = rng.choice(["declining", "straight-line"])
+            f.write(f"laptop,{rng.uniform(0, 12):.1f},{rng.uniform(100, 5000):.2f},0.1,{method},5,{rng.uniform(50, 500):.2f}\n")
+
+
+def write_products(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("original_value,uniqueness_score,preciousness_score,market_trend_factor,years_used\n")
+        for _ in range(rows):
+            f.write(f"{rng.uniform(50, 5000):.2f},{rng.random():.3f},{rng.random():.3f},"
+                    f"{rng.uniform(0.5, 1.5):.3f},{rng.randint(0, 11)}\n")
+
+
+def worker_counts(max_workers):
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--kind", choices=["asset", "product"], default="asset")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--model", default="depreciation_model.pkl")
+    args = parser.parse_args()
+
+    if args.kind == "product" and not os.path.exists(args.model):
+        train_depreciation_model()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "input.csv")
+        (write_assets if args.kind == "asset" else write_products)(source, args.rows)
+        print(f"{args.rows:,} {args.kind} rows, chunk size {args.chunk_size}, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            start = time.perf_counter()
+            valued, failed = run_parallel(
+                args.kind, source, os.devnull, output_format="csv", workers=workers,
+                chunk_size=args.chunk_size, model_path=args.model
+            )
+            elapsed = time.perf_counter() - start
+            rate = (valued + failed) / elapsed
+            baseline = baseline or rate
+            print(f"workers {workers:>3}: {rate:>10,.0f} rows/s  speedup {rate / baseline:4.2f}x  ({failed} errors)")
+
+
+if __name__ == "__main__":
+    main()
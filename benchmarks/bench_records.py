@@ -0,0 +1,94 @@
+"""
+Memory per pending valuation: valuation objects vs __slots__ records vs a
+ValuationBatch, measured with tracemalloc (retained bytes after building).
+
+Run from the repo root:  python -m benchmarks.bench_records --items 100000
+"""
+import argparse
+import gc
+import random
+import tempfile
+import tracemalloc
+import warnings
+
+from benchmarks.suite import _fit_model
+from lenden.records import ProductRecord, ServiceRecord, ValuationBatch
+from train_model.model_registry import load_model
+from train_model.valuation_classes import ProductValuation, ServiceValuation
+
+
+def product_args(count, seed=0):
+    # Fresh floats and factor dicts per item, like rows parsed from an input file
+    rng = random.Random(seed)
+    for _ in range(count):
+        factors = {"brand_reputation": rng.uniform(1.0, 1.2), "special_features": rng.uniform(1.0, 1.1)}
+        yield ("electronics", rng.uniform(50, 5000), float(rng.randint(0, 12)), rng.random(), rng.random(),
+               rng.uniform(0.5, 1.5), factors)
+
+
+def service_args(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        factors = {"certification_bonus": rng.uniform(1.0, 1.2)}
+        yield "consulting", rng.uniform(20, 200), float(rng.randint(1, 40)), rng.uniform(1.0, 1.5), \
+            rng.uniform(0.8, 1.2), factors
+
+
+def retained_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current, peak
+
+
+def report(label, count, build):
+    current, peak = retained_bytes(build)
+    print(f"  {label:<34} {current / count:8.1f} B/item   (peak {peak / count:8.1f} B/item)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.items
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = _fit_model(tmp)
+        load_model(model_path)  # Loaded before tracing: the objects only hold a reference
+
+        print(f"products, {n:,} items with 2 additional factors")
+        report("ProductValuation objects", n,
+               lambda: [ProductValuation(*a, model_path=model_path) for a in product_args(n)])
+        report("ProductRecord (__slots__)", n, lambda: [
+            ProductRecord(*a[:6], factor_names=tuple(a[6]), factor_values=tuple(a[6].values()))
+            for a in product_args(n)
+        ])
+        report("ProductRecord, interned names", n, lambda: [
+            ProductRecord.from_valuation(ProductRecord(*a[:6], *zip(*a[6].items()))) for a in product_args(n)
+        ])
+        report("ValuationBatch", n, lambda: ValuationBatch.from_valuations(
+            (ProductRecord(*a[:6], *zip(*a[6].items())) for a in product_args(n)), kind="product"
+        ))
+
+        print(f"services, {n:,} items with 1 additional factor")
+        report("ServiceValuation objects", n, lambda: [ServiceValuation(*a) for a in service_args(n)])
+        report("ServiceRecord, interned names", n, lambda: [
+            ServiceRecord.from_valuation(ServiceRecord(*a[:5], *zip(*a[5].items()))) for a in service_args(n)
+        ])
+        report("ValuationBatch", n, lambda: ValuationBatch.from_valuations(
+            (ServiceRecord(*a[:5], *zip(*a[5].items())) for a in service_args(n)), kind="service"
+        ))
+
+        batch = ValuationBatch.from_valuations(ProductValuation(*a, model_path=model_path) for a in product_args(1000))
+        assert [r.to_valuation(model_path=model_path).calculate_valuation() for r in batch][:50] == \
+            [ProductValuation(*a, model_path=model_path).calculate_valuation() for a in product_args(50)]
+        print(f"ValuationBatch array storage: {batch.nbytes / len(batch):.1f} B/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cold-start cost of the depreciation module: import time (which must not pull
+in sklearn or pandas) and the first prediction (artifact load, or a one-off
+train when no artifact exists yet). Each measurement runs in a fresh
+interpreter.
+
+Run from the repo root:  python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import valuation_models.deprication
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("sklearn", "pandas", "numpy", "joblib") if m in sys.modules)
+print(elapsed, ",".join(heavy) or "-")
+"""
+
+PREDICT_PROBE = """
+import time
+start = time.perf_counter()
+from valuation_models.deprication import ProductValuation
+ProductValuation(0.7, 0.6, 1.2, 5).calculate_value()
+print(time.perf_counter() - start)
+"""
+
+
+def run_probe(code, cwd):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    result = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', code], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1].split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        imports = [run_probe(IMPORT_PROBE, workdir) for _ in range(args.repeat)]
+        import_times = [float(t) for t, _ in imports]
+        print(f"import deprication     : median {statistics.median(import_times) * 1e3:8.1f} ms  "
+              f"(heavy modules loaded: {imports[0][1]})")
+
+        first = float(run_probe(PREDICT_PROBE, workdir)[0])
+        print(f"first predict, no model: {first * 1e3:8.1f} ms  (trains and persists the artifacts)")
+
+        warm = [float(run_probe(PREDICT_PROBE, workdir)[0]) for _ in range(args.repeat)]
+        print(f"first predict, persisted: median {statistics.median(warm) * 1e3:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Scalar vs batched product valuation throughput.
+
+Run from the repo root:  python -m benchmarks.bench_value_products --rows 20000
+"""
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from train_model.model_registry import load_model
+from train_model.model_training import train_depreciation_model
+from train_model.valuation_classes import ProductValuation, value_products
+
+
+def make_inventory(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "category": "electronics",
+        "original_value": rng.uniform(50, 5000, rows).round(2),
+        "years_used": rng.integers(0, 12, rows),
+        "uniqueness_score": rng.uniform(0, 1, rows),
+        "preciousness_score": rng.uniform(0, 1, rows),
+        "market_trend_factor": rng.uniform(0.5, 1.5, rows),
+        "brand_reputation": rng.uniform(0.9, 1.2, rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--scalar-rows", type=int, default=2000, help="rows timed on the per-object path")
+    parser.add_argument("--model", default="depreciation_model.pkl")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        train_depreciation_model()
+    model = load_model(args.model)
+    df = make_inventory(args.rows)
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    sample = df.head(args.scalar_rows)
+    start = time.perf_counter()
+    scalar = [
+        ProductValuation(
+            row.category, row.original_value, row.years_used, row.uniqueness_score,
+            row.preciousness_score, row.market_trend_factor,
+            {"brand_reputation": row.brand_reputation}, model_path=args.model,
+        ).calculate_valuation()
+        for row in sample.itertuples()
+    ]
+    scalar_rate = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batched = value_products(df, factor_columns=["brand_reputation"], model=model)
+    batch_rate = len(df) / (time.perf_counter() - start)
+
+    assert np.array_equal(batched[:len(sample)], np.array(scalar)), "batched results drifted from scalar path"
+    print(f"scalar : {scalar_rate:12,.0f} rows/sec")
+    print(f"batched: {batch_rate:12,.0f} rows/sec  ({batch_rate / scalar_rate:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
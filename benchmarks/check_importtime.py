@@ -0,0 +1,59 @@
+"""
+Import-time regression check for the pure-math CLI path.
+
+Runs `python -X importtime -m lenden depreciate ...` in a fresh interpreter,
+sums the cumulative import time of every top-level import, subtracts what a
+bare `python -c pass` spends (site, encodings, ...), and fails (exit 1) if the
+rest exceeds the budget or if a numeric/HTTP stack got imported.
+
+Run from the repo root:  python -m benchmarks.check_importtime --budget-ms 40
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+COMMAND = ['-m', 'lenden', 'depreciate', '--initial-cost', '1000', '--years', '3', '--useful-life', '5']
+FORBIDDEN = ('numpy', 'pandas', 'sklearn', 'joblib', 'requests', 'aiohttp', 'streamlit')
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure(command):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *command], env=env, capture_output=True, text=True, check=True
+    )
+    total_us, modules = 0, set()
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4).split('.')[0])
+        if len(match.group(3)) == 1:  # Top-level import (nested ones are indented further)
+            total_us += int(match.group(2))
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget-ms', type=float, default=40.0)
+    parser.add_argument('--repeat', type=int, default=5, help='best of N runs, to ride out noisy machines')
+    args = parser.parse_args()
+
+    runs = [measure(COMMAND) for _ in range(args.repeat)]
+    baseline_ms = min(measure(['-c', 'pass'])[0] for _ in range(args.repeat))
+    best_ms = min(ms for ms, _ in runs) - baseline_ms
+    leaked = sorted(set(FORBIDDEN) & runs[0][1])
+
+    print(f"import time on top of interpreter startup: {best_ms:.1f} ms "
+          f"(startup {baseline_ms:.1f} ms, budget {args.budget_ms:.0f} ms)")
+    if leaked:
+        print(f"FAIL: pure-math command imported {', '.join(leaked)}")
+    if best_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+    sys.exit(1 if leaked or best_ms > args.budget_ms else 0)
+
+
+if __name__ == '__main__':
+    main()
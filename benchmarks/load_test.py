@@ -0,0 +1,161 @@
+"""
+Load test for the HTTP valuation service: p50/p99 latency and requests/s.
+
+Against a running service:
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --endpoint product --concurrency 64
+
+Or let it start `lenden serve` on a free local port first (needs uvicorn):
+    python -m benchmarks.load_test --serve --model depreciation_model.pkl --workers 2
+
+Endpoints: product, service, asset (single valuations) and batch (NDJSON
+product rows, --batch-rows per request). The api endpoint calls eBay, so it
+isn't load-tested here.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+
+def product_payload(rng):
+    return {
+        "category": "electronics", "original_value": round(rng.uniform(50, 5000), 2),
+        "years_used": rng.randint(0, 12), "uniqueness_score": round(rng.random(), 2),
+        "preciousness_score": round(rng.random(), 2), "market_trend_factor": round(rng.uniform(0.5, 1.5), 2),
+    }
+
+
+def service_payload(rng):
+    return {
+        "category": "consulting", "base_rate": round(rng.uniform(20, 200), 2), "hours": rng.randint(1, 40),
+        "expertise_level": round(rng.uniform(1.0, 1.5), 2), "demand_factor": round(rng.uniform(0.8, 1.2), 2),
+    }
+
+
+def asset_payload(rng):
+    return {
+        "product_name": "office printer", "valuation_method": "depreciate", "years": rng.randint(1, 8),
+        "initial_cost": round(rng.uniform(500, 20000), 2), "salvage_percentage": 0.1,
+        "depreciation_method": "declining", "useful_life": 8,
+    }
+
+
+PAYLOADS = {"product": product_payload, "service": service_payload, "asset": asset_payload}
+
+
+def make_requests(endpoint, count, batch_rows, seed=0):
+    """(path, body bytes) for every request, built before the clock starts"""
+    rng = random.Random(seed)
+    if endpoint == "batch":
+        bodies = []
+        for _ in range(min(count, 20)):  # A few distinct bodies are plenty; reuse them round-robin
+            lines = (json.dumps(product_payload(rng)) for _ in range(batch_rows))
+            bodies.append(("/value/batch?kind=product", ("\n".join(lines) + "\n").encode()))
+        return [bodies[i % len(bodies)] for i in range(count)]
+    return [(f"/value/{endpoint}", json.dumps(PAYLOADS[endpoint](rng)).encode()) for _ in range(count)]
+
+
+async def worker(session, url, queue, latencies, errors):
+    while True:
+        try:
+            path, body = queue.pop()
+        except IndexError:
+            return
+        start = time.perf_counter()
+        try:
+            async with session.post(url + path, data=body) as response:
+                await response.read()
+                ok = response.status == 200
+        except aiohttp.ClientError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(path)
+
+
+async def load(url, requests, concurrency):
+    latencies, errors = [], []
+    queue = list(reversed(requests))
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session, url, queue, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(model, workers, timeout=30):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "lenden", "serve", "--port", str(port), "--workers", str(workers), "--model", model
+    ])
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"lenden serve exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    sys.exit(f"lenden serve did not start listening within {timeout} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["product", "service", "asset", "batch"], default="product")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-rows", type=int, default=1000, help="batch: rows per request")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed requests sent first")
+    parser.add_argument("--serve", action="store_true", help="start `lenden serve` on a free port and test that")
+    parser.add_argument("--model", default="depreciation_model.pkl", help="--serve: depreciation model artifact")
+    parser.add_argument("--workers", type=int, default=1, help="--serve: worker processes")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url.rstrip("/")
+    if args.serve:
+        process, url = start_service(args.model, args.workers)
+    try:
+        warmup = make_requests(args.endpoint, args.warmup, args.batch_rows, seed=1)
+        asyncio.run(load(url, warmup, args.concurrency))
+        requests = make_requests(args.endpoint, args.requests, args.batch_rows)
+        latencies, errors, elapsed = asyncio.run(load(url, requests, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    print(f"{args.endpoint}: {len(latencies):,} ok, {len(errors):,} failed, concurrency {args.concurrency}")
+    print(f"  {len(requests) / elapsed:,.0f} requests/s over {elapsed:.2f} s", end="")
+    print(f"  ({len(latencies) * args.batch_rows / elapsed:,.0f} rows/s)" if args.endpoint == "batch" else "")
+    print(f"  latency ms: p50 {percentile(latencies, 0.5) * 1e3:.2f}  p90 {percentile(latencies, 0.9) * 1e3:.2f}"
+          f"  p99 {percentile(latencies, 0.99) * 1e3:.2f}  max {latencies[-1] * 1e3 if latencies else float('nan'):.2f}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Local stand-in for the eBay OAuth/Browse, StatBureau and Vext hook endpoints,
+so the API valuator and the LLM flow can be benchmarked without network access
+or credentials.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+LISTING_PRICES = (180.0, 199.0, 215.0, 240.0, 260.0, 900.0)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        stub = self.server.stub
+        if self.path.startswith('/hook/'):
+            return self._vext_reply(body)
+        stub.hit('oauth')
+        time.sleep(stub.oauth_latency)
+        with stub.lock:
+            stub.token_serial += 1
+            token = f'token-{stub.token_serial}'
+            stub.valid_tokens.add(token)
+        self._reply({'access_token': token, 'expires_in': stub.token_ttl, 'token_type': 'Application Access Token'})
+
+    def _vext_reply(self, body):
+        # Scores derived from the payload, so identical requests get identical answers
+        stub = self.server.stub
+        stub.hit('vext')
+        time.sleep(stub.llm_latency)
+        seed = hashlib.sha256(body).digest()
+        scores = {
+            'market_trend_factor': round(0.5 + seed[0] / 255, 2),
+            'uniqueness_score': round(seed[1] / 255, 2),
+            'preciousness_score': round(seed[2] / 255, 2),
+        }
+        text = f"Here is my assessment.\n```json\n{json.dumps(scores, indent=2)}\n```"
+        self._reply({'text': text})
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlsplit(self.path)
+        time.sleep(stub.latency)
+        if url.path == '/buy/browse/v1/item_summary/search':
+            stub.hit('search')
+            token = self.headers.get('Authorization', '').removeprefix('Bearer ')
+            if stub.check_tokens and token not in stub.valid_tokens:
+                return self._reply({'errors': [{'message': 'Invalid access token'}]}, status=401)
+            query = parse_qs(url.query).get('q', [''])[0]
+            prices = () if 'unknown' in query.lower() else LISTING_PRICES
+            items = [{'price': {'value': str(p), 'currency': 'USD'}, 'condition': 'USED'} for p in prices]
+            return self._reply({'itemSummaries': items})
+        if url.path == '/get-data-json':
+            stub.hit('inflation')
+            params = parse_qs(url.query)
+            start, end = int(params['start'][0]), int(params['end'][0])
+            return self._reply([2.5 for _ in range(start, end + 1)])
+        self._reply({'error': 'not found'}, status=404)
+
+
+class StubServer:
+    """Threaded HTTP stub; use as a context manager and point a valuator at it with configure()"""
+
+    def __init__(self, latency=0.0, oauth_latency=0.0, token_ttl=7200, check_tokens=False, llm_latency=0.0):
+        self.latency = latency
+        self.oauth_latency = oauth_latency
+        self.llm_latency = llm_latency
+        self.token_ttl = token_ttl
+        self.check_tokens = check_tokens
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.token_serial = 0
+        self.valid_tokens = set()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.url = f'http://127.0.0.1:{self._server.server_port}'
+
+    def hit(self, endpoint):
+        with self.lock:
+            self.counts[endpoint] += 1
+
+    def revoke_tokens(self):
+        with self.lock:
+            self.valid_tokens.clear()
+
+    def configure(self, valuator):
+        valuator.oauth_endpoint = f'{self.url}/identity/v1/oauth2/token'
+        valuator.ebay_api_endpoint = f'{self.url}/buy/browse/v1/item_summary/search'
+        valuator.inflation_api = f'{self.url}/get-data-json'
+        return valuator
+
+    @property
+    def vext_url(self):
+        return f'{self.url}/hook/STUB/catch/bench'
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
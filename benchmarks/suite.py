@@ -0,0 +1,282 @@
+"""
+Benchmark suite over every valuation path, with JSON baselines.
+
+    python -m benchmarks.suite run --output benchmarks/baselines/main.json
+    python -m benchmarks.suite run --output current.json
+    python -m benchmarks.suite compare benchmarks/baselines/main.json current.json --threshold 0.25
+
+`run` times each case (best and median seconds per call over several
+autoranged repeats) and writes them with some machine metadata. `compare`
+exits 1 when any case's best time regressed by more than the threshold.
+Baselines are only comparable on the same machine, so record one there first.
+Use --filter to run a subset (substring match on case names).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+
+HORIZONS = (1, 10, 100, 1000)
+BATCH_SIZES = (1, 10, 100, 1000, 10_000, 100_000)
+TAXONOMY_SIZES = (10, 1000, 10_000, 50_000)
+
+
+def measure(fn, repeat=5, min_time=0.05):
+    """Seconds per call: calls are batched until one batch takes `min_time`, then best/median of `repeat` batches"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {"min": min(timings), "median": statistics.median(timings), "number": number, "repeat": repeat}
+
+
+# Each group is a generator of (case_name, fn, rows_per_call). Setup happens before the
+# first yield and teardown after the last, so stub servers and temp files stay alive while timed.
+
+def asset_cases(quick):
+    import numpy as np
+
+    from math_based_approach.math_valuation import AssetValuation
+    from math_based_approach.vectorized_valuation import VectorizedAssetValuation
+
+    for years in HORIZONS:
+        yield f"asset.straight_line[years={years}]", \
+            lambda years=years: AssetValuation.straight_line_depreciation(10000, 1000, 8, years), 1
+        yield f"asset.declining_balance[years={years}]", \
+            lambda years=years: AssetValuation.declining_balance_depreciation(10000, 1000, 8, years), 1
+        yield f"asset.appreciation[years={years}]", lambda years=years: AssetValuation.appreciation(10000, 0.05, years), 1
+
+    rows = 10_000 if quick else 100_000
+    rng = np.random.default_rng(0)
+    cost = rng.uniform(1000, 50000, rows)
+    ages = rng.uniform(0, 20, rows)
+    yield f"asset.vectorized.declining_balance[rows={rows}]", \
+        lambda: VectorizedAssetValuation.declining_balance_depreciation(cost, cost * 0.1, 8, ages), rows
+
+
+def _fit_model(directory):
+    # Seeded, so every run benchmarks the same forest
+    import joblib
+    import numpy as np
+    import pandas as pd
+
+    from train_model.flat_forest import export_forest
+    from train_model.model_training import FEATURES, TARGET, fit_depreciation_model
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        "uniqueness": rng.uniform(0, 1, 1000),
+        "preciousness": rng.uniform(0, 1, 1000),
+        "market_trend": rng.uniform(0.5, 1.5, 1000),
+        "age": rng.uniform(0, 10, 1000),
+        "depreciation_rate": rng.uniform(0.05, 0.15, 1000),
+    })
+    model, _ = fit_depreciation_model(df[FEATURES], df[TARGET])
+    pkl_path = os.path.join(directory, "depreciation_model.pkl")
+    joblib.dump(model, pkl_path)
+    export_forest(model).save(pkl_path[:-len(".pkl")] + ".npz")
+    return pkl_path
+
+
+def model_cases(quick):
+    import numpy as np
+
+    from train_model.model_registry import load_model, registry
+    from train_model.valuation_classes import ProductValuation, ServiceValuation, price_services, value_products
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    with tempfile.TemporaryDirectory() as tmp:
+        pkl_path = _fit_model(tmp)
+        npz_path = pkl_path[:-len(".pkl")] + ".npz"
+
+        for path in (pkl_path, npz_path):
+            kind = path.rsplit(".", 1)[1]
+            yield f"model.load[{kind}]", lambda path=path: (registry.evict(path), load_model(path)), 1
+
+        model, flat = load_model(pkl_path), load_model(npz_path)
+        rng = np.random.default_rng(0)
+        sizes = [size for size in BATCH_SIZES if not quick or size <= 10_000]
+        X = rng.uniform([0, 0, 0.5, 0], [1, 1, 1.5, 10], size=(max(sizes), 4))
+        for size in sizes:
+            batch = X[:size]
+            yield f"model.predict[sklearn,batch={size}]", lambda batch=batch: model.predict(batch), size
+            yield f"model.predict[flat,batch={size}]", lambda batch=batch: flat.predict(batch), size
+
+        rows = 1000
+        products = {
+            "original_value": rng.uniform(50, 5000, rows), "years_used": rng.integers(0, 12, rows).astype(float),
+            "uniqueness_score": X[:rows, 0], "preciousness_score": X[:rows, 1], "market_trend_factor": X[:rows, 2],
+        }
+        # One sklearn predict per product is slow, so the per-object path gets fewer rows
+        scalar_rows = 100
+        product_args = list(zip(*(products[name][:scalar_rows].tolist() for name in (
+            "original_value", "years_used", "uniqueness_score", "preciousness_score", "market_trend_factor"
+        ))))
+
+        def scalar_products():
+            for value, years, uniqueness, preciousness, trend in product_args:
+                ProductValuation("electronics", value, years, uniqueness, preciousness, trend,
+                                 model_path=pkl_path).calculate_valuation()
+
+        yield f"product.scalar[rows={scalar_rows}]", scalar_products, scalar_rows
+        for size in (rows,) if quick else (rows, 100_000):
+            table = {name: np.resize(column, size) for name, column in products.items()}
+            yield f"product.batch[rows={size}]", lambda table=table: value_products(table, model=model), size
+
+        services = [rng.uniform(20, 200, 100_000), rng.uniform(1, 40, 100_000),
+                    rng.uniform(1.0, 1.5, 100_000), rng.uniform(0.8, 1.2, 100_000)]
+        service_args = list(zip(*(column[:rows].tolist() for column in services)))
+
+        def scalar_services():
+            for base_rate, hours, expertise, demand in service_args:
+                ServiceValuation("consulting", base_rate, hours, expertise, demand).calculate_valuation()
+
+        yield f"service.scalar[rows={rows}]", scalar_services, rows
+        for size in (rows,) if quick else (rows, 100_000):
+            columns = [column[:size] for column in services]
+            yield f"service.batch[rows={size}]", lambda columns=columns: price_services(*columns), size
+
+
+def categorizer_cases(quick):
+    from benchmarks.bench_categorizer import make_names, make_taxonomy
+    from math_based_approach.categorizer import KeywordCategorizer
+
+    for keywords in TAXONOMY_SIZES if not quick else TAXONOMY_SIZES[:3]:
+        taxonomy = make_taxonomy(keywords, category_count=min(50, keywords))
+        categorizer = KeywordCategorizer(taxonomy, default="general", word_boundary=False)
+        names = make_names(taxonomy, 1000)
+        yield f"categorize[keywords={keywords}]", lambda c=categorizer, names=names: c.categorize_many(names), len(names)
+
+
+def api_cases(quick):
+    import requests
+
+    from benchmarks.stub_server import StubServer
+    from math_based_approach.inflation_index import InflationIndex
+    from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+
+    with StubServer() as stub, tempfile.TemporaryDirectory() as tmp, requests.Session() as session:
+        with stub.configure(AssetValuationUsingAPIs(session=session)) as valuator:
+            valuator.inflation_index = InflationIndex(
+                os.path.join(tmp, "inflation_index.json"), fetch_series=valuator._fetch_inflation_series
+            )
+
+            def cold():
+                valuator.price_cache.clear()
+                return valuator.calculate_valuation("iphone 12", 2)
+
+            yield "api.calculate_valuation[cold]", cold, 1
+            yield "api.calculate_valuation[warm]", lambda: valuator.calculate_valuation("iphone 12", 2), 1
+            yield "api.inflation_adjusted[warm]", lambda: valuator.get_inflation_adjusted(500.0, 3), 1
+
+
+GROUPS = (asset_cases, model_cases, categorizer_cases, api_cases)
+
+
+def run(filter_text=None, quick=False, repeat=5, min_time=0.05):
+    results = {}
+    for group in GROUPS:
+        for name, fn, rows in group(quick):
+            if filter_text and filter_text not in name:
+                continue
+            timing = measure(fn, repeat=repeat, min_time=min_time)
+            timing["rows"] = rows
+            results[name] = timing
+            print(f"{name:<48} {timing['min'] * 1e6:>12.2f} us  ({timing['min'] / rows * 1e9:>10.1f} ns/row)",
+                  file=sys.stderr)
+    return results
+
+
+def metadata():
+    import numpy as np
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def compare(baseline, current, threshold=0.25):
+    """Print a per-case comparison; returns the names of cases slower than baseline by more than `threshold`"""
+    regressions = []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current or name not in baseline:
+            print(f"{name:<48} {'only in ' + ('baseline' if name in baseline else 'current'):>30}")
+            continue
+        ratio = current[name]["min"] / baseline[name]["min"]
+        status = ""
+        if ratio > 1 + threshold:
+            status = "REGRESSED"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        print(f"{name:<48} {baseline[name]['min'] * 1e6:>12.2f} -> {current[name]['min'] * 1e6:>12.2f} us"
+              f"  {ratio:5.2f}x {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every case and write the results as JSON")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--filter", help="only cases whose name contains this text")
+    run_parser.add_argument("--quick", action="store_true", help="smaller sizes, for a fast sanity pass")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed batch")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="also compare against this baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+
+    compare_parser = commands.add_parser("compare", help="fail if CURRENT regressed against BASELINE")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.filter, args.quick, args.repeat, args.min_time)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+        if not args.compare:
+            return 0
+        baseline_path, current = args.compare, results
+    else:
+        baseline_path = args.baseline
+        with open(args.current) as f:
+            current = json.load(f)["results"]
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
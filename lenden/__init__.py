@@ -0,0 +1,37 @@
+"""
+lenden -- product, service and asset valuation.
+
+The valuation classes live in train_model, valuation_models and
+math_based_approach; they are re-exported here lazily so that importing
+`lenden` (and starting the CLI) doesn't drag in numpy, sklearn or requests.
+Dependencies only point into those packages, never back: shared pieces they
+need (the factor registry, instrumentation) live in math_based_approach.
+"""
+
+__version__ = "0.1.0"
+
+_EXPORTS = {
+    "ProductValuation": "train_model.valuation_classes",
+    "ServiceValuation": "train_model.valuation_classes",
+    "Verification": "train_model.valuation_classes",
+    "value_products": "train_model.valuation_classes",
+    "price_services": "train_model.valuation_classes",
+    "AssetValuation": "math_based_approach.math_valuation",
+    "AssetValuationUsingAPIs": "math_based_approach.math_plus_api",
+    "ProductRecord": "lenden.records",
+    "ServiceRecord": "lenden.records",
+    "ValuationBatch": "lenden.records",
+    "FactorRegistry": "math_based_approach.factors",
+    "factor_registry": "math_based_approach.factors",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value  # Later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
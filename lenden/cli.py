@@ -0,0 +1,183 @@
+"""
+Command line entry point:  lenden {value-product,value-service,depreciate,bulk,serve} ...
+
+Only argparse is imported up front. Each subcommand imports what it needs
+when it runs, so `lenden depreciate` never loads numpy, sklearn or requests.
+"""
+import argparse
+import sys
+
+
+def _parse_factor(text):
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=MULTIPLIER, got {text!r}")
+    try:
+        return name.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"multiplier for {name!r} is not a number: {value!r}")
+
+
+def _value_product(args):
+    factors = dict(args.factor)
+    if args.depreciation_rate is not None:
+        # Known rate: the plain formula, no model (and no numpy/sklearn) needed
+        from valuation_models.valuation_models import ProductValuation
+        product = ProductValuation(
+            args.category, args.original_value, args.years_used, args.depreciation_rate,
+            args.uniqueness, args.preciousness, args.market_trend, factors
+        )
+        return product.get_current_valuation()
+
+    from train_model.valuation_classes import ProductValuation
+    product = ProductValuation(
+        args.category, args.original_value, args.years_used, args.uniqueness,
+        args.preciousness, args.market_trend, factors, model_path=args.model
+    )
+    return product.calculate_valuation()
+
+
+def _value_service(args):
+    from valuation_models.valuation_models import ServiceValuation
+    service = ServiceValuation(
+        args.category, args.base_rate, args.hours, args.expertise, args.demand, dict(args.factor)
+    )
+    return service.get_current_valuation()
+
+
+def _depreciate(args):
+    from math_based_approach.math_valuation import AssetValuation
+
+    if args.salvage_value is not None:
+        salvage_value = args.salvage_value
+    else:
+        salvage_value = AssetValuation.calculate_salvage_value(args.initial_cost, args.salvage_percentage)
+
+    if args.method == "appreciation":
+        value = AssetValuation.appreciation(args.initial_cost, args.appreciation_rate, args.years)
+    elif args.method == "straight-line":
+        useful_life = args.useful_life
+        if useful_life is None:
+            useful_life = AssetValuation.calculate_useful_life(args.initial_cost, salvage_value, args.annual_depreciation)
+        value = AssetValuation.straight_line_depreciation(args.initial_cost, salvage_value, useful_life, args.years)
+    else:
+        value = AssetValuation.declining_balance_depreciation(
+            args.initial_cost, salvage_value, args.useful_life, args.years, args.factor
+        )
+
+    if args.inflation_rate is not None:
+        value = AssetValuation.inflation_adjustment(value, args.inflation_rate, args.years)
+    return value
+
+
+def _bulk(args):
+    from lenden.parallel import print_progress, run_parallel
+
+    valued, failed = run_parallel(
+        args.kind, args.input, args.output, args.input_format, args.output_format,
+        workers=args.workers, chunk_size=args.chunk_size, model_path=args.model,
+        factor_columns=args.factor_column, adjust_inflation=args.adjust_inflation,
+        progress=None if args.quiet else print_progress
+    )
+    return 1 if failed and not valued else 0
+
+
+def _serve(args):
+    import os
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("lenden serve needs uvicorn (pip install uvicorn); "
+                 "lenden.service:app also runs under any other ASGI server")
+
+    # Every worker process builds its own app from the environment
+    os.environ["LENDEN_MODEL"] = args.model
+    os.environ["LENDEN_MAX_BATCH"] = str(args.max_batch)
+    os.environ["LENDEN_MAX_DELAY"] = str(args.max_delay)
+    if args.adjust_inflation:
+        os.environ["LENDEN_ADJUST_INFLATION"] = "1"
+    uvicorn.run("lenden.service:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="lenden", description="Product, service and asset valuation")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    product = subcommands.add_parser("value-product", help="value a used product")
+    product.add_argument("--category", default="general")
+    product.add_argument("--original-value", type=float, required=True)
+    product.add_argument("--years-used", type=float, required=True)
+    product.add_argument("--uniqueness", type=float, default=0.0, help="uniqueness score, 0 to 1")
+    product.add_argument("--preciousness", type=float, default=0.0, help="preciousness score, 0 to 1")
+    product.add_argument("--market-trend", type=float, default=1.0, help=">1 high demand, <1 low demand")
+    product.add_argument("--depreciation-rate", type=float, help="annual rate; skips the depreciation model")
+    product.add_argument("--model", default="depreciation_model.pkl", help="depreciation model artifact")
+    product.add_argument("--factor", type=_parse_factor, action="append", default=[], metavar="NAME=MULTIPLIER")
+    product.set_defaults(handler=_value_product)
+
+    service = subcommands.add_parser("value-service", help="price a service engagement")
+    service.add_argument("--category", default="general")
+    service.add_argument("--base-rate", type=float, required=True, help="hourly rate")
+    service.add_argument("--hours", type=float, required=True)
+    service.add_argument("--expertise", type=float, default=1.0, help="1.0 junior ... 1.5 senior")
+    service.add_argument("--demand", type=float, default=1.0, help=">1 high demand, <1 low demand")
+    service.add_argument("--factor", type=_parse_factor, action="append", default=[], metavar="NAME=MULTIPLIER")
+    service.set_defaults(handler=_value_service)
+
+    asset = subcommands.add_parser("depreciate", help="depreciate or appreciate an asset")
+    asset.add_argument("--method", choices=["straight-line", "declining", "appreciation"], default="declining")
+    asset.add_argument("--initial-cost", type=float, required=True)
+    asset.add_argument("--years", type=float, required=True)
+    salvage = asset.add_mutually_exclusive_group()
+    salvage.add_argument("--salvage-value", type=float)
+    salvage.add_argument("--salvage-percentage", type=float, default=0.1)
+    asset.add_argument("--useful-life", type=float)
+    asset.add_argument("--annual-depreciation", type=float, help="straight-line: derive the useful life from this")
+    asset.add_argument("--factor", type=float, default=2, help="declining balance factor (2 = double declining)")
+    asset.add_argument("--appreciation-rate", type=float, default=0.05)
+    asset.add_argument("--inflation-rate", type=float, help="also adjust the result for a flat inflation rate")
+    asset.set_defaults(handler=_depreciate)
+
+    bulk = subcommands.add_parser("bulk", help="value a CSV/JSONL file in parallel across CPU cores")
+    bulk.add_argument("kind", choices=["asset", "product", "service", "api"], help="asset: math_valuation rows, "
+                      "product: depreciation-model rows, service: ServiceValuation rows, api: eBay-backed rows")
+    bulk.add_argument("--input", default="-", help="CSV or JSONL file, '-' for stdin")
+    bulk.add_argument("--output", default="-", help="'-' for stdout")
+    bulk.add_argument("--input-format", choices=["csv", "jsonl"])
+    bulk.add_argument("--output-format", choices=["csv", "jsonl"])
+    bulk.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    bulk.add_argument("--chunk-size", type=int, default=2000, help="rows per task sent to a worker")
+    bulk.add_argument("--model", default="depreciation_model.pkl", help="product: depreciation model artifact")
+    bulk.add_argument("--factor-column", action="append", default=[],
+                      help="product/service: column applied as a multiplier")
+    bulk.add_argument("--adjust-inflation", action="store_true", help="api: also adjust for inflation")
+    bulk.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    bulk.set_defaults(handler=_bulk)
+
+    serve = subcommands.add_parser("serve", help="run the HTTP valuation service (needs uvicorn)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=1, help="worker processes, each with its own model copy")
+    serve.add_argument("--model", default="depreciation_model.pkl", help="depreciation model artifact")
+    serve.add_argument("--max-batch", type=int, default=64, help="most product predictions per model call")
+    serve.add_argument("--max-delay", type=float, default=0.002, help="seconds a prediction waits for a batch")
+    serve.add_argument("--adjust-inflation", action="store_true", help="api: adjust for inflation by default")
+    serve.set_defaults(handler=_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "depreciate" and args.method != "appreciation":
+        if args.useful_life is None and not (args.method == "straight-line" and args.annual_depreciation is not None):
+            parser.error("--useful-life is required for depreciation (or --annual-depreciation for straight-line)")
+    result = args.handler(args)
+    if args.command in ("bulk", "serve"):
+        return result
+    print(f"{result:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Structured extraction of valuation scores from LLM (Vext) responses.
+
+A response is a JSON envelope whose "text" holds the model's answer, which
+somewhere contains `"uniqueness_score": 0.7`-style pairs (usually inside a
+fenced JSON block, sometimes inline). All schema fields are found with a single
+precompiled pattern, run over the first {...} block and only over the whole
+text when that block doesn't hold every field. Values are converted,
+range-checked and returned as an Extraction; problems come back as
+ExtractionError entries instead of strings.
+"""
+import json
+import math
+import re
+
+NUMBER = r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+
+
+class Field:
+    """One number to pull out of the response, with optional inclusive bounds"""
+
+    def __init__(self, name, minimum=None, maximum=None, required=True, type=float):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.required = required
+        self.type = type
+
+    def __repr__(self):
+        return f"Field({self.name!r}, minimum={self.minimum}, maximum={self.maximum}, required={self.required})"
+
+
+DEFAULT_FIELDS = (
+    Field("market_trend_factor", minimum=0.0, maximum=5.0),
+    Field("uniqueness_score", minimum=0.0, maximum=1.0),
+    Field("preciousness_score", minimum=0.0, maximum=1.0),
+)
+
+
+class ExtractionError:
+    """What went wrong: code is one of invalid_json, missing_text, missing_field, not_a_number, out_of_range"""
+
+    def __init__(self, code, message, field=None):
+        self.code = code
+        self.message = message
+        self.field = field
+
+    def __repr__(self):
+        return f"ExtractionError({self.code!r}, {self.message!r}, field={self.field!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, ExtractionError) and (self.code, self.message, self.field) == (
+            other.code, other.message, other.field
+        )
+
+
+class Extraction:
+    """Converted values by field name (None when absent/invalid) plus any errors"""
+
+    def __init__(self, values, errors=None):
+        self.values = values
+        self.errors = errors or []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def get(self, name, default=None):
+        value = self.values.get(name)
+        return default if value is None else value
+
+    def __repr__(self):
+        if self.ok:
+            return f"Extraction({self.values})"
+        return f"Extraction({self.values}, errors={self.errors})"
+
+
+class ResponseExtractor:
+    def __init__(self, fields=DEFAULT_FIELDS, text_key="text"):
+        self.fields = {field.name: field for field in fields}
+        self.text_key = text_key
+        # Flattened once so the per-response loop only touches locals and tuples
+        self._checks = tuple(
+            (field.name, field.type, -math.inf if field.minimum is None else field.minimum,
+             math.inf if field.maximum is None else field.maximum, field.required)
+            for field in fields
+        )
+        names = "|".join(re.escape(name) for name in sorted(self.fields, key=len, reverse=True))
+        # Values may be bare or quoted numbers: "uniqueness_score": 0.7 / "uniqueness_score": "0.7"
+        self.pattern = re.compile(rf'"({names})"\s*:\s*"?({NUMBER}|[^\s,"}}]*)')
+
+    def extract(self, response_text):
+        """Parse a raw response envelope and extract the schema fields from its text"""
+        try:
+            data = json.loads(response_text)
+        except (TypeError, ValueError) as e:
+            return self._failed(ExtractionError("invalid_json", f"response is not valid JSON: {e}"))
+        text = data.get(self.text_key) if isinstance(data, dict) else None
+        if not isinstance(text, str):
+            return self._failed(ExtractionError("missing_text", f"response has no {self.text_key!r} string"))
+        return self.extract_text(text)
+
+    def extract_text(self, text):
+        """Extract the schema fields from the model's answer text"""
+        # Answers put the scores in a {...} block: str.find jumps there much faster than the regex
+        # scans prose. Reversed so the first occurrence of a field wins, as with a re.search per field.
+        start = text.find("{")
+        end = text.find("}", start) + 1 if start >= 0 else 0
+        raw = dict(reversed(self.pattern.findall(text, start, end))) if end else {}
+        if len(raw) < len(self._checks):
+            raw = dict(reversed(self.pattern.findall(text)))
+        values, errors = {}, []
+        for name, convert, minimum, maximum, required in self._checks:
+            text_value = raw.get(name)
+            value = None
+            if text_value is None:
+                if required:
+                    errors.append(ExtractionError("missing_field", f"{name} not found", name))
+            else:
+                try:
+                    value = convert(text_value)
+                except ValueError:
+                    errors.append(ExtractionError("not_a_number", f"{name} is not a number: {text_value!r}", name))
+                else:
+                    if not minimum <= value <= maximum:
+                        errors.append(ExtractionError(
+                            "out_of_range", f"{name}={value} outside [{minimum}, {maximum}]", name
+                        ))
+                        value = None
+            values[name] = value
+        return Extraction(values, errors)
+
+    def _failed(self, error):
+        return Extraction({name: None for name in self.fields}, [error])
+
+
+response_extractor = ResponseExtractor()
+
+
+def extract_values(response_text, extractor=response_extractor):
+    """Shortcut for the default valuation-score schema"""
+    return extractor.extract(response_text)
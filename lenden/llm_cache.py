@@ -0,0 +1,95 @@
+"""
+Cache and request coalescing in front of the Vext LLM flow.
+
+Scores are keyed on a hash of the normalised payload fields, so the same
+product description doesn't pay for another multi-second LLM round trip.
+Concurrent requests for the same key share one upstream call (single-flight):
+the first caller fetches, the rest wait for its result. Storage is any
+price_cache-style backend: TTLCache in memory or SQLiteCache on disk, which
+also survives Streamlit reruns and restarts.
+"""
+import hashlib
+import json
+import threading
+
+from lenden.extraction import Extraction
+from math_based_approach.price_cache import MISSING, SQLiteCache
+
+PAYLOAD_FIELDS = ("payload", "brand", "category", "product_name", "original_value")
+
+
+def make_payload_key(data, fields=PAYLOAD_FIELDS):
+    """Case and whitespace don't change the answer, so they don't change the key either"""
+    normalized = {name: " ".join(str(data.get(name) or "").lower().split()) for name in fields}
+    digest = hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f"vext|{digest}"
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LLMScoreCache:
+    """
+    get_scores(data) -> Extraction, calling fetch(data) -> Extraction only on a
+    miss. Only complete extractions are stored; failed ones are handed to the
+    callers that were waiting on that fetch and then retried on the next call.
+    A waiter gives up with TimeoutError after `wait_timeout` seconds; keep it
+    above fetch's own HTTP timeout.
+    """
+
+    def __init__(self, fetch, cache=None, fields=PAYLOAD_FIELDS, wait_timeout=120):
+        self.fetch = fetch
+        self.cache = cache if cache is not None else SQLiteCache('llm_cache.sqlite3', ttl=7 * 86400)
+        self.fields = fields
+        self.wait_timeout = wait_timeout
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get_scores(self, data):
+        key = make_payload_key(data, self.fields)
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return Extraction(cached)
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                raise TimeoutError(f"no answer from the in-flight LLM request after {self.wait_timeout} s")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            # A previous leader may have stored it between our cache miss and taking the lead
+            cached = self.cache.get(key)
+            if cached is not MISSING:
+                call.result = Extraction(cached)
+            else:
+                self.upstream_calls += 1
+                call.result = self.fetch(data)
+                if call.result.ok:
+                    self.cache.set(key, call.result.values)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def stats(self):
+        return {**self.cache.stats(), 'upstream_calls': self.upstream_calls, 'coalesced': self.coalesced}
@@ -0,0 +1,174 @@
+"""
+Bulk valuation sharded across CPU cores.
+
+The input is read lazily, cut into chunks of `chunk_size` rows and fed to a
+ProcessPoolExecutor. Each worker builds its valuator once in the pool
+initializer (so the depreciation model is loaded once per process, not per
+chunk) and values whole chunks. Results come back in input order with a
+bounded number of chunks in flight, so memory stays flat on any input size.
+"""
+import contextlib
+import os
+import sys
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from math_based_approach.bulk import (
+    RecordError, open_input, open_output, open_records, optional_text, require_number, resolve_formats, result_row,
+    result_writer, value_stream
+)
+
+KINDS = ("asset", "product", "service", "api")
+PRODUCT_COLUMNS = ["original_value", "uniqueness_score", "preciousness_score", "market_trend_factor", "years_used"]
+
+_value_chunk = None  # Set per process by _init_worker
+
+
+def _record_chunk_valuer(value_record):
+    # Row-at-a-time valuators: reuse the serial bulk loop on each chunk
+    def value_chunk(chunk):
+        return [(result, error is None) for result, error in value_stream(chunk, value_record)]
+    return value_chunk
+
+
+def _product_chunk_valuer(model_path, factor_columns=()):
+    from math_based_approach.factors import FactorError, factor_registry
+    from train_model.model_registry import load_model
+    from train_model.valuation_classes import value_products
+
+    model = load_model(model_path)
+    # value_products hands the model a bare array; a forest fitted on a DataFrame warns on every call
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    columns = PRODUCT_COLUMNS + list(factor_columns)
+    table_columns = columns + ["category"]  # Picks up category default factors, like the scalar path
+
+    def value_chunk(chunk):
+        # Validate row by row, then one vectorised value_products call for the good rows
+        results = [None] * len(chunk)
+        valid = []
+        table = {name: [] for name in table_columns}
+        for i, (line_number, record) in enumerate(chunk):
+            if isinstance(record, RecordError):
+                results[i] = (result_row(line_number, {}, error=str(record)), False)
+                continue
+            try:
+                values = [require_number(record, name) for name in columns]
+                factor_registry.check(dict(zip(factor_columns, values[len(PRODUCT_COLUMNS):])))
+            except (RecordError, FactorError) as e:
+                results[i] = (result_row(line_number, record, error=str(e)), False)
+                continue
+            valid.append(i)
+            for name, value in zip(columns, values):
+                table[name].append(value)
+            table["category"].append(optional_text(record, "category", "general"))
+
+        if valid:
+            for i, value in zip(valid, value_products(table, factor_columns, model=model)):
+                results[i] = (result_row(*chunk[i], float(value)), True)
+        return results
+
+    return value_chunk
+
+
+def make_chunk_valuer(kind, model_path="depreciation_model.pkl", factor_columns=(), adjust_inflation=False):
+    """chunk of (line_number, record) pairs -> list of (result, ok) for one valuation kind"""
+    if kind == "asset":
+        from math_based_approach.math_valuation import value_asset_record
+        return _record_chunk_valuer(value_asset_record)
+    if kind == "product":
+        return _product_chunk_valuer(model_path, factor_columns)
+    if kind == "service":
+        from train_model.valuation_classes import value_service_record
+        return _record_chunk_valuer(lambda record: value_service_record(record, factor_columns))
+    if kind == "api":
+        from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+        valuator = AssetValuationUsingAPIs()
+        return _record_chunk_valuer(lambda record: valuator.value_record(record, adjust_inflation))
+    raise ValueError(f"unknown valuation kind {kind!r}, expected one of {KINDS}")
+
+
+def _init_worker(kind, options):
+    global _value_chunk
+    sys.stdout = sys.stderr  # Valuation code prints diagnostics; results only travel back via the pool
+    _value_chunk = make_chunk_valuer(kind, **options)
+
+
+def _run_chunk(chunk):
+    return _value_chunk(chunk)
+
+
+def _chunks(records, chunk_size):
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _ordered_map(pool, chunks, max_pending):
+    # Like pool.map, but only keeps `max_pending` chunks in flight instead of submitting everything up front
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(_run_chunk, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def print_progress(rows, failed, elapsed, done=False):
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    end = "\n" if done else ""
+    print(f"\r{rows:,} rows ({failed:,} errors) {rate:,.0f} rows/s", end=end, file=sys.stderr, flush=True)
+
+
+def run_parallel(kind, source="-", output="-", input_format=None, output_format=None, workers=None,
+                 chunk_size=2000, model_path="depreciation_model.pkl", factor_columns=(), adjust_inflation=False,
+                 progress=None):
+    """
+    Value every record in `source` with `workers` processes and write the
+    results to `output` in input order. `progress(rows, failed, elapsed, done)`
+    is called after every chunk. workers=1 runs in-process, without a pool.
+    Returns (rows_valued, rows_failed).
+    """
+    workers = workers or os.cpu_count() or 1
+    options = {"model_path": model_path, "factor_columns": tuple(factor_columns), "adjust_inflation": adjust_inflation}
+    input_format, output_format = resolve_formats(source, output, input_format, output_format)
+    valued = failed = 0
+    start = time.perf_counter()
+
+    with contextlib.ExitStack() as stack:
+        infile = stack.enter_context(open_input(source))
+        outfile = stack.enter_context(open_output(output))
+        input_fields, records = open_records(infile, input_format)
+        writer = result_writer(outfile, output_format, input_fields)
+        stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        chunks = _chunks(records, chunk_size)
+
+        if workers == 1:
+            value_chunk = make_chunk_valuer(kind, **options)
+            results = map(value_chunk, chunks)
+        else:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(kind, options))
+            )
+            results = _ordered_map(pool, chunks, max_pending=2 * workers)
+
+        for chunk_results in results:
+            for result, ok in chunk_results:
+                writer.write(result)
+                if ok:
+                    valued += 1
+                else:
+                    failed += 1
+            outfile.flush()
+            if progress is not None:
+                progress(valued + failed, failed, time.perf_counter() - start, False)
+        writer.close()
+
+    if progress is not None:
+        progress(valued + failed, failed, time.perf_counter() - start, True)
+    return valued, failed
@@ -0,0 +1,211 @@
+"""
+Compact valuation records for holding many pending valuations in memory.
+
+A ProductValuation / ServiceValuation instance carries a __dict__, its own
+additional_factors dict and (for products) a model reference: hundreds of
+bytes per item before any numbers. ProductRecord / ServiceRecord are
+__slots__ dataclasses with just the inputs, and the factor names of a record
+are one shared tuple per distinct name set, so a row only stores its
+multipliers.
+
+ValuationBatch goes further for bulk use: one NumPy structured array for the
+numeric fields, category codes into a shared category table, and the factors
+as CSR-style arrays (row offsets, factor ids, multipliers) over an interned
+factor-name table -- tens of bytes per row.
+
+All of them convert to and from the valuation classes without losing
+anything (numbers come back as floats) and value to the same results.
+"""
+import sys
+from array import array
+from dataclasses import dataclass
+from itertools import chain
+
+import numpy as np
+
+PRODUCT_FIELDS = ("original_value", "years_used", "uniqueness_score", "preciousness_score", "market_trend_factor")
+SERVICE_FIELDS = ("base_rate", "hours", "expertise_level", "demand_factor")
+
+PRODUCT_DTYPE = np.dtype([("category", "i4")] + [(name, "f8") for name in PRODUCT_FIELDS])
+SERVICE_DTYPE = np.dtype([("category", "i4")] + [(name, "f8") for name in SERVICE_FIELDS])
+
+_factor_name_sets = {}
+
+
+def intern_factor_names(names):
+    """The shared tuple (of interned strings) for this sequence of factor names"""
+    names = tuple(names)
+    shared = _factor_name_sets.get(names)
+    if shared is None:
+        shared = _factor_name_sets.setdefault(names, tuple(sys.intern(name) for name in names))
+    return shared
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    category: str
+    original_value: float
+    years_used: float
+    uniqueness_score: float
+    preciousness_score: float
+    market_trend_factor: float
+    factor_names: tuple = ()
+    factor_values: tuple = ()
+
+    @property
+    def additional_factors(self):
+        return dict(zip(self.factor_names, self.factor_values))
+
+    @classmethod
+    def from_valuation(cls, product):
+        factors = product.additional_factors or {}
+        return cls(product.category, *(getattr(product, name) for name in PRODUCT_FIELDS),
+                   intern_factor_names(factors), tuple(factors.values()))
+
+    def to_valuation(self, model_path="depreciation_model.pkl", mmap_mode=None, predictor=None):
+        from train_model.valuation_classes import ProductValuation
+        return ProductValuation(
+            self.category, self.original_value, self.years_used, self.uniqueness_score, self.preciousness_score,
+            self.market_trend_factor, self.additional_factors, model_path=model_path, mmap_mode=mmap_mode,
+            predictor=predictor
+        )
+
+
+@dataclass(slots=True)
+class ServiceRecord:
+    category: str
+    base_rate: float
+    hours: float
+    expertise_level: float
+    demand_factor: float
+    factor_names: tuple = ()
+    factor_values: tuple = ()
+
+    @property
+    def additional_factors(self):
+        return dict(zip(self.factor_names, self.factor_values))
+
+    @classmethod
+    def from_valuation(cls, service):
+        factors = service.additional_factors or {}
+        return cls(service.category, *(getattr(service, name) for name in SERVICE_FIELDS),
+                   intern_factor_names(factors), tuple(factors.values()))
+
+    def to_valuation(self):
+        from train_model.valuation_classes import ServiceValuation
+        return ServiceValuation(
+            self.category, self.base_rate, self.hours, self.expertise_level, self.demand_factor,
+            self.additional_factors
+        )
+
+
+class ValuationBatch:
+    """
+    Struct-of-arrays storage for many products or services (`kind`).
+
+    `rows` is a PRODUCT_DTYPE / SERVICE_DTYPE structured array whose category
+    column indexes `categories`. Row i's additional factors are
+    factor_ids / factor_values[factor_offsets[i]:factor_offsets[i + 1]], in
+    their original dict order, with factor_ids indexing `factor_names`.
+    """
+
+    def __init__(self, kind, rows, categories, factor_names, factor_offsets, factor_ids, factor_values):
+        if kind not in ("product", "service"):
+            raise ValueError(f"kind must be 'product' or 'service', got {kind!r}")
+        self.kind = kind
+        self.rows = rows
+        self.categories = categories
+        self.factor_names = factor_names
+        self.factor_offsets = factor_offsets
+        self.factor_ids = factor_ids
+        self.factor_values = factor_values
+
+    @classmethod
+    def from_valuations(cls, items, kind=None):
+        """
+        Pack valuation objects or records (anything with the fields and an
+        additional_factors dict) in one pass. The kind is guessed from the
+        first item when not given.
+        """
+        items = iter(items)
+        first = next(items, None)
+        if kind is None:
+            kind = "service" if hasattr(first, "base_rate") else "product"
+        fields = SERVICE_FIELDS if kind == "service" else PRODUCT_FIELDS
+
+        categories, category_codes = [], {}
+        factor_names, factor_codes = [], {}
+        # array.array grows without a Python object per element
+        offsets, ids, values = array("q", [0]), array("i"), array("d")
+
+        def pack(item):
+            code = category_codes.get(item.category)
+            if code is None:
+                code = category_codes[item.category] = len(categories)
+                categories.append(item.category)
+            for name, multiplier in (item.additional_factors or {}).items():
+                factor_id = factor_codes.get(name)
+                if factor_id is None:
+                    factor_id = factor_codes[name] = len(factor_names)
+                    factor_names.append(sys.intern(name))
+                ids.append(factor_id)
+                values.append(multiplier)
+            offsets.append(len(ids))
+            return (code, *(getattr(item, name) for name in fields))
+
+        source = chain((first,), items) if first is not None else ()
+        rows = np.fromiter(map(pack, source), dtype=SERVICE_DTYPE if kind == "service" else PRODUCT_DTYPE)
+        return cls(
+            kind, rows, categories, factor_names, np.frombuffer(offsets, dtype=np.int64),
+            np.frombuffer(ids, dtype=np.intc), np.frombuffer(values, dtype=float)
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _record(self, row, start, end):
+        record_class = ServiceRecord if self.kind == "service" else ProductRecord
+        names = intern_factor_names(self.factor_names[i] for i in self.factor_ids[start:end].tolist())
+        return record_class(self.categories[row[0]], *row[1:], names, tuple(self.factor_values[start:end].tolist()))
+
+    def __getitem__(self, index):
+        index = range(len(self))[index]  # Bounds check and negative indexes
+        return self._record(self.rows[index].item(), self.factor_offsets[index], self.factor_offsets[index + 1])
+
+    def __iter__(self):
+        offsets = self.factor_offsets.tolist()
+        for i, row in enumerate(self.rows.tolist()):
+            yield self._record(row, offsets[i], offsets[i + 1])
+
+    def to_valuations(self, **options):
+        """Lazily rebuild the valuation objects; options go to ProductRecord.to_valuation"""
+        return (record.to_valuation(**options) for record in self)
+
+    def factor_matrix(self):
+        """(rows x factor_registry factors) multipliers, NaN where a row doesn't set a factor"""
+        from math_based_approach.factors import factor_registry
+
+        # Batch factor ids -> registry columns; names are looked up and bounds-checked once per batch, not per row
+        columns = np.array([
+            factor_registry.check_column(name, self.factor_values[self.factor_ids == i]).index
+            for i, name in enumerate(self.factor_names)
+        ], dtype=np.intp)
+        matrix = np.full((len(self), len(factor_registry.names)), np.nan)
+        rows = np.repeat(np.arange(len(self)), np.diff(self.factor_offsets))
+        matrix[rows, columns[self.factor_ids]] = self.factor_values
+        return matrix
+
+    def valuations(self, model=None, model_path="depreciation_model.pkl"):
+        """Every row's valuation, through value_products / price_services"""
+        from train_model.valuation_classes import price_services, value_products
+
+        categories = np.array(self.categories, dtype=object)[self.rows["category"]]
+        if self.kind == "service":
+            return price_services(*(self.rows[name] for name in SERVICE_FIELDS), self.factor_matrix(), categories)
+        columns = {name: self.rows[name] for name in PRODUCT_FIELDS}
+        columns["category"] = categories
+        return value_products(columns, model=model, model_path=model_path, factors=self.factor_matrix())
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes + self.factor_offsets.nbytes + self.factor_ids.nbytes + self.factor_values.nbytes
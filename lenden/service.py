@@ -0,0 +1,309 @@
+"""
+HTTP valuation service (plain ASGI, so any ASGI server can run it).
+
+    uvicorn lenden.service:app --workers 4      (or: python -m lenden serve --workers 4)
+
+    POST /value/product    ProductValuation with the depreciation model
+    POST /value/service    ServiceValuation
+    POST /value/asset      AssetValuation formulas (value_asset_record fields)
+    POST /value/api        AssetValuationUsingAPIs (eBay market price)
+    POST /value/batch?kind=product|service|asset|api[&factor=COLUMN...]
+                           NDJSON rows in, NDJSON results out, streamed in input order;
+                           a batch that fails midway ends with an {"error": ...} row
+    GET  /healthz, /metrics
+
+Single endpoints take one JSON object with the same fields as a `lenden bulk`
+row (plus an optional "additional_factors" object for products and services)
+and answer {"value": ...}, or a 400 with {"error": ...} for a bad field.
+
+Each worker process loads the depreciation model once, at startup, and puts a
+BatchPredictor in front of it, so concurrent /value/product requests share
+batched predict calls. Blocking work (predicts, eBay lookups, batch chunks)
+runs on a thread pool, never on the event loop. The module-level `app` takes
+its settings from LENDEN_* environment variables, see app_from_env().
+"""
+import asyncio
+import functools
+import json
+import os
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from lenden.parallel import KINDS, make_chunk_valuer
+from math_based_approach import instrumentation
+from math_based_approach.bulk import RecordError, optional_text, parse_json_record, require_number, value_stream
+from math_based_approach.factors import FactorError, factor_registry
+
+MAX_BODY = 1 << 20  # Single valuations only; /value/batch is streamed
+PRODUCT_FIELDS = ["original_value", "years_used", "uniqueness_score", "preciousness_score", "market_trend_factor"]
+SERVICE_FIELDS = ["base_rate", "hours", "expertise_level", "demand_factor"]
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def known_factor(name):
+    # Request input never registers new factors: the shared registry would keep every name ever sent
+    if name not in factor_registry.factors:
+        raise RecordError(f"unknown factor '{name}', expected one of {', '.join(factor_registry.names)}")
+    return name
+
+
+def additional_factors(record):
+    factors = record.get("additional_factors") or {}
+    if not isinstance(factors, dict):
+        raise RecordError("'additional_factors' must be an object of name: multiplier")
+    return {known_factor(name): require_number(factors, name) for name in factors}
+
+
+async def send_json(send, status, body):
+    data = json.dumps(body, default=str).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode())],
+    })
+    await send({"type": "http.response.body", "body": data})
+
+
+async def read_body(receive, limit=MAX_BODY):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(499, "client disconnected")
+        body += message.get("body", b"")
+        if len(body) > limit:
+            raise HTTPError(413, f"request body over {limit} bytes; use /value/batch for bulk jobs")
+        if not message.get("more_body"):
+            return bytes(body)
+
+
+async def record_chunks(receive, chunk_size):
+    """NDJSON request body -> lists of (line_number, record) pairs, yielded as the bytes arrive"""
+    buffer = b""
+    line_number = 0
+    chunk = []
+    more = True
+    while more:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        more = message.get("more_body", False)
+        lines = (buffer + message.get("body", b"")).split(b"\n")
+        buffer = lines.pop() if more else b""  # Partial last line waits for the next message
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            chunk.append((line_number, parse_json_record(line)))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class ValuationApp:
+    def __init__(self, model_path="depreciation_model.pkl", max_batch_size=64, max_delay=0.002, threads=32,
+                 chunk_size=2000, max_pending_chunks=4, adjust_inflation=False):
+        self.model_path = model_path
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.threads = threads
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.adjust_inflation = adjust_inflation
+        self.executor = None
+        self.api = None
+        self.predictor = None
+        self.routes = {
+            "/value/product": ("POST", functools.partial(self._single, "product", self._value_product)),
+            "/value/service": ("POST", functools.partial(self._single, "service", self._value_service)),
+            "/value/asset": ("POST", functools.partial(self._single, "asset", self._value_asset)),
+            "/value/api": ("POST", functools.partial(self._single, "api", self._value_api)),
+            "/value/batch": ("POST", self._batch),
+            "/healthz": ("GET", self._healthz),
+            "/metrics": ("GET", self._metrics),
+        }
+
+    def startup(self):
+        """Load the model and start the predictor/thread pool; runs once per worker process"""
+        if self.predictor is not None:
+            return
+        from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+        from train_model.batch_predictor import BatchPredictor
+        from train_model.model_registry import load_model
+
+        model = load_model(self.model_path)
+        # BatchPredictor hands the model a bare array; a forest fitted on a DataFrame warns on every call
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        self.executor = ThreadPoolExecutor(self.threads, thread_name_prefix="valuation")
+        self.api = AssetValuationUsingAPIs()
+        self.predictor = BatchPredictor(model, self.max_batch_size, self.max_delay)
+
+    def shutdown(self):
+        if self.predictor is None:
+            return
+        self.predictor.close()
+        self.executor.shutdown()
+        self.api.close()
+        self.predictor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        self.startup()  # No-op once started; covers servers that don't send lifespan events
+        try:
+            route = self.routes.get(scope["path"])
+            if route is None:
+                raise HTTPError(404, f"no such endpoint: {scope['path']}")
+            method, handler = route
+            if scope["method"] != method:
+                raise HTTPError(405, f"{scope['path']} only accepts {method}")
+            await handler(scope, receive, send)
+        except HTTPError as e:
+            await send_json(send, e.status, {"error": str(e)})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": f"{type(e).__name__}: {e}"})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _run(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def _single(self, kind, value, scope, receive, send):
+        record = parse_json_record(await read_body(receive))
+        try:
+            if isinstance(record, RecordError):
+                raise record
+            with instrumentation.stage(f"http_{kind}"):
+                result = await value(record)
+        except (RecordError, FactorError) as e:
+            raise HTTPError(400, str(e))
+        except Exception as e:
+            instrumentation.count_error(f"http_{kind}", e)
+            raise HTTPError(500, f"{type(e).__name__}: {e}")
+        await send_json(send, 200, {"value": result})
+
+    async def _value_product(self, record):
+        from train_model.valuation_classes import ProductValuation
+
+        args = [require_number(record, name) for name in PRODUCT_FIELDS]
+        # With a predictor the constructor doesn't touch the model registry, so only the predict needs the pool
+        product = ProductValuation(
+            optional_text(record, "category", "general"), *args, additional_factors(record), predictor=self.predictor
+        )
+        return await self._run(product.calculate_valuation)
+
+    async def _value_service(self, record):
+        from train_model.valuation_classes import ServiceValuation
+
+        args = [require_number(record, name) for name in SERVICE_FIELDS]
+        service = ServiceValuation(optional_text(record, "category", "general"), *args, additional_factors(record))
+        return service.calculate_valuation()
+
+    async def _value_asset(self, record):
+        from math_based_approach.math_valuation import value_asset_record
+        return value_asset_record(record)
+
+    async def _value_api(self, record):
+        return await self._run(self._value_api_record, record)
+
+    def _value_api_record(self, record):
+        return self.api.value_record(record, bool(record.get("adjust_inflation", self.adjust_inflation)))
+
+    def _chunk_valuer(self, kind, factor_columns):
+        if kind == "api":
+            # Shares the /value/api valuator, and with it the price cache and HTTP session
+            return lambda chunk: [(result, error is None) for result, error in value_stream(chunk, self._value_api_record)]
+        return make_chunk_valuer(kind, self.model_path, factor_columns, self.adjust_inflation)
+
+    async def _batch(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode())
+        kind = query.get("kind", ["product"])[0]
+        if kind not in KINDS:
+            raise HTTPError(400, f"unknown kind {kind!r}, expected one of {', '.join(KINDS)}")
+        try:
+            factor_columns = tuple(known_factor(name) for name in query.get("factor", []))
+        except RecordError as e:
+            raise HTTPError(400, str(e))
+        value_chunk = self._chunk_valuer(kind, factor_columns)
+
+        # Everything that can be rejected with a status is checked above; once the 200 is out, a failure
+        # can only end the stream with an {"error": ...} row
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+        pending = deque()
+        try:
+            # Chunks are valued on the pool while more of the body arrives; results go out in input order
+            async for chunk in record_chunks(receive, self.chunk_size):
+                pending.append(self._run(value_chunk, chunk))
+                if len(pending) >= self.max_pending_chunks:
+                    await self._send_rows(send, await pending.popleft())
+                while pending and pending[0].done():
+                    await self._send_rows(send, pending.popleft().result())
+            while pending:
+                await self._send_rows(send, await pending.popleft())
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            message = str(e) if isinstance(e, HTTPError) else f"{type(e).__name__}: {e}"
+            if not isinstance(e, HTTPError):
+                instrumentation.count_error("http_batch", e)
+            await self._send_rows(send, [({"error": message}, False)])
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _send_rows(send, results):
+        body = "".join(json.dumps(result, default=str) + "\n" for result, _ in results).encode()
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    async def _healthz(self, scope, receive, send):
+        await send_json(send, 200, {"status": "ok", "model": self.model_path})
+
+    async def _metrics(self, scope, receive, send):
+        body = instrumentation.render_prometheus().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain; version=0.0.4; charset=utf-8")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def app_from_env():
+    """
+    ValuationApp configured from LENDEN_MODEL, LENDEN_MAX_BATCH, LENDEN_MAX_DELAY,
+    LENDEN_THREADS, LENDEN_CHUNK_SIZE and LENDEN_ADJUST_INFLATION=1
+    """
+    env = os.environ.get
+    return ValuationApp(
+        model_path=env("LENDEN_MODEL", "depreciation_model.pkl"),
+        max_batch_size=int(env("LENDEN_MAX_BATCH", 64)),
+        max_delay=float(env("LENDEN_MAX_DELAY", 0.002)),
+        threads=int(env("LENDEN_THREADS", 32)),
+        chunk_size=int(env("LENDEN_CHUNK_SIZE", 2000)),
+        adjust_inflation=env("LENDEN_ADJUST_INFLATION") == "1",
+    )
+
+
+app = app_from_env()
@@ -1,5 +1,4 @@
-from services.product_valuation import ProductValuation
-from services.service_valuation import ServiceValuation
+from train_model.valuation_classes import ProductValuation, ServiceValuation
 
 if __name__ == "__main__":
     product = ProductValuation(
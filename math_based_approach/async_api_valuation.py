@@ -0,0 +1,150 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from math_based_approach import instrumentation
+from math_based_approach.http_transport import timeout_for
+from math_based_approach.instrumentation import timed
+from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+from math_based_approach.price_cache import MISSING, make_price_key
+
+
+class HostRateLimiter:
+    """Spaces requests to each host at most `rate` per second (None = unlimited)"""
+
+    def __init__(self, rate=None):
+        self.rate = rate
+        self._next_slot = {}
+
+    async def wait(self, url):
+        if not self.rate:
+            return
+        host = urlsplit(url).hostname
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # No await between reading and booking the slot, so this is race-free on one loop
+        slot = max(self._next_slot.get(host, now), now)
+        self._next_slot[host] = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncAssetValuationUsingAPIs(AssetValuationUsingAPIs):
+    """
+    asyncio flavour of AssetValuationUsingAPIs for bulk intake.
+
+    Shares the category table, price cache, token manager and trimmed-mean /
+    fallback logic with the sync class; only the HTTP calls differ. Use it as
+    an async context manager so the aiohttp session gets closed.
+    """
+
+    def __init__(self, concurrency=50, per_host_rate=None, **kwargs):
+        super().__init__(**kwargs)
+        self.concurrency = concurrency
+        self.rate_limiter = HostRateLimiter(per_host_rate)
+        self._http = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self.close()
+
+    def _client(self):
+        # Created lazily so it binds to the running event loop
+        if self._http is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._http = aiohttp.ClientSession(connector=connector, raise_for_status=True)
+        return self._http
+
+    async def _aget_json(self, url, **kwargs):
+        await self.rate_limiter.wait(url)
+        connect_timeout, read_timeout = timeout_for(url, self.timeouts)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        async with self._client().get(url, timeout=timeout, **kwargs) as response:
+            return await response.json(content_type=None)
+
+    @timed('market_price')
+    async def aget_market_price(self, product_name, category):
+        """Async get_market_price: same cache, single-flight token and capped 401 retries"""
+        cache_key = make_price_key(product_name, category)
+        cached_price = self.price_cache.get(cache_key)
+        instrumentation.count_cache('price', cached_price is not MISSING)
+        if cached_price is not MISSING:
+            return cached_price
+
+        # Token requests stay on the sync session; the manager makes them single-flight
+        token = await asyncio.to_thread(self._get_oauth_token)
+        for attempt in range(self.max_auth_retries + 1):
+            if token is None:
+                return None
+            headers, params = self._market_price_request(product_name, category, token)
+            try:
+                payload = await self._aget_json(self.ebay_api_endpoint, headers=headers, params=params)
+                price = self._price_from_listings(payload.get('itemSummaries', []))
+                break
+            except aiohttp.ClientResponseError as e:
+                if e.status == 401 and attempt < self.max_auth_retries:
+                    token = await asyncio.to_thread(self._get_oauth_token, token)
+                    continue
+                print(f"API Error: {e.status} {e.message}")
+                return None
+            except Exception as e:
+                print(f"Price check failed: {str(e)}")
+                return None
+
+        self.price_cache.set(cache_key, price)
+        return price
+
+    async def aget_inflation_adjusted(self, value, years_used):
+        """Async get_inflation_adjusted: an O(1) table lookup once the inflation index is loaded"""
+        if self.inflation_index.is_current():
+            return self.get_inflation_adjusted(value, years_used)
+        # First call (or stale table): the fetch is a blocking request, keep it off the loop
+        return await asyncio.to_thread(self.get_inflation_adjusted, value, years_used)
+
+    async def acalculate_valuation(self, product_name, years_used, initial_price=None):
+        """
+        Async calculate_valuation. Never prompts: without a market price the
+        theoretical fallback needs `initial_price`, otherwise the result is None.
+        """
+        try:
+            category = self.categorize_product(product_name)
+            market_price = await self.aget_market_price(product_name, category)
+
+            if market_price:
+                return self._apply_condition_adjustment(market_price, years_used, category)
+            if initial_price is None:
+                print(f"No market price for {product_name!r} and no original price to fall back on")
+                return None
+            return self._calculate_theoretical_value(category, years_used, initial_price)
+
+        except Exception as e:
+            print(f"Valuation error: {str(e)}")
+            return None
+
+    async def avaluate_many(self, items, concurrency=None, adjust_inflation=False):
+        """
+        Value (product_name, years_used[, initial_price]) tuples concurrently.
+
+        At most `concurrency` valuations are in flight at once; results come
+        back in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def value_one(item):
+            product_name, years_used, *rest = item
+            async with semaphore:
+                value = await self.acalculate_valuation(product_name, years_used, *rest)
+                if value and adjust_inflation:
+                    value = await self.aget_inflation_adjusted(value, years_used)
+                return value
+
+        return await asyncio.gather(*(value_one(item) for item in items))
@@ -0,0 +1,250 @@
+"""
+Streaming, non-interactive bulk valuation.
+
+Records are read one at a time from a CSV or JSONL file (or stdin), valued,
+and written straight back out with `line`, `value` and `error` columns, so
+memory stays flat no matter how many rows the input has. Nothing ever
+prompts: a missing or malformed field fails that row only.
+
+Every result row has the same keys: the input line number, the input
+fields, then value and error. CSV output takes its header from the CSV
+input's header; from JSONL input the rows are spooled to a temporary file
+until every key is known.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import tempfile
+
+
+class RecordError(ValueError):
+    """A single input row can't be valued (missing/invalid field)"""
+
+
+def _field(record, name):
+    value = record.get(name)
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in (None, "") else value
+
+
+def optional_text(record, name, default=None):
+    value = _field(record, name)
+    return default if value is None else str(value)
+
+
+def require_text(record, name):
+    value = optional_text(record, name)
+    if value is None:
+        raise RecordError(f"missing field '{name}'")
+    return value
+
+
+def optional_number(record, name, default=None):
+    value = _field(record, name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"field '{name}' is not a number: {value!r}")
+
+
+def require_number(record, name):
+    value = optional_number(record, name)
+    if value is None:
+        raise RecordError(f"missing field '{name}'")
+    return value
+
+
+def guess_format(path):
+    return "jsonl" if str(path).endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def resolve_formats(source, output, input_format=None, output_format=None):
+    """Fill in unset formats from the file extensions; stdout mirrors the input format"""
+    input_format = input_format or ("csv" if source == "-" else guess_format(source))
+    output_format = output_format or (input_format if output == "-" else guess_format(output))
+    return input_format, output_format
+
+
+def open_records(stream, fmt="csv"):
+    """
+    (input field names, records) where records yields (line_number, record)
+    pairs; an unparseable JSONL line yields a RecordError as the record.
+    JSONL has no header, so its field names are None.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        return list(reader.fieldnames or []), ((reader.line_num, record) for record in reader)
+    return None, _jsonl_records(stream)
+
+
+def read_records(stream, fmt="csv"):
+    return open_records(stream, fmt)[1]
+
+
+def _jsonl_records(stream):
+    for line_number, line in enumerate(stream, 1):
+        if line.strip():
+            yield line_number, parse_json_record(line)
+
+
+def parse_json_record(line):
+    """One JSONL line -> record dict, or a RecordError describing why it isn't one"""
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return RecordError(f"invalid JSON: {e}")
+    if not isinstance(record, dict):
+        return RecordError("expected a JSON object")
+    return record
+
+
+RESULT_FIELDS = ("line", "value", "error")
+
+
+def result_row(line_number, record, value="", error=""):
+    """One output row; error rows have the same keys as valued ones (record is {} for an unparseable line)"""
+    return {"line": line_number, **record, "value": value, "error": error}
+
+
+def result_fields(input_fields):
+    """Output columns for rows built by result_row from records with these fields"""
+    return ["line", *(name for name in input_fields if name not in RESULT_FIELDS), "value", "error"]
+
+
+class _CSVResultWriter:
+    # Without the input's field names (JSONL in) the header isn't known until the last row, so rows are spooled
+    def __init__(self, stream, input_fields=None):
+        self.stream = stream
+        self.writer = None
+        self.spool = None
+        self.fields = {}  # Ordered set of the spooled rows' keys
+        if input_fields is None:
+            self.spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+        else:
+            self._start(result_fields(input_fields))
+
+    def _start(self, fieldnames):
+        # extrasaction: a CSV row with more cells than the header has them under a None key
+        self.writer = csv.DictWriter(
+            self.stream, fieldnames=fieldnames, extrasaction="ignore", restval="", lineterminator="\n"
+        )
+        self.writer.writeheader()
+
+    def write(self, result):
+        if self.spool is None:
+            self.writer.writerow(result)
+            return
+        self.fields.update(dict.fromkeys(result))
+        self.spool.write(json.dumps(result, default=str) + "\n")
+
+    def close(self):
+        if self.spool is None:
+            return
+        self._start(result_fields(self.fields))
+        self.spool.seek(0)
+        for line in self.spool:
+            self.writer.writerow(json.loads(line))
+        self.spool.close()
+        self.spool = None
+
+
+class _JSONLResultWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, result):
+        self.stream.write(json.dumps(result, default=str) + "\n")
+
+    def close(self):
+        pass
+
+
+def result_writer(stream, fmt="csv", input_fields=None):
+    """
+    Object with write(result_dict) and close() for the given output format.
+    Pass the input's field names when they are known up front (CSV input) so
+    CSV output streams instead of spooling.
+    """
+    return _JSONLResultWriter(stream) if fmt == "jsonl" else _CSVResultWriter(stream, input_fields)
+
+
+@contextlib.contextmanager
+def open_input(path):
+    if path == "-":
+        sys.stdin.reconfigure(newline="")  # csv does its own newline handling
+        yield sys.stdin
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield f
+
+
+@contextlib.contextmanager
+def open_output(path):
+    if path == "-":
+        yield sys.stdout
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            yield f
+
+
+def value_stream(records, value_record):
+    """Value (line_number, record) pairs lazily -> (result, error) pairs"""
+    for line_number, record in records:
+        if isinstance(record, RecordError):
+            yield result_row(line_number, {}, error=str(record)), record
+            continue
+        try:
+            value = value_record(record)
+            error = None
+        except Exception as e:
+            value = ""
+            error = e if isinstance(e, RecordError) else RecordError(f"{type(e).__name__}: {e}")
+        yield result_row(line_number, record, value, str(error) if error else ""), error
+
+
+def run_bulk(value_record, source="-", output="-", input_format=None, output_format=None, flush_every=1000):
+    """
+    Stream every record in `source` through value_record(record) -> value and
+    write one result row per input row to `output` ('-' is stdin/stdout).
+    Returns (rows_valued, rows_failed).
+    """
+    input_format, output_format = resolve_formats(source, output, input_format, output_format)
+    valued = failed = 0
+
+    with open_input(source) as infile, open_output(output) as outfile:
+        input_fields, records = open_records(infile, input_format)
+        writer = result_writer(outfile, output_format, input_fields)
+        # Anything the valuation code prints is diagnostics; keep it out of the result stream
+        with contextlib.redirect_stdout(sys.stderr):
+            for result, error in value_stream(records, value_record):
+                writer.write(result)
+                if error is None:
+                    valued += 1
+                else:
+                    failed += 1
+                if (valued + failed) % flush_every == 0:
+                    outfile.flush()
+        writer.close()
+        outfile.flush()
+
+    return valued, failed
+
+
+def build_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--input", help="CSV or JSONL file of assets, '-' for stdin (omit for interactive mode)")
+    parser.add_argument("--output", default="-", help="where to write results, '-' for stdout")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="default: from the file extension")
+    return parser
+
+
+def run_cli(args, value_record):
+    valued, failed = run_bulk(value_record, args.input, args.output, args.input_format, args.output_format)
+    print(f"Valued {valued} rows, {failed} errors", file=sys.stderr)
+    return 1 if failed and not valued else 0
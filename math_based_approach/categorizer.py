@@ -0,0 +1,115 @@
+import json
+import re
+
+# Default taxonomies, in priority order: when a name matches keywords of several
+# categories the one listed first wins. They match whole words (plus plurals), so
+# compounds the old substring scan caught by accident are listed explicitly
+# (headphone, cellphone, artwork, motorbike); 'smartwatch' and 'scarf' no longer
+# count as art and car.
+PRODUCT_CATEGORIES = {
+    'electronics': ['phone', 'iphone', 'smartphone', 'cellphone', 'telephone', 'headphone', 'laptop', 'tablet',
+                    'camera'],
+    'vehicles': ['car', 'bike', 'motorbike', 'motorcycle', 'scooter'],
+    'real_estate': ['house', 'apartment', 'land', 'property'],
+    'collectibles': ['art', 'artwork', 'antique', 'coin', 'stamp'],
+    'furniture': ['chair', 'table', 'sofa', 'cabinet']
+}
+
+VALUATION_METHODS = {
+    'appreciate': ['art', 'artwork', 'real estate', 'antique', 'collectible', 'jewelry'],
+    'depreciate': ['car', 'motorbike', 'laptop', 'phone', 'iphone', 'smartphone', 'cellphone', 'telephone', 'headphone',
+                   'equipment', 'furniture']
+}
+
+
+def _trie_pattern(keywords):
+    """
+    Regex alternation for `keywords` built from a character trie, so shared
+    prefixes are matched once ('car|card|cart' -> 'car(?:d|t)?') and the
+    pattern stays fast with tens of thousands of keywords.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-keyword marker
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here but longer ones continue: optional, greedy -> longest match first
+            return '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+class KeywordCategorizer:
+    """
+    Keyword taxonomy compiled once into a single regex.
+
+    `taxonomy` maps category -> keywords; its order is the tie-break priority.
+    With `word_boundary` on, keywords only match whole words (optionally
+    pluralised with s/es), so 'art' no longer matches 'smartwatch'. Without it
+    the result is the same as scanning for every keyword as a substring.
+    Names matching nothing get `default`.
+    """
+
+    def __init__(self, taxonomy, default=None, word_boundary=True):
+        self.categories = list(taxonomy)
+        self.default = default
+        self._rank = {}
+        for rank, category in enumerate(self.categories):
+            for keyword in taxonomy[category]:
+                keyword = ' '.join(keyword.lower().split())
+                if keyword:
+                    self._rank.setdefault(keyword, rank)
+
+        alternation = _trie_pattern(self._rank) if self._rank else '(?!)'
+        # Zero-width lookahead: one match per start position, so matches can overlap ('stamphone'
+        # holds both 'stamp' and 'phone') and a lower-priority keyword can't swallow a better one
+        if word_boundary:
+            pattern = rf'(?=\b({alternation})(?:e?s)?\b)'
+        else:
+            pattern = f'(?=({alternation}))'
+            # The trie matches the longest keyword at a position, but every keyword that is a prefix
+            # of it ('car' in 'card') matches there too: rank it as the best of those
+            for keyword in sorted(self._rank, key=len):
+                for end in range(1, len(keyword)):
+                    prefix_rank = self._rank.get(keyword[:end])
+                    if prefix_rank is not None and prefix_rank < self._rank[keyword]:
+                        self._rank[keyword] = prefix_rank
+        self._pattern = re.compile(pattern)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Load a {category: [keywords]} taxonomy from a JSON or YAML file"""
+        with open(path) as f:
+            if str(path).endswith(('.yaml', '.yml')):
+                import yaml
+                taxonomy = yaml.safe_load(f)
+            else:
+                taxonomy = json.load(f)
+        return cls(taxonomy, **kwargs)
+
+    def categorize(self, name):
+        """Highest-priority category with a keyword in `name`"""
+        best_rank = None
+        for match in self._pattern.finditer(' '.join(name.lower().split())):
+            rank = self._rank[match.group(1)]
+            if rank == 0:
+                return self.categories[0]  # Can't do better than the top category
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+        return self.default if best_rank is None else self.categories[best_rank]
+
+    def categorize_many(self, names):
+        return [self.categorize(name) for name in names]
+
+
+product_categorizer = KeywordCategorizer(PRODUCT_CATEGORIES, default='general')
+valuation_method_categorizer = KeywordCategorizer(VALUATION_METHODS)
@@ -0,0 +1,66 @@
+from math_based_approach.math_valuation import AssetValuation
+
+
+def asset_value_at(method, years, initial_cost, salvage_value=0.0, useful_life=0, factor=2, appreciation_rate=0.0):
+    """Point value of an asset after `years` (fractional years allowed)"""
+    if method == 'straight-line':
+        return AssetValuation.straight_line_depreciation(initial_cost, salvage_value, useful_life, years)
+    if method == 'declining':
+        return AssetValuation.declining_balance_depreciation(initial_cost, salvage_value, useful_life, years, factor)
+    if method == 'appreciation':
+        return AssetValuation.appreciation(initial_cost, appreciation_rate, years)
+    raise ValueError(f"Unknown valuation method: {method}")
+
+
+class ScheduleState:
+    """
+    Where one asset's depreciation schedule currently stands.
+
+    Holds the asset parameters plus the last closed period and its value, so
+    month-end close can call roll_forward() once instead of recomputing the
+    schedule from year 0. Round-trips through to_dict()/from_dict() for storage.
+    """
+
+    def __init__(self, method, initial_cost, salvage_value=0.0, useful_life=0, factor=2,
+                 appreciation_rate=0.0, periods_per_year=1, period=0, value=None):
+        self.method = method
+        self.initial_cost = initial_cost
+        self.salvage_value = salvage_value
+        self.useful_life = useful_life
+        self.factor = factor
+        self.appreciation_rate = appreciation_rate
+        self.periods_per_year = periods_per_year
+        self.period = period
+        self.value = self.value_at_period(period) if value is None else value
+
+    def value_at_period(self, period):
+        return asset_value_at(
+            self.method, period / self.periods_per_year, self.initial_cost, self.salvage_value,
+            self.useful_life, self.factor, self.appreciation_rate
+        )
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def roll_forward(state):
+    """
+    Advance a schedule state by one period in O(1) and return that period's row:
+    (period, opening_value, depreciation, closing_value).
+    Appreciating assets show negative depreciation.
+    """
+    opening_value = state.value
+    closing_value = state.value_at_period(state.period + 1)
+    state.period += 1
+    state.value = closing_value
+    return state.period, opening_value, round(opening_value - closing_value, 2), closing_value
+
+
+def depreciation_schedule(state, periods):
+    """Yield the next `periods` rows of the schedule, rolling `state` forward as it goes"""
+    for _ in range(periods):
+        yield roll_forward(state)
@@ -0,0 +1,238 @@
+"""
+Registry of named additional factors.
+
+additional_factors used to be walked as a free-form dict on every valuation,
+with the same few names (brand_reputation, special_features,
+certification_bonus, ...) repeated as strings on every row. The registry
+interns each name to a column index and checks multipliers against that
+factor's bounds once, when an item is built. It then collapses the item's
+factors into one precomputed multiplier. Batch paths get the same as a
+factor matrix (one column per registered factor, NaN = factor not set) and a
+vectorised product over it. Category defaults (e.g. brand_reputation 1.05 on
+every electronics item) are resolved to a multiplier once per category;
+an item's own factor overrides the default of the same name.
+
+Factors are always multiplied in registry (column) order starting from 1.0,
+so an item's multiplier is bit-for-bit the same on the scalar and batch paths.
+NaN means "not set" on both: a NaN entry in an additional_factors dict is
+dropped like a NaN cell in a matrix. Only Factor.check, which validates one
+multiplier that must be there, rejects it.
+
+Unknown names are registered on first use with default bounds, up to
+`max_factors` of them, so ad-hoc factors work in scripts but names coming
+from outside (HTTP requests, input columns) can't grow every factor matrix
+without bound. Those callers should check names against `factors` first or
+use a strict registry.
+"""
+import math
+import numbers
+import sys
+import threading
+
+
+class FactorError(ValueError):
+    """A multiplier is not a finite number, is out of its factor's bounds, or names an unknown factor"""
+
+
+class Factor:
+    __slots__ = ("name", "index", "minimum", "maximum")
+
+    def __init__(self, name, index, minimum=0.0, maximum=math.inf):
+        self.name = name
+        self.index = index
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def check(self, multiplier):
+        try:
+            value = float(multiplier)
+        except (TypeError, ValueError):
+            raise FactorError(f"factor '{self.name}' is not a number: {multiplier!r}")
+        if not (math.isfinite(value) and self.minimum <= value <= self.maximum):
+            raise FactorError(f"factor '{self.name}' = {value} is outside [{self.minimum}, {self.maximum}]")
+        return value
+
+    def __repr__(self):
+        return f"Factor({self.name!r}, {self.index}, {self.minimum}, {self.maximum})"
+
+
+def _product(values):
+    multiplier = 1.0
+    for value in values:
+        multiplier *= value
+    return multiplier
+
+
+def _sparse_product(factors):
+    """Row products of the stored entries of a scipy.sparse matrix (implicit zeros = no factor)"""
+    import numpy as np
+
+    csr = factors.tocsr()
+    if not csr.has_sorted_indices:
+        csr = csr.sorted_indices()
+    multipliers = np.ones(csr.shape[0])
+    counts = np.diff(csr.indptr)
+    # One pass per factor slot (a row rarely has more than a handful), in column order
+    for slot in range(counts.max(initial=0)):
+        rows = np.flatnonzero(counts > slot)
+        multipliers[rows] = multipliers[rows] * csr.data[csr.indptr[rows] + slot]
+    return multipliers
+
+
+class FactorRegistry:
+    def __init__(self, strict=False, max_factors=64):
+        # strict: unknown names raise FactorError instead of being registered with default bounds
+        # max_factors: cap on the factors registered that way; register() isn't capped
+        self.strict = strict
+        self.max_factors = max_factors
+        self.factors = {}  # name -> Factor
+        self.names = []  # column index -> name
+        self._defaults = {}  # category -> (checked factors, multiplier)
+        self._lock = threading.Lock()
+
+    def register(self, name, minimum=0.0, maximum=math.inf):
+        """Add a factor, or change an existing one's bounds (it keeps its column)"""
+        with self._lock:
+            existing = self.factors.get(name)
+            index = len(self.names) if existing is None else existing.index
+            factor = Factor(sys.intern(name), index, float(minimum), float(maximum))
+            if existing is None:
+                self.names.append(factor.name)
+            self.factors[factor.name] = factor
+            return factor
+
+    def get(self, name):
+        factor = self.factors.get(name)
+        if factor is not None:
+            return factor
+        if self.strict:
+            raise FactorError(f"unknown factor '{name}'")
+        with self._lock:
+            factor = self.factors.get(name)
+            if factor is None:
+                if len(self.names) >= self.max_factors:
+                    raise FactorError(f"unknown factor '{name}' and the registry already has {len(self.names)} "
+                                      f"factors; register() it explicitly")
+                factor = Factor(sys.intern(name), len(self.names))
+                self.factors[factor.name] = factor
+                self.names.append(factor.name)
+            return factor
+
+    def index(self, name):
+        return self.get(name).index
+
+    def check(self, factors):
+        """Validated {name: float} for an additional_factors dict, in column order; NaN entries are unset (None -> {})"""
+        if not factors:
+            return {}
+        checked = sorted(((self.get(name), multiplier) for name, multiplier in factors.items()
+                          if not (isinstance(multiplier, numbers.Real) and math.isnan(multiplier))),
+                         key=lambda item: item[0].index)
+        return {factor.name: factor.check(multiplier) for factor, multiplier in checked}
+
+    def set_category_defaults(self, category, factors):
+        """Factors every item of `category` gets unless it sets them itself"""
+        checked = self.check(factors)
+        self._defaults[category] = (checked, _product(checked.values()))
+
+    def category_defaults(self, category):
+        return dict(self._defaults.get(category, ({}, 1.0))[0])
+
+    def multiplier(self, factors=None, category=None):
+        """One item's combined multiplier: its factors over its category's defaults"""
+        defaults, default_multiplier = self._defaults.get(category, ({}, 1.0))
+        if not factors:
+            return default_multiplier  # Resolved when the defaults were set
+        checked = self.check(factors)
+        if defaults:
+            checked = self.check({**defaults, **checked})
+        return _product(checked.values())
+
+    def factor_matrix(self, rows):
+        """(len(rows) x registered factors) matrix from a sequence of additional_factors dicts, NaN where unset"""
+        import numpy as np
+
+        checked = [self.check(factors) for factors in rows]  # Registers new names before the width is known
+        row_index, columns, values = [], [], []
+        for i, factors in enumerate(checked):
+            for name, value in factors.items():
+                row_index.append(i)
+                columns.append(self.factors[name].index)
+                values.append(value)
+        matrix = np.full((len(checked), len(self.names)), np.nan)
+        matrix[row_index, columns] = values
+        return matrix
+
+    def table_matrix(self, table, columns):
+        """Factor matrix from named columns of a DataFrame / dict of arrays (None without columns), NaN = unset"""
+        import numpy as np
+
+        # Registers unknown names before the width is known
+        factors = [self.check_column(name, table[name]) for name in columns]
+        matrix = None
+        for factor, name in zip(factors, columns):
+            if matrix is None:
+                matrix = np.full((len(table[name]), len(self.names)), np.nan)
+            matrix[:, factor.index] = table[name]
+        return matrix
+
+    def check_column(self, name, values):
+        """Bounds check for a whole array of one factor's multipliers (NaN = unset); returns the Factor"""
+        import numpy as np
+
+        factor = self.get(name)
+        values = np.asarray(values, dtype=float)
+        bad = ~np.isnan(values) & ~(np.isfinite(values) & (values >= factor.minimum) & (values <= factor.maximum))
+        if bad.any():
+            factor.check(values[bad][0])  # Raises with the usual message
+        return factor
+
+    def multipliers(self, factors=None, categories=None, size=None):
+        """
+        Vectorised multiplier(): one per row of a factor matrix (dense with NaN
+        for unset, or scipy.sparse), with category defaults filled in from
+        `categories` (one per row). `size` is the row count when there is no matrix.
+        """
+        import numpy as np
+
+        has_defaults = categories is not None and any(category in self._defaults for category in set(categories))
+        if factors is None:
+            size = len(categories) if size is None else size
+            if not has_defaults:
+                return np.ones(size)
+            matrix = np.full((size, len(self.names)), np.nan)
+        elif hasattr(factors, "tocsr"):
+            if not has_defaults:
+                return _sparse_product(factors)
+            coo = factors.tocoo()
+            matrix = np.full(coo.shape, np.nan)
+            matrix[coo.row, coo.col] = coo.data
+        else:
+            matrix = np.asarray(factors, dtype=float)
+            rows = len(matrix) if size is None else size
+            if rows == 0:
+                return np.ones(0)  # reshape(0, -1) can't infer a width
+            matrix = matrix.reshape(rows, -1)
+
+        if has_defaults:
+            if matrix.shape[1] < len(self.names):
+                matrix = np.hstack([matrix, np.full((len(matrix), len(self.names) - matrix.shape[1]), np.nan)])
+            # One defaults row per distinct category, then gathered per row
+            codes = {}
+            inverse = np.array([codes.setdefault(category, len(codes)) for category in categories], dtype=np.intp)
+            table = np.full((len(codes), matrix.shape[1]), np.nan)
+            for category, code in codes.items():
+                for name, value in self._defaults.get(category, ({}, 1.0))[0].items():
+                    table[code, self.factors[name].index] = value
+            matrix = np.where(np.isnan(matrix), table[inverse], matrix)
+
+        multipliers = np.ones(len(matrix))
+        for column in matrix.T:
+            multipliers = multipliers * np.where(np.isnan(column), 1.0, column)
+        return multipliers
+
+
+# Shared by the valuation classes; the factors used in the examples come with sane bounds
+factor_registry = FactorRegistry()
+for _name in ("brand_reputation", "special_features", "certification_bonus", "specialization", "customer_ratings"):
+    factor_registry.register(_name, 0.5, 2.0)
@@ -0,0 +1,39 @@
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Read timeouts per API host (seconds); anything else falls back to DEFAULT_TIMEOUT
+DEFAULT_TIMEOUTS = {
+    'api.ebay.com': 10,
+    'www.statbureau.org': 5,
+    'payload.vextapp.com': 60,  # LLM flow: answers take seconds
+}
+DEFAULT_TIMEOUT = 10
+CONNECT_TIMEOUT = 3.05
+
+
+def build_session(pool_size=10, retries=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)):
+    """
+    Keep-alive requests.Session with a bounded connection pool per host and
+    exponential-backoff retries on connection errors and throttling/5xx answers.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset({'GET', 'POST'}),
+        raise_on_status=False,  # Hand the last response back so raise_for_status() reports it
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def timeout_for(url, timeouts=None, default=DEFAULT_TIMEOUT):
+    """(connect, read) timeout tuple for the host of `url`"""
+    host = urlsplit(url).hostname
+    return CONNECT_TIMEOUT, (timeouts or DEFAULT_TIMEOUTS).get(host, default)
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_PATH = 'inflation_index.json'
+YEAR_KEYS = ('Year', 'year', 'Date', 'date')
+RATE_KEYS = ('InflationRate', 'inflation_rate', 'Value', 'value', 'rate')
+
+
+def _first(entry, keys):
+    for key in keys:
+        if entry.get(key) is not None:
+            return entry[key]
+    return None
+
+
+def parse_series(series, start_year, end_year):
+    """
+    {year: rate in %} from a fetched series. Entries that report their year
+    ({"Year": 2020, "InflationRate": 1.2}, or a "Date" starting with the year)
+    are keyed by it; a bare list of numbers is only trusted when it has exactly
+    one value per requested year. Entries without a usable rate are dropped,
+    but a year missing between the first and last one raises LookupError.
+    """
+    rates = {}
+    if all(isinstance(entry, dict) for entry in series):
+        for entry in series:
+            year, rate = _first(entry, YEAR_KEYS), _first(entry, RATE_KEYS)
+            try:
+                year = int(str(year)[:4])
+            except ValueError:
+                raise LookupError(f"Inflation entry without a year: {entry!r}")
+            if year in rates:
+                raise LookupError(f"Inflation series reports {year} twice")
+            rates[year] = rate
+    elif len(series) == end_year - start_year + 1:
+        rates = dict(zip(range(start_year, end_year + 1), series))
+    else:
+        raise LookupError(f"Got {len(series)} bare inflation values for {end_year - start_year + 1} years "
+                          f"({start_year}-{end_year}); can't tell which year each one is")
+
+    valid = {}
+    for year, rate in rates.items():
+        try:
+            valid[year] = float(rate)
+        except (ValueError, TypeError):
+            continue  # Not published (yet); only a problem if it leaves a gap
+    missing = sorted(set(range(min(valid), max(valid) + 1)) - set(valid)) if valid else []
+    if missing:
+        raise LookupError(f"Inflation series has no rate for {', '.join(map(str, missing))}")
+    return valid
+
+
+class InflationIndex:
+    """
+    Local table of yearly inflation rates with precomputed cumulative factors.
+
+    The full series for a country is fetched once through `fetch_series(country,
+    start_year, end_year)` (a list of yearly percentages), persisted to `path`,
+    and refetched only when older than `max_age` seconds. For every start year
+    the compounded factor up to the latest year is precomputed, so an
+    adjustment is a dict lookup. With `offline=True` only the persisted table
+    is used. `path` defaults to $LENDEN_INFLATION_INDEX, else
+    inflation_index.json in the working directory; '' keeps it in memory only.
+    """
+
+    def __init__(self, path=None, fetch_series=None, first_year=1990,
+                 max_age=30 * 86400, offline=False, clock=time.time):
+        self.path = path if path is not None else os.environ.get('LENDEN_INFLATION_INDEX', DEFAULT_PATH)
+        self.fetch_series = fetch_series
+        self.first_year = first_year
+        self.max_age = max_age
+        self.offline = offline or fetch_series is None
+        self.clock = clock
+        self._rates = {}       # country -> {year: rate in %}
+        self._fetched_at = {}  # country -> unix time
+        self._factors = {}     # country -> {start_year: cumulative factor up to latest year}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            stored = json.load(f)
+        for country, entry in stored.items():
+            self._rates[country] = {int(year): rate for year, rate in entry['rates'].items()}
+            self._fetched_at[country] = entry['fetched_at']
+            self._build_factors(country)
+
+    def _save(self):
+        if not self.path:
+            return
+        stored = {
+            country: {'fetched_at': self._fetched_at[country], 'rates': rates}
+            for country, rates in self._rates.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(stored, f)
+        os.replace(tmp_path, self.path)  # Readers never see a half-written table
+
+    def _build_factors(self, country):
+        rates = self._rates[country]
+        factors = {}
+        cumulative_factor = 1.0
+        # Walk backwards so factors[y] covers y..latest, the same years the per-call API request used
+        for year in range(max(rates), min(rates) - 1, -1):
+            if year in rates:
+                cumulative_factor *= (1 + rates[year] / 100)
+            factors[year] = cumulative_factor
+        self._factors[country] = factors
+
+    def refresh(self, country='united-states'):
+        """Refetch the whole series for `country` and persist it"""
+        end_year = datetime.now().year
+        rates = parse_series(self.fetch_series(country, self.first_year, end_year), self.first_year, end_year)
+        if not rates:
+            raise LookupError(f"No valid inflation data available for {country}")
+        self._rates[country] = rates
+        self._fetched_at[country] = self.clock()
+        self._build_factors(country)
+        self._save()
+
+    def is_current(self, country='united-states'):
+        """True when a lookup for `country` will not need a network fetch"""
+        fetched_at = self._fetched_at.get(country)
+        return self.offline or (fetched_at is not None and self.clock() - fetched_at < self.max_age)
+
+    def _ensure(self, country):
+        if self.is_current(country):
+            return
+        with self._lock:
+            fetched_at = self._fetched_at.get(country)
+            if fetched_at is not None and self.clock() - fetched_at < self.max_age:
+                return  # Another thread refreshed it while we waited
+            try:
+                self.refresh(country)
+            except Exception:
+                if country not in self._factors:
+                    raise
+                print(f"Inflation refresh failed, using table from {datetime.fromtimestamp(fetched_at):%Y-%m-%d}")
+                # Don't hammer a failing API on every lookup: try again in an hour
+                self._fetched_at[country] = self.clock() - self.max_age + 3600
+
+    def cumulative_factor(self, start_year, country='united-states'):
+        """Compounded inflation from `start_year` through the latest year in the table"""
+        self._ensure(country)
+        factors = self._factors.get(country)
+        if not factors:
+            raise LookupError(f"No inflation table for {country}" + (" (offline)" if self.offline else ""))
+        if start_year in factors:
+            return factors[start_year]
+        return factors[min(factors)] if start_year < min(factors) else 1.0
+
+    def adjust(self, value, years_used, country='united-states'):
+        """Inflation-adjust `value` over the last `years_used` years"""
+        start_year = datetime.now().year - int(years_used)
+        return round(value * self.cumulative_factor(start_year, country), 2)
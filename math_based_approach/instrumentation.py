@@ -0,0 +1,285 @@
+"""
+Per-stage timing for the valuation hot paths.
+
+Stages (oauth, ebay_search, market_price, inflation, model_load, predict, ...)
+are wrapped with @timed("stage") or `with stage("stage"):`. While disabled
+(the default) a timed method is the plain function and a stage() block costs
+one flag check. Once enabled, every stage records a latency histogram, a call
+count and error counts by exception type; caches report hits/misses through
+count_cache(). The numbers come out as Prometheus text (render_prometheus /
+start_http_server) and, with enable(otel=True), each stage is also an
+OpenTelemetry span.
+
+Set LENDEN_METRICS=1 (or =otel) to enable at import time.
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = False
+_tracer = None
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bucket bound holding the q-th observation (None when empty)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}
+        self.errors = Counter()  # (stage, exception type) -> count
+        self.cache = Counter()  # (cache name, "hit"/"miss") -> count
+        self._lock = threading.Lock()
+
+    def observe(self, stage_name, seconds, error=None):
+        with self._lock:
+            histogram = self.histograms.get(stage_name)
+            if histogram is None:
+                histogram = self.histograms[stage_name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if error is not None:
+                self.errors[stage_name, type(error).__name__] += 1
+
+    def count_error(self, stage_name, error):
+        with self._lock:
+            self.errors[stage_name, type(error).__name__] += 1
+
+    def count_cache(self, name, hit):
+        with self._lock:
+            self.cache[name, "hit" if hit else "miss"] += 1
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.errors.clear()
+            self.cache.clear()
+
+    def snapshot(self):
+        """Plain-dict summary: per-stage count/sum/p50/p99, errors and cache hit rates"""
+        with self._lock:
+            stages = {
+                name: {"count": h.count, "sum": h.sum, "p50": h.quantile(0.5), "p99": h.quantile(0.99)}
+                for name, h in self.histograms.items()
+            }
+            errors = {f"{stage_name}:{error}": count for (stage_name, error), count in self.errors.items()}
+            caches = {}
+            for (name, result), count in self.cache.items():
+                caches.setdefault(name, {"hit": 0, "miss": 0})[result] = count
+        for counts in caches.values():
+            total = counts["hit"] + counts["miss"]
+            counts["hit_rate"] = counts["hit"] / total if total else None
+        return {"stages": stages, "errors": errors, "caches": caches}
+
+    def render_prometheus(self, prefix="lenden"):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {prefix}_stage_seconds Latency of each valuation stage")
+            lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets + (float("inf"),), h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {h.sum!r}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {h.count}')
+
+            lines.append(f"# HELP {prefix}_stage_errors_total Exceptions raised out of each stage")
+            lines.append(f"# TYPE {prefix}_stage_errors_total counter")
+            for (name, error), count in sorted(self.errors.items()):
+                lines.append(f'{prefix}_stage_errors_total{{stage="{name}",error="{error}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_cache_requests_total Cache lookups by result")
+            lines.append(f"# TYPE {prefix}_cache_requests_total counter")
+            for (name, result), count in sorted(self.cache.items()):
+                lines.append(f'{prefix}_cache_requests_total{{cache="{name}",result="{result}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+class _NoopStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._span = _tracer.start_as_current_span(self.name) if _tracer is not None else None
+        if self._span is not None:
+            self._span.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics.observe(self.name, time.perf_counter() - self._start, exc)
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc, tb)  # Records the exception on the span
+        return False
+
+
+def stage(name):
+    """Context manager timing one stage; a shared no-op while instrumentation is off"""
+    return _Stage(name) if _enabled else _NOOP
+
+
+def _timing_wrapper(stage_name, fn):
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if not _enabled:
+                return await fn(*args, **kwargs)
+            with _Stage(stage_name):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        with _Stage(stage_name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+_timed_methods = []  # (class, attribute, plain function, timing wrapper)
+
+
+class timed:
+    """
+    Decorator form of stage(). On a method it costs nothing while disabled:
+    the class keeps the plain function, and enable()/disable() swap the timing
+    wrapper in and out. Plain functions get a wrapper that checks the flag.
+    Coroutine functions are timed until they return, awaits included.
+    """
+
+    def __init__(self, stage_name):
+        self.stage_name = stage_name
+
+    def __call__(self, fn):
+        # "Class.method" (not "func.<locals>.inner") means we're in a class body and will get __set_name__
+        owner = fn.__qualname__.rpartition(".")[0]
+        if owner and not owner.endswith("<locals>"):
+            return _TimedMethod(self.stage_name, fn)
+        return _timing_wrapper(self.stage_name, fn)
+
+
+class _TimedMethod:
+    # Placeholder that only lives until the class is created; __set_name__ swaps in the real function
+    def __init__(self, stage_name, fn):
+        self.fn = fn
+        self.wrapper = _timing_wrapper(stage_name, fn)
+
+    def __set_name__(self, owner, name):
+        _timed_methods.append((owner, name, self.fn, self.wrapper))
+        setattr(owner, name, self.wrapper if _enabled else self.fn)
+
+
+def count_error(stage_name, error):
+    """For errors a stage catches itself (and so never sees leave the with-block)"""
+    if _enabled:
+        metrics.count_error(stage_name, error)
+
+
+def count_cache(name, hit):
+    if _enabled:
+        metrics.count_cache(name, hit)
+
+
+def enable(otel=False):
+    """Start recording; otel=True also opens an OpenTelemetry span per stage (needs opentelemetry-api)"""
+    global _enabled, _tracer
+    if otel:
+        from opentelemetry import trace
+        _tracer = trace.get_tracer("lenden")
+    _enabled = True
+    for owner, name, _, wrapper in _timed_methods:
+        setattr(owner, name, wrapper)
+
+
+def disable():
+    global _enabled, _tracer
+    _enabled = False
+    _tracer = None
+    for owner, name, fn, _ in _timed_methods:
+        setattr(owner, name, fn)
+
+
+def is_enabled():
+    return _enabled
+
+
+def snapshot():
+    return metrics.snapshot()
+
+
+def render_prometheus():
+    return metrics.render_prometheus()
+
+
+def start_http_server(port=9464, addr="127.0.0.1"):
+    """Serve render_prometheus() at /metrics from a daemon thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+if os.environ.get("LENDEN_METRICS"):
+    enable(otel=os.environ["LENDEN_METRICS"].lower() == "otel")
@@ -1,9 +1,22 @@
 import requests
 import os
+import sys
 from datetime import datetime
 
+from math_based_approach import instrumentation
+from math_based_approach.bulk import (
+    RecordError, build_parser, optional_number, require_number, require_text, run_cli
+)
+from math_based_approach.categorizer import product_categorizer
+from math_based_approach.http_transport import DEFAULT_TIMEOUTS, build_session, timeout_for
+from math_based_approach.inflation_index import InflationIndex
+from math_based_approach.instrumentation import timed
+from math_based_approach.oauth_token import OAuthTokenManager
+from math_based_approach.price_cache import MISSING, TTLCache, make_price_key
+
 class AssetValuationUsingAPIs:
-    def __init__(self):
+    def __init__(self, price_cache=None, session=None, pool_size=10, timeouts=None, max_auth_retries=1,
+                 inflation_index=None, categorizer=None, inflation_index_path=None):
         # Enhanced category configuration
         self.category_db = {
             'electronics': {
@@ -35,6 +48,9 @@ class AssetValuationUsingAPIs:
             }
         }
         
+        # Keyword taxonomy compiled once (see categorizer.py); pass your own KeywordCategorizer to extend it
+        self.categorizer = categorizer if categorizer is not None else product_categorizer
+
         # API configuration
         self.ebay_api_endpoint = "https://api.ebay.com/buy/browse/v1/item_summary/search"
         self.oauth_endpoint = "https://api.ebay.com/identity/v1/oauth2/token"
@@ -43,113 +59,165 @@ class AssetValuationUsingAPIs:
         # Security configuration
         self.client_id = os.getenv('EBAY_CLIENT_ID')
         self.client_secret = os.getenv('EBAY_CLIENT_SECRET')
-        self.oauth_token = None
+        self.token_manager = OAuthTokenManager(self._request_oauth_token)
+        self.max_auth_retries = max_auth_retries  # Fresh tokens tried after a 401 before giving up
         self.marketplace_id = 'EBAY-US'  # Configurable marketplace
 
+        # Pooled keep-alive transport shared by every outbound call (any requests.Session-like object)
+        self.session = session if session is not None else build_session(pool_size=pool_size)
+        self._owns_session = session is None
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+
+        # Market price cache (TTLCache in memory by default, SQLiteCache to persist)
+        self.price_cache = price_cache if price_cache is not None else TTLCache()
+
+        # Persisted inflation table, fetched once instead of per valuation (path: see InflationIndex)
+        self.inflation_index = (
+            inflation_index if inflation_index is not None
+            else InflationIndex(inflation_index_path, fetch_series=self._fetch_inflation_series)
+        )
+
+    def close(self):
+        """Stop the token refresh timer and close the HTTP session (unless it was passed in)"""
+        self.token_manager.close()
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def categorize_product(self, product_name):
         """Enhanced product categorization with fallback logic"""
         try:
-            category_map = {
-                'electronics': ['phone', 'laptop', 'tablet', 'camera'],
-                'vehicles': ['car', 'bike', 'motorcycle', 'scooter'],
-                'real_estate': ['house', 'apartment', 'land', 'property'],
-                'collectibles': ['art', 'antique', 'coin', 'stamp'],
-                'furniture': ['chair', 'table', 'sofa', 'cabinet']
-            }
-            
-            product_lower = product_name.lower()
-            for category, keywords in category_map.items():
-                if any(kw in product_lower for kw in keywords):
-                    return category
-            return 'general'
+            return self.categorizer.categorize(product_name)
         except Exception as e:
             print(f"Categorization error: {str(e)}")
             return 'general'
 
-    def _get_oauth_token(self):
-        """Secure OAuth2 token retrieval with error handling"""
+    @property
+    def oauth_token(self):
+        return self.token_manager.token
+
+    def _request_oauth_token(self):
+        """Client-credentials grant -> (access_token, expires_in)"""
+        auth = requests.auth.HTTPBasicAuth(self.client_id, self.client_secret)
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        data = {
+            'grant_type': 'client_credentials',
+            'scope': 'https://api.ebay.com/oauth/api_scope'
+        }
+
+        response = self.session.post(
+            self.oauth_endpoint,
+            auth=auth,
+            headers=headers,
+            data=data,
+            timeout=timeout_for(self.oauth_endpoint, self.timeouts)
+        )
+        response.raise_for_status()
+        payload = response.json()
+        return payload['access_token'], float(payload.get('expires_in', 7200))
+
+    @timed('oauth')
+    def _get_oauth_token(self, stale_token=None):
+        """Secure OAuth2 token retrieval with error handling (single-flight via the token manager)"""
         try:
-            auth = requests.auth.HTTPBasicAuth(self.client_id, self.client_secret)
-            headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-            data = {
-                'grant_type': 'client_credentials',
-                'scope': 'https://api.ebay.com/oauth/api_scope'
-            }
-            
-            response = requests.post(
-                self.oauth_endpoint,
-                auth=auth,
-                headers=headers,
-                data=data
-            )
-            response.raise_for_status()
-            self.oauth_token = response.json()['access_token']
-            return True
+            if stale_token is None:
+                return self.token_manager.get_token()
+            return self.token_manager.refresh(stale_token=stale_token)
         except Exception as e:
+            instrumentation.count_error('oauth', e)
             print(f"Authentication failed: {str(e)}")
-            return False
+            return None
 
+    @timed('market_price')
     def get_market_price(self, product_name, category):
-        """Enhanced eBay price fetching with category-specific search"""
-        try:
-            if not self.oauth_token and not self._get_oauth_token():
-                return None
+        """Enhanced eBay price fetching with category-specific search, served from cache when possible"""
+        cache_key = make_price_key(product_name, category)
+        cached_price = self.price_cache.get(cache_key)
+        instrumentation.count_cache('price', cached_price is not MISSING)
+        if cached_price is not MISSING:
+            return cached_price
 
-            headers = {
-                'Authorization': f'Bearer {self.oauth_token}',
-                'X-EBAY-C-MARKETPLACE-ID': self.marketplace_id
-            }
+        token = self._get_oauth_token()
+        for attempt in range(self.max_auth_retries + 1):
+            if token is None:
+                return None
+            try:
+                price = self._search_market_price(product_name, category, token)
+                break
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 401 and attempt < self.max_auth_retries:
+                    token = self._get_oauth_token(stale_token=token)
+                    continue
+                print(f"API Error: {e.response.text}")
+                return None
+            except Exception as e:
+                print(f"Price check failed: {str(e)}")
+                return None
 
-            params = {
-                'q': product_name,
-                'filter': 'conditions:USED',
-                'limit': '10',  # Get more samples for better accuracy
-                'sort': 'price',
-                'category_ids': self.category_db.get(category, {}).get('ebay_category', '')
-            }
+        # Only definitive answers get here, so transient failures are never cached
+        self.price_cache.set(cache_key, price)
+        return price
 
-            response = requests.get(
-                self.ebay_api_endpoint,
-                headers=headers,
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            items = response.json().get('itemSummaries', [])
-            if not items:
-                return None
+    @timed('ebay_search')
+    def _search_market_price(self, product_name, category, token):
+        """Single eBay Browse search -> trimmed mean of used prices, or None if there are too few"""
+        headers, params = self._market_price_request(product_name, category, token)
+        response = self.session.get(
+            self.ebay_api_endpoint,
+            headers=headers,
+            params=params,
+            timeout=timeout_for(self.ebay_api_endpoint, self.timeouts)
+        )
+        response.raise_for_status()
+        return self._price_from_listings(response.json().get('itemSummaries', []))
 
-            # Advanced price analysis
-            prices = []
-            for item in items:
-                if item.get('price') and item.get('condition') == 'USED':
-                    try:
-                        price = float(item['price']['value'])
-                        if price > 0:  # Filter invalid prices
-                            prices.append(price)
-                    except (ValueError, KeyError):
-                        continue
-            
-            if len(prices) < 3:  # Require minimum 3 valid prices
-                return None
+    def _market_price_request(self, product_name, category, token):
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'X-EBAY-C-MARKETPLACE-ID': self.marketplace_id
+        }
 
-            # Calculate trimmed mean (ignore extremes)
-            prices.sort()
-            trimmed = prices[1:-1]
-            return round(sum(trimmed) / len(trimmed), 2)
+        params = {
+            'q': product_name,
+            'filter': 'conditions:USED',
+            'limit': '10',  # Get more samples for better accuracy
+            'sort': 'price',
+            'category_ids': self.category_db.get(category, {}).get('ebay_category', '')
+        }
+        return headers, params
 
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                self.oauth_token = None
-                return self.get_market_price(product_name, category)
-            print(f"API Error: {e.response.text}")
+    @staticmethod
+    def _price_from_listings(items):
+        """Trimmed mean of the valid used-item prices, None when there are fewer than 3"""
+        if not items:
             return None
-        except Exception as e:
-            print(f"Price check failed: {str(e)}")
+
+        # Advanced price analysis
+        prices = []
+        for item in items:
+            if item.get('price') and item.get('condition') == 'USED':
+                try:
+                    price = float(item['price']['value'])
+                    if price > 0:  # Filter invalid prices
+                        prices.append(price)
+                except (ValueError, KeyError):
+                    continue
+
+        if len(prices) < 3:  # Require minimum 3 valid prices
             return None
 
-    def calculate_valuation(self, product_name, years_used):
+        # Calculate trimmed mean (ignore extremes)
+        prices.sort()
+        trimmed = prices[1:-1]
+        return round(sum(trimmed) / len(trimmed), 2)
+
+    @timed('valuation')
+    def calculate_valuation(self, product_name, years_used, initial_price=None):
         """Hybrid valuation system with fallback logic"""
         try:
             category = self.categorize_product(product_name)
@@ -158,12 +226,36 @@ class AssetValuationUsingAPIs:
             if market_price:
                 return self._apply_condition_adjustment(market_price, years_used, category)
             
-            return self._calculate_theoretical_value(category, years_used)
+            return self._calculate_theoretical_value(category, years_used, initial_price)
             
         except Exception as e:
+            instrumentation.count_error('valuation', e)
             print(f"Valuation error: {str(e)}")
             return None
 
+    def value_record(self, record, adjust_inflation=False):
+        """
+        calculate_valuation for one bulk input row, without prompting.
+        Fields: product_name, years_used, and initial_price (needed only
+        when eBay has no usable market price).
+        """
+        product_name = require_text(record, 'product_name')
+        years_used = require_number(record, 'years_used')
+        initial_price = optional_number(record, 'initial_price')
+
+        category = self.categorize_product(product_name)
+        market_price = self.get_market_price(product_name, category)
+        if market_price:
+            value = self._apply_condition_adjustment(market_price, years_used, category)
+        elif initial_price is None:
+            raise RecordError("no market price found and no 'initial_price' given")
+        else:
+            value = self._calculate_theoretical_value(category, years_used, initial_price)
+
+        if adjust_inflation:
+            value = self.get_inflation_adjusted(value, years_used)
+        return round(value, 2)
+
     def _apply_condition_adjustment(self, base_price, years_used, category):
         """Apply condition-based adjustment to market price"""
         adjustment_factors = {
@@ -175,10 +267,11 @@ class AssetValuationUsingAPIs:
         factor = adjustment_factors.get(category, 0.9 ** years_used)
         return max(base_price * factor, base_price * 0.2)  # Never drop below 20% of market
 
-    def _calculate_theoretical_value(self, category, years_used):
+    def _calculate_theoretical_value(self, category, years_used, initial_price=None):
         """Calculate value using depreciation/appreciation models"""
         category_data = self.category_db.get(category, {})
-        initial_price = self._get_validated_input("Enter original purchase price: ", float)
+        if initial_price is None:
+            initial_price = self._get_validated_input("Enter original purchase price: ", float)
         
         if category_data.get('method') == 'appreciation':
             rate = category_data.get('appreciation_rate', 0.05)
@@ -196,50 +289,43 @@ class AssetValuationUsingAPIs:
                 return max(current_value, salvage)
 
 
+    @timed('inflation')
     def get_inflation_adjusted(self, value, years_used):
-        """Accurate inflation adjustment using StatBureau API"""
+        """Accurate inflation adjustment using the StatBureau series (cached in the inflation index)"""
         try:
-            current_year = datetime.now().year
-            params = {
-                'country': 'united-states',
-                'start': current_year - years_used,
-                'end': current_year,
-                'format': 'true',
-                'interval': 'year'
-            }
-            
-            response = requests.get(
-                self.inflation_api,
-                params=params,
-                timeout=5
-            )
-            response.raise_for_status()
-            
-            inflation_data = response.json()
-            
-            if not isinstance(inflation_data, list) or len(inflation_data) == 0:
-                print("No valid inflation data available")
-                return value
-                
-            cumulative_factor = 1.0
-            for rate in inflation_data:
-                try:
-                    # Convert percentage to decimal and calculate cumulative effect
-                    cumulative_factor *= (1 + float(rate)/100
-                except (ValueError, TypeError):
-                    continue  # Skip invalid entries
-                    
-            return round(value * cumulative_factor, 2)
+            return self.inflation_index.adjust(value, years_used)
             
         except requests.exceptions.HTTPError as e:
             print(f"Inflation API Error: {e.response.status_code} - {e.response.text}")
         except requests.exceptions.RequestException as e:
             print(f"Inflation API connection failed: {str(e)}")
         except Exception as e:
+            instrumentation.count_error('inflation', e)
             print(f"Inflation calculation error: {str(e)}")
             
         return value  # Fallback to original value
 
+    @timed('inflation_fetch')
+    def _fetch_inflation_series(self, country, start_year, end_year):
+        """Yearly inflation percentages for start_year..end_year from StatBureau"""
+        params = {
+            'country': country,
+            'start': start_year,
+            'end': end_year,
+            'format': 'true',
+            'interval': 'year'
+        }
+        response = self.session.get(
+            self.inflation_api,
+            params=params,
+            timeout=timeout_for(self.inflation_api, self.timeouts)
+        )
+        response.raise_for_status()
+        inflation_data = response.json()
+        if not isinstance(inflation_data, list) or len(inflation_data) == 0:
+            raise LookupError("No valid inflation data available")
+        return inflation_data
+
 
     def _get_validated_input(self, prompt, data_type):
         """Universal input validation with retry logic"""
@@ -253,8 +339,13 @@ class AssetValuationUsingAPIs:
                 print(f"Invalid input. Please enter a valid {data_type.__name__}")
 
 if __name__ == "__main__":
+    parser = build_parser("eBay-backed valuation; pass --input to value a CSV/JSONL file without prompts")
+    parser.add_argument("--adjust-inflation", action="store_true", help="bulk mode: also adjust for inflation")
+    args = parser.parse_args()
     valuator = AssetValuationUsingAPIs()
-    
+    if args.input is not None:
+        sys.exit(run_cli(args, lambda record: valuator.value_record(record, args.adjust_inflation)))
+
     product_name = input("Product name: ").strip()
     years_used = valuator._get_validated_input("Years used: ", int)
     
@@ -105,6 +105,15 @@
 
 #!-----------------------------------------------------------------------------------------------
 
+import math
+import sys
+
+from math_based_approach.bulk import (
+    RecordError, build_parser, optional_number, optional_text, require_number, require_text, run_cli
+)
+from math_based_approach.categorizer import valuation_method_categorizer
+
+
 class AssetValuation:
     @staticmethod
     def straight_line_depreciation(initial_cost, salvage_value, useful_life, years):
@@ -123,14 +132,33 @@ class AssetValuation:
         """
         Calculates current value using the Declining Balance Method with a depreciation factor.
         Default factor is 2 for double declining balance.
+        Closed form, so `years` may be fractional and the cost does not grow with the horizon.
         """
         if useful_life == 0:
             return initial_cost
+        if years <= 0:
+            return round(initial_cost, 2)
+        if years >= AssetValuation.declining_balance_crossover_year(initial_cost, salvage_value, useful_life, factor):
+            return round(salvage_value, 2)
         depreciation_rate = factor / useful_life
-        current_value = initial_cost
-        for _ in range(years):
-            current_value = max(current_value - current_value * depreciation_rate, salvage_value)
-        return round(current_value, 2)
+        current_value = initial_cost * (1 - depreciation_rate) ** years
+        return round(max(current_value, salvage_value), 2)
+
+    @staticmethod
+    def declining_balance_crossover_year(initial_cost, salvage_value, useful_life, factor=2):
+        """
+        Returns the (fractional) year in which the declining balance hits the salvage floor.
+        """
+        if useful_life == 0:
+            return float('inf')  # No depreciation at all
+        if initial_cost <= salvage_value:
+            return 0.0
+        decay = 1 - factor / useful_life
+        if decay <= 0:
+            return 0.0  # Rate of 100%+ wipes the value out in the first period
+        if decay >= 1 or salvage_value <= 0:
+            return float('inf')  # Never reaches the floor
+        return math.log(salvage_value / initial_cost) / math.log(decay)
 
     @staticmethod
     def appreciation(initial_cost, appreciation_rate, years):
@@ -146,6 +174,14 @@ class AssetValuation:
         """
         return round(value * (1 + inflation_rate) ** years, 2)
 
+    @staticmethod
+    def indexed_inflation_adjustment(value, years, inflation_index, country='united-states'):
+        """
+        Adjusts a value for the inflation actually recorded over the last `years` years,
+        using an InflationIndex table instead of a flat rate.
+        """
+        return inflation_index.adjust(value, years, country)
+
     @staticmethod
     def calculate_salvage_value(original_cost, salvage_percentage):
         """
@@ -175,22 +211,60 @@ def determine_valuation_method(product_name):
     """
     Determines if the product typically appreciates or depreciates based on keywords.
     """
-    appreciating_keywords = ['art', 'real estate', 'antique', 'collectible', 'jewelry']
-    depreciating_keywords = ['car', 'laptop', 'phone', 'equipment', 'furniture']
-    
-    product_lower = product_name.lower()
-    for keyword in appreciating_keywords:
-        if keyword in product_lower:
-            return 'appreciate'
-    for keyword in depreciating_keywords:
-        if keyword in product_lower:
-            return 'depreciate'
-    return None  # Unknown type
+    # Keywords live in categorizer.VALUATION_METHODS; None means unknown type
+    return valuation_method_categorizer.categorize(product_name)
+
+def value_asset_record(record):
+    """
+    Non-interactive version of the prompts below, for one bulk input row.
+
+    Fields: product_name, years, valuation_method (optional when the name is
+    recognised), initial_cost, then salvage_percentage + depreciation_method +
+    annual_depreciation / useful_life (+ factor) to depreciate, or
+    appreciation_rate to appreciate. An inflation_rate adjusts the result.
+    """
+    years = require_number(record, 'years')
+    valuation_method = optional_text(record, 'valuation_method')
+    if valuation_method is None:
+        valuation_method = determine_valuation_method(require_text(record, 'product_name'))
+        if valuation_method is None:
+            raise RecordError("could not determine valuation method; set 'valuation_method'")
+    valuation_method = valuation_method.lower()
+    initial_cost = require_number(record, 'initial_cost')
+
+    if valuation_method == 'depreciate':
+        salvage_value = AssetValuation.calculate_salvage_value(initial_cost, require_number(record, 'salvage_percentage'))
+        depreciation_method = require_text(record, 'depreciation_method').lower()
+        if depreciation_method == 'straight-line':
+            annual_depreciation = require_number(record, 'annual_depreciation')
+            useful_life = AssetValuation.calculate_useful_life(initial_cost, salvage_value, annual_depreciation)
+            current_value = AssetValuation.straight_line_depreciation(initial_cost, salvage_value, useful_life, years)
+        elif depreciation_method == 'declining':
+            useful_life = require_number(record, 'useful_life')
+            factor = optional_number(record, 'factor', 2)
+            current_value = AssetValuation.declining_balance_depreciation(
+                initial_cost, salvage_value, useful_life, years, factor
+            )
+        else:
+            raise RecordError(f"invalid depreciation method: {depreciation_method!r}")
+    elif valuation_method == 'appreciate':
+        current_value = AssetValuation.appreciation(initial_cost, require_number(record, 'appreciation_rate'), years)
+    else:
+        raise RecordError(f"invalid valuation method: {valuation_method!r}")
+
+    inflation_rate = optional_number(record, 'inflation_rate')
+    if inflation_rate is not None:
+        current_value = AssetValuation.inflation_adjustment(current_value, inflation_rate, years)
+    return current_value
 
 if __name__ == "__main__":
+    args = build_parser("Asset valuation; pass --input to value a CSV/JSONL file without prompts").parse_args()
+    if args.input is not None:
+        sys.exit(run_cli(args, value_asset_record))
+
     # User inputs
     product_name = input("Enter product name: ")
-    years = int(input("Enter years used: "))
+    years = float(input("Enter years used: "))
     
     valuation_method = determine_valuation_method(product_name)
     
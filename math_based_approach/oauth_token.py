@@ -0,0 +1,87 @@
+import threading
+import time
+
+
+class OAuthTokenManager:
+    """
+    Holds an OAuth access token together with its expiry.
+
+    `fetch_token` is a callable returning (access_token, expires_in_seconds).
+    The token is refreshed `refresh_margin` seconds before it expires -- by a
+    background timer when `background_refresh` is on, otherwise by the first
+    caller past that point. Refreshes are single-flight: however many threads
+    find the token stale at once, only one token request goes out and the rest
+    reuse its result.
+    """
+
+    def __init__(self, fetch_token, refresh_margin=300, background_refresh=True, clock=time.monotonic):
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.clock = clock
+        self.refresh_count = 0
+        self._token = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+
+    @property
+    def token(self):
+        """Current token without triggering a refresh (None if there is none yet)"""
+        return self._token
+
+    @property
+    def expires_at(self):
+        return self._expires_at
+
+    def get_token(self):
+        """Valid token, fetching a new one first if needed. Raises whatever fetch_token raises."""
+        token = self._token
+        deadline = self._expires_at if self.background_refresh else self._refresh_at
+        if token is not None and self.clock() < deadline:
+            return token
+        return self.refresh(stale_token=token)
+
+    def refresh(self, stale_token=None):
+        """
+        Replace `stale_token` with a fresh one. If another caller already did so
+        while we waited for the lock, their token is returned instead.
+        """
+        with self._lock:
+            if self._token is not None and self._token != stale_token and self.clock() < self._expires_at:
+                return self._token
+            access_token, expires_in = self.fetch_token()
+            now = self.clock()
+            self._token = access_token
+            self._expires_at = now + expires_in
+            margin = min(self.refresh_margin, expires_in / 2)
+            self._refresh_at = self._expires_at - margin
+            self.refresh_count += 1
+            if self.background_refresh and not self._closed:
+                self._schedule_refresh(self._refresh_at - now)
+            return access_token
+
+    def close(self):
+        """Cancel the background refresh; get_token() still works, refreshing synchronously"""
+        with self._lock:  # Not mid-refresh, so no new timer gets armed after this
+            self._closed = True
+            self.background_refresh = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule_refresh(self, delay):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(delay, 0), self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh(stale_token=self._token)
+        except Exception as e:
+            # The token is still valid until expiry; callers will retry synchronously after that
+            print(f"Background token refresh failed: {str(e)}")
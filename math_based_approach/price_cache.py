@@ -0,0 +1,149 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()  # Returned by get() on a miss, since None is a valid (negative) cached value
+
+
+def make_price_key(product_name, category):
+    """Normalise the search text so 'iPhone  12' and 'iphone 12' share an entry"""
+    return f"{category or ''}|{' '.join(str(product_name).lower().split())}"
+
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry expiry.
+
+    None values are negative results ("eBay had nothing usable") and are kept
+    for the shorter `negative_ttl`, so a miss is retried sooner than a price.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, negative_ttl=300, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        ttl = self.negative_ttl if value is None else self.ttl
+        with self._lock:
+            self._data[key] = (self.clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    On-disk variant of TTLCache, so prices survive restarts and can be shared
+    between processes. Values must be JSON-serialisable.
+
+    The row count is tracked instead of counted per insert (a full COUNT(*)
+    scan); once it passes maxsize the table is trimmed to maxsize - evict_batch,
+    so eviction runs once per batch of inserts rather than on every one.
+    """
+
+    def __init__(self, path='price_cache.sqlite3', maxsize=100_000, ttl=86400, negative_ttl=900, clock=time.time,
+                 evict_batch=None):
+        self.maxsize = maxsize
+        self.evict_batch = evict_batch if evict_batch is not None else max(1, maxsize // 20)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT, expires_at REAL, accessed_at REAL)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, key, default=MISSING):
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._size -= self._conn.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount
+                    self._conn.commit()
+                self.misses += 1
+                return default
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        now = self.clock()
+        ttl = self.negative_ttl if value is None else self.ttl
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now)
+            )
+            self._size += not exists
+            if self._size > self.maxsize:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        # Expired rows go first, then the least recently used ones, down to maxsize - evict_batch.
+        # Recounted here since other processes may share the file.
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        overflow = size - max(self.maxsize - self.evict_batch, 0)
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)", (overflow,)
+            )
+            self.evictions += overflow
+            size -= overflow
+        self._size = size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._size = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self)}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
@@ -0,0 +1,148 @@
+import numpy as np
+
+
+def round_cents(values):
+    """
+    round(value, 2) for a whole array. np.round is not correctly rounded near
+    .xx5 halves (it rounds value * 100, which is inexact), so only those few
+    elements -- and ones too large to scale -- go through python's round().
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 2)
+    scaled = np.abs(values * 100)
+    with np.errstate(invalid="ignore"):  # inf - inf; non-finite values round to themselves either way
+        fallback = (np.abs(scaled - np.floor(scaled) - 0.5) <= np.maximum(scaled, 1.0) * 1e-12) | (scaled >= 2.0 ** 52)
+    index = np.flatnonzero(fallback)
+    rounded[index] = [round(value, 2) for value in values[index].tolist()]
+    return rounded
+
+
+class VectorizedAssetValuation:
+    """
+    NumPy counterpart of AssetValuation: every argument may be a scalar or an
+    array, so a whole fixed-asset register is valued in one call.
+    Results are rounded with np.round, which can differ from round() by a cent
+    on exact .xx5 halves.
+    """
+
+    @staticmethod
+    def straight_line_depreciation(initial_cost, salvage_value, useful_life, years):
+        """
+        Calculates current values using the Straight-Line Method.
+        """
+        initial_cost, salvage_value, useful_life, years = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (initial_cost, salvage_value, useful_life, years))
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annual_depreciation = (initial_cost - salvage_value) / useful_life
+            current_value = np.maximum(np.round(initial_cost - annual_depreciation * years, 2), salvage_value)
+        return np.where(useful_life == 0, salvage_value, current_value)
+
+    @staticmethod
+    def declining_balance_crossover_year(initial_cost, salvage_value, useful_life, factor=2):
+        """
+        Returns the (fractional) years at which each declining balance hits its salvage floor.
+        """
+        initial_cost, salvage_value, useful_life, factor = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (initial_cost, salvage_value, useful_life, factor))
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            decay = 1 - factor / useful_life
+            crossover = np.log(salvage_value / initial_cost) / np.log(decay)
+        crossover = np.where((decay >= 1) | (salvage_value <= 0), np.inf, crossover)
+        crossover = np.where(decay <= 0, 0.0, crossover)
+        crossover = np.where(initial_cost <= salvage_value, 0.0, crossover)
+        return np.where(useful_life == 0, np.inf, crossover)
+
+    @staticmethod
+    def declining_balance_depreciation(initial_cost, salvage_value, useful_life, years, factor=2):
+        """
+        Calculates current values using the Declining Balance Method (closed form).
+        """
+        initial_cost, salvage_value, useful_life, years, factor = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (initial_cost, salvage_value, useful_life, years, factor))
+        )
+        crossover = VectorizedAssetValuation.declining_balance_crossover_year(
+            initial_cost, salvage_value, useful_life, factor
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            decay = np.clip(1 - factor / useful_life, 0, None)
+            current_value = np.maximum(initial_cost * decay ** years, salvage_value)
+        current_value = np.where(years >= crossover, salvage_value, current_value)
+        current_value = np.round(np.where(years <= 0, initial_cost, current_value), 2)
+        return np.where(useful_life == 0, initial_cost, current_value)
+
+    @staticmethod
+    def appreciation(initial_cost, appreciation_rate, years):
+        """
+        Calculates appreciated values for assets like real estate or collectibles.
+        """
+        return np.round(np.asarray(initial_cost, dtype=float) * (1 + np.asarray(appreciation_rate, dtype=float)) ** years, 2)
+
+    @staticmethod
+    def inflation_adjustment(value, inflation_rate, years):
+        """
+        Adjusts calculated values for inflation.
+        """
+        return np.round(np.asarray(value, dtype=float) * (1 + np.asarray(inflation_rate, dtype=float)) ** years, 2)
+
+    @staticmethod
+    def calculate_salvage_value(original_cost, salvage_percentage):
+        """
+        Calculate salvage values as a percentage of the original costs.
+        """
+        return np.round(np.asarray(original_cost, dtype=float) * salvage_percentage, 2)
+
+    @staticmethod
+    def calculate_useful_life(original_cost, salvage_value, annual_depreciation):
+        """
+        Calculate useful lives based on original cost, salvage value, and annual depreciation.
+        """
+        annual_depreciation = np.asarray(annual_depreciation, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            useful_life = np.round((np.asarray(original_cost, dtype=float) - salvage_value) / annual_depreciation, 2)
+        return np.where(annual_depreciation == 0, np.inf, useful_life)
+
+    @staticmethod
+    def calculate_straight_line_rate(useful_life):
+        """
+        Calculate straight-line depreciation rates.
+        """
+        useful_life = np.asarray(useful_life, dtype=float)
+        with np.errstate(divide='ignore'):
+            rate = np.round(100 / useful_life, 2)
+        return np.where(useful_life == 0, 0.0, rate)
+
+
+def _asset_values_at(method, years, initial_cost, salvage_value=0.0, useful_life=0, factor=2, appreciation_rate=0.0):
+    if method == 'straight-line':
+        return VectorizedAssetValuation.straight_line_depreciation(initial_cost, salvage_value, useful_life, years)
+    if method == 'declining':
+        return VectorizedAssetValuation.declining_balance_depreciation(initial_cost, salvage_value, useful_life, years, factor)
+    if method == 'appreciation':
+        return VectorizedAssetValuation.appreciation(initial_cost, appreciation_rate, years)
+    raise ValueError(f"Unknown valuation method: {method}")
+
+
+def depreciation_schedule_array(method, periods, periods_per_year=1, **asset_params):
+    """
+    Full schedule for a batch of assets sharing one method.
+
+    Returns (values, depreciation): values has shape (n_assets, periods + 1) with
+    the opening value in column 0; depreciation[:, p] is the charge for period p + 1.
+    """
+    initial_cost = np.atleast_1d(np.asarray(asset_params.pop('initial_cost'), dtype=float))
+    years = np.arange(periods + 1) / periods_per_year
+    params = {k: np.asarray(v, dtype=float)[..., None] for k, v in asset_params.items()}
+    values = _asset_values_at(method, years[None, :], initial_cost[:, None], **params)
+    return values, np.round(values[:, :-1] - values[:, 1:], 2)
+
+
+def roll_forward_array(method, period, values, periods_per_year=1, **asset_params):
+    """
+    Advance a batch of schedule states by one period: O(1) per asset.
+    Returns (next_period, closing_values, depreciation).
+    """
+    next_period = np.asarray(period) + 1
+    closing_values = _asset_values_at(method, next_period / periods_per_year, **asset_params)
+    return next_period, closing_values, np.round(np.asarray(values, dtype=float) - closing_values, 2)
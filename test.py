@@ -1,48 +1,46 @@
 import requests
-import json
 import streamlit as st
-import re
 import os
 from dotenv import load_dotenv
-load_dotenv()
-def extract_values(response_text):
-    # Extract numerical values using regex
-    try:
-        data = json.loads(response_text)
-        text = data.get("text", "")
 
-        # Regex to find the required values
-        market_trend_factor = re.search(r'"market_trend_factor"\s*:\s*([\d.]+)', text)
-        uniqueness_score = re.search(r'"uniqueness_score"\s*:\s*([\d.]+)', text)
-        preciousness_score = re.search(r'"preciousness_score"\s*:\s*([\d.]+)', text)
+from lenden.extraction import extract_values
+from lenden.llm_cache import LLMScoreCache
+from math_based_approach.http_transport import timeout_for
+from math_based_approach.price_cache import SQLiteCache
 
-        # Extract and convert to float if found, else None
-        return {
-            "market_trend_factor": float(market_trend_factor.group(1)) if market_trend_factor else None,
-            "uniqueness_score": float(uniqueness_score.group(1)) if uniqueness_score else None,
-            "preciousness_score": float(preciousness_score.group(1)) if preciousness_score else None
-        }
+load_dotenv()
 
-    except json.JSONDecodeError:
-        return "Invalid JSON"
+# VEXT_URL can point at a local stub (benchmarks/stub_server.py) instead of the real hook
+URL=os.environ.get("VEXT_URL", "https://payload.vextapp.com/hook/JRTTX71X3M/catch/hello_ji") #last endpoint should be a unique identifier, its used for message history
+DATA={"payload": "Iphone 12 that has been used roughly for 3 years. It has some scratches on its screen.It has a storage of 128 gb", "brand": "Apple", "category": "Mobiles and Electronics", "product_name": "Iphone 12", "original_value": "$500"}
 
 
-def run_flow():
+def post_flow(data):
     API_KEY=os.environ.get("API_KEY")
-    URL="https://payload.vextapp.com/hook/JRTTX71X3M/catch/hello_ji" #last endpoint should be a unique identifier, its used for message history
     headers={
         "Content-type": "application/json",
         "ApiKey": f"Api-key {API_KEY}"
     }
-    data={"payload": "Iphone 12 that has been used roughly for 3 years. It has some scratches on its screen.It has a storage of 128 gb", "brand": "Apple", "category": "Mobiles and Electronics", "product_name": "Iphone 12", "original_value": "$500"}
-
-    response = requests.post(URL, headers=headers, json=data)
-    extract_values(response.text)
+    response = requests.post(URL, headers=headers, json=data, timeout=timeout_for(URL))
     print(response.text )
-    print()
-    print(extract_values(response.text))
-    # return extract_values(response.text)
-    return response.text
+    return extract_values(response.text)
+
+
+@st.cache_resource
+def get_score_cache():
+    # One instance across reruns and sessions, so in-flight requests are shared too; scores live on disk
+    cache = SQLiteCache(
+        os.environ.get("VEXT_CACHE_PATH", "llm_cache.sqlite3"),
+        maxsize=int(os.environ.get("VEXT_CACHE_SIZE", 10_000)),
+        ttl=float(os.environ.get("VEXT_CACHE_TTL", 7 * 86400))
+    )
+    return LLMScoreCache(post_flow, cache=cache)
+
+
+def run_flow(data=DATA):
+    scores = get_score_cache().get_scores(data)
+    print(scores)
+    return scores
 
 
 def main():
@@ -57,9 +55,12 @@ def main():
 
         try:
             with st.spinner("Running Flow..."):
-                response = run_flow()
+                scores = run_flow()
             # response = response["outputs"][0]["outputs"][0]["results"]["message"]["text"]
-            st.text(response)
+            if scores.ok:
+                st.json(scores.values)
+            else:
+                st.error("; ".join(error.message for error in scores.errors))
         except Exception as e:
             st.error(str(e))
 
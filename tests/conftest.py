@@ -0,0 +1,24 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from math_based_approach.factors import factor_registry
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    """A small fitted depreciation forest, pickled like depreciation_model.pkl"""
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 4)) * [1, 1, 2, 10]
+    y = 0.02 + 0.1 * X[:, 0] * X[:, 2] / 2
+    path = tmp_path / "depreciation_model.pkl"
+    joblib.dump(RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0).fit(X, y), path)
+    return str(path)
+
+
+@pytest.fixture
+def category_defaults(monkeypatch):
+    """Fresh category defaults on the shared factor registry, restored after the test"""
+    monkeypatch.setattr(factor_registry, "_defaults", {})
+    factor_registry.set_category_defaults("electronics", {"brand_reputation": 1.05})
@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+import pytest
+
+from train_model.batch_predictor import BatchPredictor
+
+
+class SumModel:
+    n_features_in_ = 4
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return X.sum(axis=1)
+
+
+def test_concurrent_rows_share_batches():
+    model = SumModel()
+    predictor = BatchPredictor(model, max_batch_size=8, max_delay=0.05)
+    barrier = threading.Barrier(16)
+    results = {}
+
+    def worker(i):
+        barrier.wait()
+        results[i] = predictor.predict([i, 1, 0, 0], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    predictor.close()
+
+    assert results == {i: i + 1.0 for i in range(16)}
+    assert sum(model.calls) == 16 and len(model.calls) < 16
+
+
+@pytest.mark.parametrize("features", [[1, 2, 3], [[1, 2, 3, 4]], ["a", 1, 2, 3], [None, 1, 2, 3]])
+def test_submit_rejects_malformed_rows(features):
+    predictor = BatchPredictor(SumModel())
+    with pytest.raises((ValueError, TypeError)):
+        predictor.submit(features)
+    assert predictor.predict([1, 2, 3, 4], timeout=5) == 10.0
+    predictor.close()
+
+
+def test_submit_after_close_raises():
+    predictor = BatchPredictor(SumModel())
+    future = predictor.submit(np.ones(4))
+    predictor.close()
+    assert future.result(timeout=5) == 4.0
+    with pytest.raises(RuntimeError):
+        predictor.submit([1, 2, 3, 4])
+    predictor.close()  # Idempotent
+
+
+def test_product_valuation_uses_the_predictors_model(monkeypatch):
+    from train_model import valuation_classes
+
+    def no_load(*args, **kwargs):
+        raise AssertionError("load_model called with a predictor")
+
+    monkeypatch.setattr(valuation_classes, "load_model", no_load)
+    model = SumModel()
+    predictor = BatchPredictor(model)
+    product = valuation_classes.ProductValuation("general", 100, 1, 0.0, 0.0, 1.0, model_path="missing.pkl",
+                                                 predictor=predictor)
+    assert product.model is model
+    assert product.predict_depreciation_rate() == 2.0  # 0 + 0 + 1.0 trend + 1 year
+    predictor.close()
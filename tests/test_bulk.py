@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+
+from math_based_approach.bulk import RecordError, read_records, require_number, run_bulk
+
+
+def value_double(record):
+    if record.get("boom"):
+        raise ZeroDivisionError("boom")
+    return 2 * require_number(record, "x")
+
+
+def write_csv(path, rows, fields=("name", "x")):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def test_read_records():
+    records = list(read_records(io.StringIO("name,x\na,1\n\"multi\nline\",2\nc,3\n")))
+    # CSV line numbers are the line each record ends on
+    assert records == [(2, {"name": "a", "x": "1"}), (4, {"name": "multi\nline", "x": "2"}),
+                       (5, {"name": "c", "x": "3"})]
+    records = list(read_records(io.StringIO('{"x": 1}\n\nnot json\n[1]\n'), "jsonl"))
+    assert records[0] == (1, {"x": 1})
+    assert [(line, type(record)) for line, record in records[1:]] == [(3, RecordError), (4, RecordError)]
+
+
+def test_csv_keeps_order_and_writes_error_rows(tmp_path):
+    source, output = tmp_path / "in.csv", tmp_path / "out.csv"
+    rows = [{"name": f"item{i}", "x": i} for i in range(2500)]
+    rows[3]["x"] = "three"
+    rows[7]["x"] = ""
+    write_csv(source, rows)
+
+    assert run_bulk(value_double, str(source), str(output), flush_every=100) == (2498, 2)
+    fields, results = read_csv(output)
+    assert fields == ["line", "name", "x", "value", "error"]
+    assert [result["name"] for result in results] == [row["name"] for row in rows]
+    assert [result["line"] for result in results] == [str(i + 2) for i in range(2500)]
+    assert results[3]["value"] == "" and results[3]["error"] == "field 'x' is not a number: 'three'"
+    assert results[7]["error"] == "missing field 'x'"
+    assert results[10]["value"] == "20.0" and results[10]["error"] == ""
+
+
+def test_jsonl_to_csv_header_when_the_first_row_errors(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.csv"
+    source.write_text('not json\n{"x": 1, "boom": true}\n{"x": 2, "note": "late field"}\n')
+
+    assert run_bulk(value_double, str(source), str(output)) == (1, 2)
+    fields, results = read_csv(output)
+    # The header covers every row's keys, not just the first (error) row's
+    assert fields == ["line", "x", "boom", "note", "value", "error"]
+    assert [result["line"] for result in results] == ["1", "2", "3"]
+    assert results[0]["error"].startswith("invalid JSON") and results[0]["x"] == ""
+    assert results[1]["error"] == "ZeroDivisionError: boom"
+    assert (results[2]["value"], results[2]["note"]) == ("4.0", "late field")
+
+
+def test_jsonl_output_has_one_schema(tmp_path):
+    source, output = tmp_path / "in.csv", tmp_path / "out.jsonl"
+    write_csv(source, [{"name": "a", "x": "oops"}, {"name": "b", "x": 5}])
+
+    assert run_bulk(value_double, str(source), str(output)) == (1, 1)
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [list(result) for result in results] == [["line", "name", "x", "value", "error"]] * 2
+    assert results[1]["value"] == 10.0
@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.bench_categorizer import make_names, make_taxonomy, naive_categorize
+from math_based_approach.categorizer import KeywordCategorizer, product_categorizer, valuation_method_categorizer
+from math_based_approach.math_valuation import value_asset_record
+
+
+@pytest.mark.parametrize("name, category", [
+    ("Apple iPhone 12", "electronics"),
+    ("car phone holder", "electronics"),  # electronics is listed before vehicles
+    ("antique table", "collectibles"),  # collectibles before furniture
+    ("Old  COINS  collection", "collectibles"),
+    ("two bikes", "vehicles"),
+    ("set of chairs", "furniture"),
+    ("wooden benches", "general"),
+    ("smartwatch", "general"),  # 'art' only as a whole word
+    ("wool scarf", "general"),  # likewise 'car'
+    ("artwork", "collectibles"),
+    ("vintage artworks", "collectibles"),
+    ("headphones", "electronics"),
+    ("cellphone", "electronics"),
+])
+def test_product_categories(name, category):
+    assert product_categorizer.categorize(name) == category
+
+
+@pytest.mark.parametrize("name, method", [
+    ("artwork", "appreciate"),
+    ("vintage artworks", "appreciate"),
+    ("real estate in town", "appreciate"),
+    ("headphones", "depreciate"),
+    ("cellphone", "depreciate"),
+    ("smartwatch", None),
+])
+def test_valuation_methods(name, method):
+    assert valuation_method_categorizer.categorize(name) == method
+
+
+def test_overlapping_keywords_without_word_boundaries():
+    categorizer = KeywordCategorizer(
+        {"electronics": ["phone"], "collectibles": ["stamp"], "vehicles": ["car"], "stationery": ["cards"]},
+        word_boundary=False,
+    )
+    assert categorizer.categorize("stamphone") == "electronics"
+    # 'car' is a prefix of the longer, lower-priority 'cards' at the same position
+    assert categorizer.categorize("cards") == "vehicles"
+    assert categorizer.categorize("smartwatch") is None
+
+
+def test_matches_substring_scan_without_word_boundaries():
+    taxonomy = make_taxonomy(2000, category_count=20)
+    names = make_names(taxonomy, 2000)
+    categorizer = KeywordCategorizer(taxonomy, default="general", word_boundary=False)
+    assert categorizer.categorize_many(names) == [naive_categorize(taxonomy, name) for name in names]
+
+
+def test_bulk_artwork_row_is_appreciated():
+    record = {"product_name": "vintage artworks", "years": "2", "initial_cost": "100", "appreciation_rate": "0.1"}
+    assert value_asset_record(record) == pytest.approx(121.0)
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from lenden.extraction import ExtractionError, Field, ResponseExtractor, extract_values
+
+ANSWER = """Here is my assessment.
+```json
+{"market_trend_factor": 1.2, "uniqueness_score": "0.7", "preciousness_score": 0.35}
+```
+"""
+
+
+def envelope(text):
+    return json.dumps({"text": text})
+
+
+def codes(extraction):
+    return [(error.code, error.field) for error in extraction.errors]
+
+
+def test_fenced_block():
+    extraction = extract_values(envelope(ANSWER))
+    assert extraction.ok
+    assert extraction.values == {"market_trend_factor": 1.2, "uniqueness_score": 0.7, "preciousness_score": 0.35}
+
+
+def test_inline_values_and_first_occurrence_wins():
+    text = 'I\'d say "uniqueness_score": 0.4, "preciousness_score": 0.1, "market_trend_factor": 2e0 ' \
+           'and later "uniqueness_score": 0.9'
+    assert extract_values(envelope(text)).values == {
+        "market_trend_factor": 2.0, "uniqueness_score": 0.4, "preciousness_score": 0.1
+    }
+
+
+@pytest.mark.parametrize("response", ["not json", '{"text": ', None])
+def test_invalid_json(response):
+    extraction = extract_values(response)
+    assert codes(extraction) == [("invalid_json", None)]
+    assert set(extraction.values.values()) == {None}
+
+
+@pytest.mark.parametrize("response", ['{"answer": "..."}', '{"text": 42}', '["text"]'])
+def test_missing_text(response):
+    extraction = extract_values(response)
+    assert extraction.errors == [ExtractionError("missing_text", "response has no 'text' string")]
+    assert not extraction.ok
+
+
+def test_missing_field():
+    extraction = extract_values(envelope('{"market_trend_factor": 1.1, "uniqueness_score": 0.5}'))
+    assert codes(extraction) == [("missing_field", "preciousness_score")]
+    assert extraction["preciousness_score"] is None and extraction["uniqueness_score"] == 0.5
+
+
+def test_optional_field_may_be_missing():
+    extractor = ResponseExtractor([Field("uniqueness_score"), Field("rarity", required=False)])
+    extraction = extractor.extract(envelope('{"uniqueness_score": 0.5}'))
+    assert extraction.ok and extraction.get("rarity", 0.0) == 0.0
+
+
+@pytest.mark.parametrize("text, field", [
+    ('{"market_trend_factor": 7, "uniqueness_score": 0.5, "preciousness_score": 0.5}', "market_trend_factor"),
+    ('{"market_trend_factor": 1, "uniqueness_score": -0.1, "preciousness_score": 0.5}', "uniqueness_score"),
+    ('{"market_trend_factor": 1, "uniqueness_score": 0.5, "preciousness_score": "nan"}', "preciousness_score"),
+])
+def test_out_of_range(text, field):
+    extraction = extract_values(envelope(text))
+    assert codes(extraction) == [("out_of_range", field)]
+    assert extraction[field] is None
+
+
+def test_bounds_are_inclusive():
+    text = '{"market_trend_factor": 5.0, "uniqueness_score": 0, "preciousness_score": 1}'
+    assert extract_values(envelope(text)).ok
+
+
+def test_not_a_number():
+    text = '{"market_trend_factor": "high", "uniqueness_score": 0.5, "preciousness_score": 0.5}'
+    assert codes(extract_values(envelope(text))) == [("not_a_number", "market_trend_factor")]
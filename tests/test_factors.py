@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from math_based_approach.factors import FactorError, FactorRegistry
+from train_model.valuation_classes import price_services, price_services_stream
+
+ITEMS = [
+    ({"brand": 1.1, "features": 1.05}, "electronics"),
+    ({"features": 1.2}, "electronics"),
+    ({"brand": 0.9}, "electronics"),  # Overrides the category's brand default
+    ({}, "electronics"),
+    ({"warranty": 1.3}, "furniture"),
+    ({"brand": 1.7, "warranty": 0.6, "features": 1.01}, "general"),
+    ({}, "general"),
+]
+
+
+def make_registry():
+    registry = FactorRegistry()
+    for name in ("brand", "features", "warranty"):
+        registry.register(name, 0.5, 2.0)
+    return registry
+
+
+@pytest.mark.parametrize("with_defaults", [False, True])
+def test_scalar_and_dense_batch_are_identical(with_defaults):
+    registry = make_registry()
+    if with_defaults:
+        registry.set_category_defaults("electronics", {"brand": 1.05, "warranty": 1.1})
+    factors = [item for item, _ in ITEMS]
+    categories = [category for _, category in ITEMS]
+
+    expected = [registry.multiplier(item, category) for item, category in ITEMS]
+    batch = registry.multipliers(registry.factor_matrix(factors), categories)
+
+    assert batch.tolist() == expected  # Exact, not approximately equal
+    if with_defaults:
+        assert expected[2] == 0.9 * 1.1  # The item's own brand replaces the default; warranty still applies
+        assert expected[3] == 1.05 * 1.1
+
+
+@pytest.mark.parametrize("with_defaults", [False, True])
+def test_sparse_matrix_matches_dense(with_defaults):
+    registry = make_registry()
+    if with_defaults:
+        registry.set_category_defaults("furniture", {"features": 1.2})
+    dense = registry.factor_matrix([item for item, _ in ITEMS])
+    sparse = scipy.sparse.csr_matrix(np.nan_to_num(dense, nan=0.0))
+    categories = [category for _, category in ITEMS]
+
+    assert registry.multipliers(sparse, categories).tolist() == registry.multipliers(dense, categories).tolist()
+
+
+def test_nan_means_unset_on_both_paths():
+    registry = make_registry()
+    assert registry.multiplier({"brand": math.nan, "features": 1.2}) == 1.2
+    assert registry.multipliers(np.array([[np.nan, 1.2, np.nan]])).tolist() == [1.2]
+
+
+def test_out_of_bounds_values_raise():
+    registry = make_registry()
+    for value in (0.4, 2.5, math.inf, "high"):
+        with pytest.raises(FactorError):
+            registry.multiplier({"brand": value})
+    with pytest.raises(FactorError):
+        registry.check_column("brand", [1.0, np.nan, 3.0])
+    with pytest.raises(FactorError):
+        registry.set_category_defaults("electronics", {"warranty": 0.1})
+
+
+def test_unknown_names_are_capped():
+    registry = FactorRegistry(max_factors=4)
+    registry.register("brand", 0.5, 2.0)
+    registry.multiplier({"ad_hoc_1": 1.1, "ad_hoc_2": 1.2, "ad_hoc_3": 1.3})
+    assert registry.names == ["brand", "ad_hoc_1", "ad_hoc_2", "ad_hoc_3"]
+    with pytest.raises(FactorError):
+        registry.multiplier({"ad_hoc_4": 1.1})
+    assert len(registry.names) == 4
+    registry.register("warranty", 0.5, 2.0)  # Explicit registration isn't capped
+    assert registry.index("warranty") == 4
+
+
+def test_strict_registry_rejects_unknown_names():
+    registry = FactorRegistry(strict=True)
+    with pytest.raises(FactorError):
+        registry.multiplier({"brand": 1.1})
+
+
+def test_empty_batches():
+    registry = make_registry()
+    assert registry.multipliers(np.empty((0, 3))).shape == (0,)
+    assert registry.multipliers(np.empty(0), size=0).shape == (0,)
+    assert price_services([], [], [], [], np.empty((0, 3))).shape == (0,)
+
+
+def test_stream_of_a_header_only_file(tmp_path):
+    path = tmp_path / "services.csv"
+    path.write_text("category,base_rate,hours,expertise_level,demand_factor,specialization\n")
+    chunks = list(price_services_stream(str(path), factor_columns=["specialization"]))
+    assert [len(chunk) for chunk in chunks] == [0]
+
+
+def test_value_products_on_an_empty_inventory():
+    from train_model.valuation_classes import value_products
+
+    class NoRowsModel:
+        def predict(self, X):
+            raise AssertionError("predict called without rows")
+
+    columns = ["category", "original_value", "years_used", "uniqueness_score", "preciousness_score",
+               "market_trend_factor", "brand_reputation"]
+    products = {name: np.empty(0) for name in columns}
+    assert value_products(products, ["brand_reputation"], model=NoRowsModel()).shape == (0,)
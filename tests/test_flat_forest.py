@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+
+from train_model.flat_forest import FlatForest, export_forest
+from train_model.model_registry import load_model
+
+
+@pytest.mark.parametrize("forest", [RandomForestRegressor, ExtraTreesRegressor])
+def test_saved_flat_forest_matches_sklearn(forest, tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 4)) * [1, 1, 2, 10]
+    y = 0.02 + 0.1 * X[:, 0] * X[:, 2] + 0.01 * rng.standard_normal(300)
+    model = forest(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+
+    path = tmp_path / "forest.npz"
+    export_forest(model).save(path)
+    flat = FlatForest.load(path)
+
+    X_test = np.vstack([rng.random((500, 4)) * [1, 1, 2, 10], X[:50]])  # Unseen rows plus training rows
+    assert np.abs(flat.predict(X_test) - model.predict(X_test)).max() <= 1e-12
+    assert flat.predict(X_test[0]).shape == (1,)  # One row as a 1-d vector
+    assert (flat.max_depth, flat.n_features) == (max(e.tree_.max_depth for e in model.estimators_), 4)
+
+
+def test_registry_loads_npz_as_flat_forest(tmp_path):
+    X = np.arange(40, dtype=float).reshape(10, 4)
+    model = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, X[:, 0] / 40)
+    path = tmp_path / "forest.npz"
+    export_forest(model).save(path)
+    assert isinstance(load_model(str(path)), FlatForest)
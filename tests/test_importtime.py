@@ -0,0 +1,11 @@
+from benchmarks.check_importtime import COMMAND, FORBIDDEN, measure
+
+BUDGET_MS = 40.0
+
+
+def test_depreciate_cold_start_stays_light():
+    runs = [measure(COMMAND) for _ in range(3)]
+    baseline_ms = min(measure(["-c", "pass"])[0] for _ in range(3))
+
+    assert not set(FORBIDDEN) & runs[0][1], "the pure-math CLI path imported a numeric/HTTP stack"
+    assert min(ms for ms, _ in runs) - baseline_ms <= BUDGET_MS
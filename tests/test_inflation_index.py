@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from math_based_approach.inflation_index import InflationIndex, parse_series
+
+
+def test_rates_are_keyed_by_reported_year():
+    series = [{"Year": 2022, "InflationRate": 8.0}, {"Year": 2020, "InflationRate": 1.2},
+              {"Date": "2021-01-01T00:00:00", "InflationRate": "4.7"}]
+    assert parse_series(series, 2020, 2022) == {2020: 1.2, 2021: 4.7, 2022: 8.0}
+
+
+def test_unpublished_trailing_year_is_dropped():
+    series = [{"Year": 2021, "InflationRate": 4.7}, {"Year": 2022, "InflationRate": None}]
+    assert parse_series(series, 2021, 2022) == {2021: 4.7}
+
+
+@pytest.mark.parametrize("series", [
+    [{"Year": 2020, "InflationRate": 1.2}, {"Year": 2022, "InflationRate": 8.0}],
+    [{"Year": 2020, "InflationRate": 1.2}, {"Year": 2021, "InflationRate": "n/a"}, {"Year": 2022, "InflationRate": 8.0}],
+    [{"Year": 2020, "InflationRate": 1.2}, {"Year": 2020, "InflationRate": 1.3}],
+    [1.2, 4.7],  # Three years asked for: which one is missing?
+])
+def test_gaps_and_ambiguity_fail(series):
+    with pytest.raises(LookupError):
+        parse_series(series, 2020, 2022)
+
+
+def test_bare_series_with_one_value_per_year():
+    assert parse_series([1.0, 2.0, 3.0], 2020, 2022) == {2020: 1.0, 2021: 2.0, 2022: 3.0}
+
+
+def test_cache_path_is_configurable(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "cache" / "index.json"
+    path.parent.mkdir()
+    monkeypatch.setenv("LENDEN_INFLATION_INDEX", str(path))
+
+    def fetch(country, start, end):
+        return [{"Year": year, "InflationRate": 2.0} for year in range(start, end + 1)]
+
+    index = InflationIndex(fetch_series=fetch, first_year=2000)
+    assert index.cumulative_factor(2000) > 1.0
+    assert json.loads(path.read_text())["united-states"]["rates"]["2000"] == 2.0
+    assert not (tmp_path / "inflation_index.json").exists()
+
+    offline = InflationIndex(offline=True)
+    assert offline.cumulative_factor(2000) == index.cumulative_factor(2000)
+    assert InflationIndex("", fetch_series=fetch).path == ""
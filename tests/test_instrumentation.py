@@ -0,0 +1,37 @@
+import asyncio
+import subprocess
+import sys
+
+from benchmarks.stub_server import StubServer
+from math_based_approach import instrumentation
+from math_based_approach.async_api_valuation import AsyncAssetValuationUsingAPIs
+from math_based_approach.price_cache import TTLCache
+
+
+def test_domain_packages_do_not_import_lenden():
+    modules = ["math_based_approach.math_plus_api", "math_based_approach.async_api_valuation",
+               "train_model.valuation_classes", "train_model.batch_predictor", "train_model.training_pipeline",
+               "valuation_models.valuation_models", "valuation_models.deprication"]
+    code = "import sys\n" + "".join(f"import {name}\n" for name in modules) + \
+        "print(sorted(name for name in sys.modules if name.split('.')[0] == 'lenden'))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_async_market_price_is_timed_and_counts_cache():
+    async def run(valuator):
+        async with valuator:
+            await valuator.aget_market_price("iphone 12", "electronics")
+            await valuator.aget_market_price("iphone 12", "electronics")
+
+    instrumentation.metrics.reset()
+    instrumentation.enable()
+    try:
+        with StubServer() as stub:
+            asyncio.run(run(stub.configure(AsyncAssetValuationUsingAPIs(price_cache=TTLCache()))))
+        text = instrumentation.render_prometheus()
+    finally:
+        instrumentation.disable()
+    assert 'lenden_stage_seconds_count{stage="market_price"} 2' in text
+    assert 'lenden_cache_requests_total{cache="price",result="hit"} 1' in text
+    assert 'lenden_cache_requests_total{cache="price",result="miss"} 1' in text
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from benchmarks.stub_server import StubServer
+from lenden.extraction import Extraction, extract_values
+from lenden.llm_cache import LLMScoreCache, make_payload_key
+from math_based_approach.price_cache import SQLiteCache, TTLCache
+
+DATA = {"payload": "Iphone 12, used 3 years", "brand": "Apple", "category": "Mobiles", "product_name": "Iphone 12",
+        "original_value": "$500"}
+SCORES = {"market_trend_factor": 1.1, "uniqueness_score": 0.4, "preciousness_score": 0.3}
+
+
+def test_key_ignores_case_and_whitespace():
+    assert make_payload_key(DATA) == make_payload_key({**DATA, "payload": "  iphone 12,   USED 3 years "})
+    assert make_payload_key(DATA) != make_payload_key({**DATA, "brand": "Samsung"})
+
+
+def test_hit_skips_fetch(tmp_path):
+    calls = []
+    cache = LLMScoreCache(lambda data: calls.append(data) or Extraction(dict(SCORES)),
+                          cache=SQLiteCache(str(tmp_path / "llm.sqlite3")))
+    assert cache.get_scores(DATA).values == SCORES
+    assert cache.get_scores(dict(DATA)).values == SCORES
+    assert len(calls) == 1 and cache.upstream_calls == 1
+
+
+def test_failed_extraction_is_not_cached():
+    results = iter([Extraction({"market_trend_factor": None}, errors=["missing"]), Extraction(dict(SCORES))])
+    cache = LLMScoreCache(lambda data: next(results), cache=TTLCache())
+    assert not cache.get_scores(DATA).ok
+    assert cache.get_scores(DATA).values == SCORES
+    assert cache.upstream_calls == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    with StubServer(llm_latency=0.2) as stub, requests.Session() as session:
+        def fetch(data):
+            return extract_values(session.post(stub.vext_url, json=data, timeout=(3.05, 10)).text)
+
+        cache = LLMScoreCache(fetch, cache=TTLCache())
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(cache.get_scores(DATA).values)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert stub.counts["vext"] == 1
+        assert cache.upstream_calls == 1 and cache.coalesced == 7
+        assert len(results) == 8 and all(result == results[0] for result in results)
+
+
+def test_waiters_get_the_leaders_error():
+    started = threading.Event()
+
+    def fetch(data):
+        started.set()
+        time.sleep(0.1)
+        raise ConnectionError("upstream down")
+
+    cache = LLMScoreCache(fetch, cache=TTLCache())
+    errors = []
+
+    def call():
+        try:
+            cache.get_scores(DATA)
+        except ConnectionError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    leader.join()
+    waiter.join()
+    assert len(errors) == 2 and cache.upstream_calls == 1
+
+
+def test_waiter_times_out():
+    release = threading.Event()
+    started = threading.Event()
+
+    def fetch(data):
+        started.set()
+        release.wait(5)
+        return Extraction(dict(SCORES))
+
+    cache = LLMScoreCache(fetch, cache=TTLCache(), wait_timeout=0.05)
+    leader = threading.Thread(target=cache.get_scores, args=(DATA,))
+    leader.start()
+    started.wait()
+    with pytest.raises(TimeoutError):
+        cache.get_scores(DATA)
+    release.set()
+    leader.join()
+    assert cache.get_scores(DATA).values == SCORES
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from benchmarks.stub_server import StubServer
+from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+from math_based_approach.oauth_token import OAuthTokenManager
+from math_based_approach.price_cache import TTLCache
+
+
+def test_concurrent_callers_share_one_token_request():
+    with StubServer(oauth_latency=0.05) as stub, stub.configure(AssetValuationUsingAPIs()) as valuator:
+        barrier = threading.Barrier(16)
+        tokens = []
+
+        def worker():
+            barrier.wait()
+            tokens.append(valuator.token_manager.get_token())
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert stub.counts["oauth"] == 1
+        assert len(tokens) == 16 and len(set(tokens)) == 1
+
+
+def test_background_refresh_until_closed():
+    with StubServer(token_ttl=0.4) as stub:
+        valuator = stub.configure(AssetValuationUsingAPIs())
+        manager = valuator.token_manager
+        first = manager.get_token()
+        deadline = time.monotonic() + 5
+        while manager.refresh_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.refresh_count >= 2 and manager.token != first
+
+        valuator.close()
+        assert manager._timer is None
+        refreshes = stub.counts["oauth"]
+        time.sleep(0.5)
+        assert stub.counts["oauth"] == refreshes
+
+
+def test_context_manager_stops_refresh_timer():
+    before = {thread for thread in threading.enumerate() if isinstance(thread, threading.Timer)}
+    with StubServer() as stub:
+        with stub.configure(AssetValuationUsingAPIs()) as valuator:
+            valuator.token_manager.get_token()
+            assert valuator.token_manager._timer.is_alive()
+        assert valuator.token_manager._timer is None
+    time.sleep(0.05)
+    after = {thread for thread in threading.enumerate() if isinstance(thread, threading.Timer)}
+    assert after <= before
+
+
+def test_rejected_token_is_replaced_once():
+    with StubServer(check_tokens=True) as stub:
+        with stub.configure(AssetValuationUsingAPIs(price_cache=TTLCache())) as valuator:
+            assert valuator.get_market_price("iphone 12", "electronics") is not None
+            stub.revoke_tokens()
+            valuator.price_cache.clear()
+            assert valuator.get_market_price("iphone 12", "electronics") is not None
+        assert stub.counts["oauth"] == 2
+        assert stub.counts["search"] == 3
+
+
+def test_closed_manager_refreshes_on_demand():
+    clock = [0.0]
+    serial = iter(range(100))
+    manager = OAuthTokenManager(lambda: (f"token-{next(serial)}", 10), clock=lambda: clock[0])
+    assert manager.get_token() == "token-0"
+    manager.close()
+    clock[0] = 20.0
+    assert manager.get_token() == "token-1"
+    assert manager._timer is None
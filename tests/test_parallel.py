@@ -0,0 +1,90 @@
+import csv
+import json
+
+import pytest
+
+from lenden.parallel import run_parallel
+from train_model.valuation_classes import ServiceValuation
+
+FIELDS = ["category", "base_rate", "hours", "expertise_level", "demand_factor", "specialization"]
+
+
+def make_services(count):
+    rows = []
+    for i in range(count):
+        rows.append({"category": "consulting", "base_rate": 50 + i, "hours": 1 + i % 9, "expertise_level": 1.25,
+                     "demand_factor": 1.1, "specialization": 1.2 if i % 2 else 0.9})
+    rows[0]["hours"] = "several"  # The first row errors
+    rows[17]["specialization"] = 9  # Out of bounds
+    rows[30]["specialization"] = ""  # Factor columns are required
+    return rows
+
+
+def expected_value(row):
+    return ServiceValuation(row["category"], row["base_rate"], row["hours"], row["expertise_level"],
+                            row["demand_factor"], {"specialization": row["specialization"]}).calculate_valuation()
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_order_and_error_rows_across_chunks(tmp_path, workers):
+    rows = make_services(103)
+    source, output = tmp_path / "in.csv", tmp_path / "out.csv"
+    with open(source, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    progress = []
+    result = run_parallel("service", str(source), str(output), workers=workers, chunk_size=10,
+                          factor_columns=["specialization"], progress=lambda *args: progress.append(args))
+    assert result == (100, 3)
+    fields, results = read_csv(output)
+    assert fields == ["line"] + FIELDS + ["value", "error"]
+    assert [int(result["line"]) for result in results] == list(range(2, 105))
+    assert "hours" in results[0]["error"] and results[0]["value"] == ""
+    assert "specialization" in results[17]["error"]
+    assert results[30]["error"] == "missing field 'specialization'"
+    valued = [(result, row) for result, row in zip(results, rows) if not result["error"]]
+    assert [float(result["value"]) for result, _ in valued] == [expected_value(row) for _, row in valued]
+    assert [call[0] for call in progress] == list(range(10, 103, 10)) + [103, 103]
+    assert progress[-1][3] is True
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_jsonl_to_csv_header_when_the_first_row_errors(tmp_path, workers):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.csv"
+    lines = ["not json"] + [json.dumps({k: v for k, v in row.items() if k != "specialization"})
+                            for row in make_services(40)[1:]]
+    # An unparseable first row has no keys: the header still comes from the rows after it
+    source.write_text("\n".join(lines) + "\n")
+
+    assert run_parallel("service", str(source), str(output), workers=workers, chunk_size=4) == (39, 1)
+    fields, results = read_csv(output)
+    assert fields == ["line"] + FIELDS[:-1] + ["value", "error"]
+    assert [result["line"] for result in results] == [str(i) for i in range(1, 41)]
+    assert results[0]["error"].startswith("invalid JSON") and results[0]["category"] == ""
+    assert all(result["value"] and not result["error"] for result in results[1:])
+
+
+def test_products_in_parallel_match_in_process(tmp_path, model_path):
+    source = tmp_path / "in.jsonl"
+    records = [{"original_value": 100 + i, "years_used": i % 7, "uniqueness_score": 0.5, "preciousness_score": 0.2,
+                "market_trend_factor": 1.1, "category": "electronics"} for i in range(30)]
+    records[5]["years_used"] = None
+    source.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    outputs = []
+    for workers in (1, 3):
+        output = tmp_path / f"out{workers}.jsonl"
+        assert run_parallel("product", str(source), str(output), workers=workers, chunk_size=4,
+                            model_path=model_path) == (29, 1)
+        outputs.append([json.loads(line) for line in output.read_text().splitlines()])
+    assert outputs[0] == outputs[1]
+    assert [row["line"] for row in outputs[0]] == list(range(1, 31))
+    assert outputs[0][5]["error"] == "missing field 'years_used'"
@@ -0,0 +1,106 @@
+import pytest
+
+from benchmarks.stub_server import StubServer
+from math_based_approach.math_plus_api import AssetValuationUsingAPIs
+from math_based_approach.price_cache import MISSING, SQLiteCache, TTLCache, make_price_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def make(**options):
+        if request.param == "memory":
+            return TTLCache(**options)
+        return SQLiteCache(str(tmp_path / "prices.sqlite3"), **options)
+    return make
+
+
+def test_key_normalisation():
+    assert make_price_key("iPhone  12 ", "electronics") == make_price_key("iphone 12", "electronics")
+    assert make_price_key("iphone 12", "electronics") != make_price_key("iphone 12", None)
+
+
+def test_ttl_expiry(make_cache):
+    clock = Clock()
+    cache = make_cache(ttl=60, clock=clock)
+    cache.set("k", 199.5)
+    clock.now += 59
+    assert cache.get("k") == 199.5
+    clock.now += 2
+    assert cache.get("k") is MISSING
+    assert len(cache) == 0
+
+
+def test_negative_results_expire_sooner(make_cache):
+    clock = Clock()
+    cache = make_cache(ttl=3600, negative_ttl=300, clock=clock)
+    cache.set("nothing", None)
+    cache.set("price", 10.0)
+    assert cache.get("nothing") is None  # A cached miss, not a cache miss
+    clock.now += 301
+    assert cache.get("nothing") is MISSING
+    assert cache.get("price") == 10.0
+
+
+def test_lru_eviction(make_cache):
+    clock = Clock()
+    cache = make_cache(maxsize=3, clock=clock)
+    for key in "abc":
+        clock.now += 1
+        cache.set(key, 1.0)
+    clock.now += 1
+    cache.get("a")  # b is now the least recently used
+    clock.now += 1
+    cache.set("d", 1.0)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1.0 and cache.get("d") == 1.0
+
+
+def test_sqlite_evicts_in_batches(tmp_path):
+    clock = Clock()
+    cache = SQLiteCache(str(tmp_path / "prices.sqlite3"), maxsize=100, evict_batch=10, clock=clock)
+    for i in range(100):
+        clock.now += 1
+        cache.set(f"k{i}", float(i))
+    cache.set("k0", 0.0)  # Replacing a key doesn't count as growth
+    assert len(cache) == 100 and cache.evictions == 0
+    clock.now += 1
+    cache.set("new", 1.0)
+    assert len(cache) == 90 and cache.evictions == 11
+    assert cache.get("k0") == 0.0 and cache.get("new") == 1.0 and cache.get("k1") is MISSING
+
+
+def test_sqlite_persists_across_instances(tmp_path):
+    path = str(tmp_path / "prices.sqlite3")
+    first = SQLiteCache(path)
+    first.set("iphone", 215.0)
+    first.set("unknown", None)
+    second = SQLiteCache(path)
+    assert second.get("iphone") == 215.0
+    assert second.get("unknown") is None
+    assert len(second) == 2
+
+
+def test_valuator_serves_repeat_lookups_from_cache(tmp_path):
+    with StubServer() as stub:
+        cache = SQLiteCache(str(tmp_path / "prices.sqlite3"))
+        with stub.configure(AssetValuationUsingAPIs(price_cache=cache)) as valuator:
+            price = valuator.get_market_price("iphone 12", "electronics")
+            assert price is not None
+            assert valuator.get_market_price("iPhone  12", "electronics") == price
+            assert valuator.get_market_price("unknown gadget", "electronics") is None
+            assert valuator.get_market_price("unknown gadget", "electronics") is None
+        assert stub.counts["search"] == 2
+
+        # A new valuator on the same file starts warm
+        warm = SQLiteCache(str(tmp_path / "prices.sqlite3"))
+        with stub.configure(AssetValuationUsingAPIs(price_cache=warm)) as valuator:
+            assert valuator.get_market_price("iphone 12", "electronics") == price
+        assert stub.counts["search"] == 2
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from lenden.records import PRODUCT_FIELDS, SERVICE_FIELDS, ProductRecord, ServiceRecord, ValuationBatch
+from train_model.valuation_classes import ProductValuation, ServiceValuation
+
+
+def make_products(model_path):
+    return [
+        ProductValuation("electronics", 1000, 5, 0.7, 0.6, 1.2, {"brand_reputation": 1.1, "special_features": 1.05},
+                         model_path=model_path),
+        ProductValuation("furniture", 250.5, 2, 0.1, 0.0, 0.9, None, model_path=model_path),
+        ProductValuation("electronics", 80, 0, 0.0, 0.3, 1.0, {"special_features": 0.8, "brand_reputation": 1.3},
+                         model_path=model_path),
+        ProductValuation("general", 12345.67, 11, 1.0, 1.0, 1.5, {}, model_path=model_path),
+    ]
+
+
+def make_services():
+    return [
+        ServiceValuation("consulting", 100, 8, 1.4, 1.2, {"certification_bonus": 1.1}),
+        ServiceValuation("legal", 250, 3.5, 1.0, 0.9, None),
+        ServiceValuation("consulting", 99.99, 12, 1.7, 1.05, {"specialization": 1.2, "customer_ratings": 0.95}),
+    ]
+
+
+def assert_same(original, rebuilt, fields):
+    assert type(rebuilt) is type(original)
+    assert rebuilt.category == original.category
+    assert [getattr(rebuilt, name) for name in fields] == [getattr(original, name) for name in fields]
+    # Same factors in the same order; a None factor dict comes back empty
+    assert list(rebuilt.additional_factors.items()) == list((original.additional_factors or {}).items())
+    assert rebuilt.calculate_valuation() == original.calculate_valuation()
+
+
+def test_product_batch_round_trip(model_path):
+    products = make_products(model_path)
+    batch = ValuationBatch.from_valuations(products)
+    assert (batch.kind, len(batch), batch.categories) == ("product", 4, ["electronics", "furniture", "general"])
+    for original, rebuilt in zip(products, batch.to_valuations(model_path=model_path), strict=True):
+        assert_same(original, rebuilt, PRODUCT_FIELDS)
+
+
+def test_service_batch_round_trip():
+    services = make_services()
+    batch = ValuationBatch.from_valuations(services)
+    assert batch.kind == "service"
+    for original, rebuilt in zip(services, batch.to_valuations(), strict=True):
+        assert_same(original, rebuilt, SERVICE_FIELDS)
+
+
+def test_records_share_factor_name_tuples(model_path):
+    records = [ProductRecord.from_valuation(product) for product in make_products(model_path)]
+    assert records[1].factor_names == () and records[1].additional_factors == {}
+    batch = ValuationBatch.from_valuations(records)
+    assert batch[0] == records[0] and batch[-1] == records[-1]
+    assert batch[0].factor_names is ProductRecord.from_valuation(make_products(model_path)[0]).factor_names
+    with pytest.raises(IndexError):
+        batch[len(batch)]
+
+
+def test_product_valuations_match_scalar_path(model_path, category_defaults):
+    products = make_products(model_path)
+    batch = ValuationBatch.from_valuations(products)
+    expected = [product.calculate_valuation() for product in products]
+    assert batch.valuations(model_path=model_path).tolist() == expected
+
+
+def test_service_valuations_match_scalar_path(category_defaults):
+    services = make_services()
+    batch = ValuationBatch.from_valuations(ServiceRecord.from_valuation(service) for service in services)
+    assert batch.valuations().tolist() == [service.calculate_valuation() for service in services]
+
+
+def test_empty_batch():
+    batch = ValuationBatch.from_valuations([], kind="service")
+    assert len(batch) == 0 and list(batch) == []
+    assert batch.valuations().shape == (0,)
+    assert np.array_equal(batch.factor_offsets, [0])
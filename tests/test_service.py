@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+import pytest
+
+from lenden.service import ValuationApp
+
+ASSET = {"product_name": "printer", "valuation_method": "depreciate", "years": 2, "initial_cost": 1000,
+         "salvage_percentage": 10, "depreciation_method": "declining", "useful_life": 8}
+PRODUCT = {"category": "electronics", "original_value": 1000, "years_used": 5, "uniqueness_score": 0.7,
+           "preciousness_score": 0.6, "market_trend_factor": 1.2, "additional_factors": {"brand_reputation": 1.1}}
+SERVICE = {"category": "consulting", "base_rate": 100, "hours": 8, "expertise_level": 1.4, "demand_factor": 1.2,
+           "additional_factors": {"certification_bonus": 1.1}}
+
+
+@pytest.fixture
+def app(model_path):
+    app = ValuationApp(model_path, chunk_size=2, max_pending_chunks=2, threads=4)
+    app.startup()
+    app.api.value_record = lambda record, adjust_inflation: 123.45  # No eBay lookups from the tests
+    yield app
+    app.shutdown()
+
+
+def call(app, path, bodies=(b"",), method="POST", query=b""):
+    """Drive one request through the ASGI app -> (status, response body)"""
+    messages = [{"type": "http.request", "body": body, "more_body": i < len(bodies) - 1}
+                for i, body in enumerate(bodies)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "method": method, "query_string": query}
+    asyncio.run(app(scope, receive, send))
+    status, = [message["status"] for message in sent if message["type"] == "http.response.start"]
+    assert not sent[-1].get("more_body")  # The response is always finished
+    return status, b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+
+
+def post_json(app, path, record):
+    status, body = call(app, path, [json.dumps(record).encode()])
+    return status, json.loads(body)
+
+
+def ndjson(records):
+    return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+def test_single_endpoints(app):
+    from math_based_approach.math_valuation import value_asset_record
+    from train_model.valuation_classes import ProductValuation, ServiceValuation
+
+    product = {key: value for key, value in PRODUCT.items() if key not in ("category", "additional_factors")}
+    expected = ProductValuation("electronics", **product, additional_factors={"brand_reputation": 1.1},
+                                model_path=app.model_path).calculate_valuation()
+    assert post_json(app, "/value/product", PRODUCT) == (200, {"value": expected})
+    service = {key: value for key, value in SERVICE.items() if key not in ("category", "additional_factors")}
+    expected = ServiceValuation("consulting", **service, additional_factors={"certification_bonus": 1.1})
+    assert post_json(app, "/value/service", SERVICE) == (200, {"value": expected.calculate_valuation()})
+    assert post_json(app, "/value/asset", ASSET) == (200, {"value": value_asset_record(ASSET)})
+    assert post_json(app, "/value/api", {"product_name": "camera"}) == (200, {"value": 123.45})
+
+
+def test_get_endpoints(app):
+    status, body = call(app, "/healthz", method="GET")
+    assert (status, json.loads(body)) == (200, {"status": "ok", "model": app.model_path})
+    status, body = call(app, "/metrics", method="GET")
+    assert status == 200
+
+
+def test_routing_errors(app):
+    assert call(app, "/nope")[0] == 404
+    assert call(app, "/healthz")[0] == 405
+    assert call(app, "/value/product", method="GET")[0] == 405
+
+
+@pytest.mark.parametrize("path, record, message", [
+    ("/value/product", dict(PRODUCT, additional_factors={"made_up": 1.1}), "unknown factor 'made_up'"),
+    ("/value/service", dict(SERVICE, additional_factors={"brand_reputation": 9}), "brand_reputation"),
+    ("/value/service", dict(SERVICE, hours="lots"), "hours"),
+    ("/value/product", dict(PRODUCT, additional_factors=[1.1]), "additional_factors"),
+])
+def test_bad_fields_are_400(app, path, record, message):
+    status, body = post_json(app, path, record)
+    assert status == 400 and message in body["error"]
+
+
+def test_invalid_json_is_400(app):
+    status, body = call(app, "/value/service", [b'{"base_rate": '])
+    assert status == 400 and "invalid JSON" in json.loads(body)["error"]
+    status, body = call(app, "/value/service", [b"[1, 2]"])
+    assert status == 400 and "JSON object" in json.loads(body)["error"]
+
+
+def test_batch_keeps_input_order_and_writes_error_rows(app):
+    from math_based_approach.math_valuation import value_asset_record
+
+    records = [dict(ASSET, years=years) for years in range(7)]
+    body = ndjson(records[:3]) + b"oops\n" + ndjson(records[3:])
+    # Split mid-line, so records arrive across several messages
+    status, response = call(app, "/value/batch", [body[:50], body[50:200], body[200:]], query=b"kind=asset")
+
+    assert status == 200
+    rows = [json.loads(line) for line in response.decode().splitlines()]
+    assert [row["line"] for row in rows] == list(range(1, 9))
+    assert rows[3]["error"].startswith("invalid JSON") and rows[3]["value"] == ""
+    valued = rows[:3] + rows[4:]
+    assert [row["value"] for row in valued] == [value_asset_record(record) for record in records]
+    assert all(row["error"] == "" for row in valued)
+
+
+def test_batch_products_with_factor_columns(app):
+    from train_model.valuation_classes import ProductValuation
+
+    product = {key: value for key, value in PRODUCT.items() if key != "additional_factors"}
+    records = [dict(product, brand_reputation=1.5), product, dict(product, brand_reputation=7)]
+    status, response = call(app, "/value/batch", [ndjson(records)], query=b"kind=product&factor=brand_reputation")
+    rows = [json.loads(line) for line in response.decode().splitlines()]
+    assert status == 200 and [row["line"] for row in rows] == [1, 2, 3]
+
+    args = [product[name] for name in ("original_value", "years_used", "uniqueness_score", "preciousness_score",
+                                       "market_trend_factor")]
+    expected = ProductValuation("electronics", *args, {"brand_reputation": 1.5}, model_path=app.model_path)
+    assert (rows[0]["value"], rows[0]["error"]) == (expected.calculate_valuation(), "")
+    assert rows[1]["error"] == "missing field 'brand_reputation'"  # Factor columns are required in every row
+    assert "brand_reputation" in rows[2]["error"] and rows[2]["value"] == ""  # Out of bounds
+
+
+@pytest.mark.parametrize("query, message", [
+    (b"kind=service&factor=made_up", "unknown factor 'made_up'"),
+    (b"kind=sculpture", "unknown kind"),
+])
+def test_batch_rejects_bad_parameters_before_streaming(app, query, message):
+    status, body = call(app, "/value/batch", [ndjson([SERVICE])], query=query)
+    assert status == 400 and message in json.loads(body)["error"]
+
+
+def test_batch_failing_midway_ends_with_an_error_row(app):
+    chunk_valuer = app._chunk_valuer
+
+    def failing_chunk_valuer(kind, factor_columns):
+        value_chunk = chunk_valuer(kind, factor_columns)
+        calls = []
+
+        def value(chunk):
+            calls.append(chunk)
+            if len(calls) == 2:
+                raise RuntimeError("worker died")
+            return value_chunk(chunk)
+        return value
+
+    app._chunk_valuer = failing_chunk_valuer
+    status, response = call(app, "/value/batch", [ndjson([ASSET] * 6)], query=b"kind=asset")
+    rows = [json.loads(line) for line in response.decode().splitlines()]
+    assert status == 200
+    assert [row["line"] for row in rows[:2]] == [1, 2]  # The first chunk went out before the failure
+    assert rows[-1] == {"error": "RuntimeError: worker died"}
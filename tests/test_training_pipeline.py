@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from train_model.flat_forest import FlatForest
+from train_model.model_training import FEATURES, TARGET
+from train_model.training_pipeline import category_dir_name, load_category_model, train_category_models
+
+
+def make_data(path, rows_by_category, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for category, rows in rows_by_category.items():
+        frame = pd.DataFrame(rng.random((rows, len(FEATURES))), columns=FEATURES)
+        frame[TARGET] = 0.05 + 0.1 * frame["uniqueness"]
+        frame["category"] = category
+        frames.append(frame)
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
+
+
+def test_train_retrain_and_skip(tmp_path):
+    data_path = tmp_path / "history.csv"
+    output_dir = str(tmp_path / "models")
+    make_data(data_path, {"a/b": 20, "a b": 20, "tiny": 3, "..": 15})
+
+    manifest = train_category_models(data_path, output_dir, n_jobs=1)
+    entries = manifest["categories"]
+    assert sorted(entries) == ["a b", "a/b"]
+    assert manifest["skipped"]["tiny"] == "3 rows, need at least 10"
+    assert "can't name a model directory" in manifest["skipped"][".."]
+    # Same sanitised name, different directories
+    assert os.path.dirname(entries["a/b"]["artifact"]) != os.path.dirname(entries["a b"]["artifact"])
+    assert all(entry["version"] == 1 and entry["rows"] == 20 for entry in entries.values())
+    assert isinstance(load_category_model("a/b", output_dir, flat=True), FlatForest)
+
+    # Unchanged data (here: reordered rows) keeps every model as it was
+    pd.read_csv(data_path, float_precision="round_trip").iloc[::-1].to_csv(data_path, index=False)
+    assert train_category_models(data_path, output_dir, n_jobs=1)["categories"] == entries
+
+    # Changing one category retrains only that one
+    make_data(data_path, {"a/b": 20, "a b": 25, "tiny": 3, "..": 15})
+    retrained = train_category_models(data_path, output_dir, n_jobs=1)["categories"]
+    assert retrained["a/b"] == entries["a/b"]
+    assert (retrained["a b"]["version"], retrained["a b"]["rows"]) == (2, 25)
+    assert retrained["a b"]["artifact"].endswith("v2.pkl")
+
+    # min_rows is a parameter; force retrains everything
+    forced = train_category_models(data_path, output_dir, n_jobs=1, force=True, min_rows=3)
+    assert forced["categories"]["tiny"]["version"] == 1
+    assert forced["categories"]["a/b"]["version"] == 2
+
+
+@pytest.mark.parametrize("category", [".", "..", " ", ". ."])
+def test_unusable_category_names(category):
+    with pytest.raises(ValueError):
+        category_dir_name(category)
+
+
+def test_category_dir_names():
+    assert category_dir_name("a/b") != category_dir_name("a b")
+    assert category_dir_name("a/b").startswith("a_b-")
+    assert category_dir_name("héllo").startswith("h_llo-")
+    assert category_dir_name("???").startswith("category-")
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse
+
+from math_based_approach.factors import factor_registry
+from math_based_approach.vectorized_valuation import round_cents
+from train_model.valuation_classes import (PRODUCT_FEATURES, ProductValuation, ServiceValuation, price_services,
+                                           price_services_stream, value_products)
+
+PRODUCT_FACTORS = ["brand_reputation", "special_features"]
+
+
+def make_products(count, seed=1):
+    rng = np.random.default_rng(seed)
+    products = pd.DataFrame({
+        "category": rng.choice(["electronics", "furniture", "general"], count),
+        "original_value": rng.integers(10, 100_000, count) / rng.choice([1, 10, 100], count),
+        "years_used": rng.integers(0, 12, count),
+        "uniqueness_score": rng.random(count).round(2),
+        "preciousness_score": rng.random(count).round(2),
+        "market_trend_factor": rng.uniform(0.8, 1.5, count).round(2),
+    })
+    for name in PRODUCT_FACTORS:
+        values = rng.uniform(0.5, 2.0, count).round(2)
+        products[name] = np.where(rng.random(count) < 0.5, values, np.nan)  # NaN = factor not set
+    return products
+
+
+def scalar_valuations(products, model_path):
+    values = []
+    for row in products.to_dict("records"):
+        factors = {name: row[name] for name in PRODUCT_FACTORS if not np.isnan(row[name])}
+        product = ProductValuation(row["category"], row["original_value"], row["years_used"], row["uniqueness_score"],
+                                   row["preciousness_score"], row["market_trend_factor"], factors, model_path=model_path)
+        values.append(product.calculate_valuation())
+    return values
+
+
+@pytest.mark.usefixtures("category_defaults")
+def test_value_products_matches_scalar_path(model_path):
+    products = make_products(500)
+    batch = value_products(products, PRODUCT_FACTORS, model_path=model_path)
+    assert batch.tolist() == scalar_valuations(products, model_path)
+
+
+def test_value_products_with_a_factor_matrix(model_path):
+    products = make_products(100, seed=2)
+    factors = factor_registry.table_matrix(products, PRODUCT_FACTORS)
+    by_matrix = value_products(products[PRODUCT_FEATURES + ["original_value"]], factors=factors, model_path=model_path)
+    without_categories = products.drop(columns="category")
+    assert by_matrix.tolist() == value_products(without_categories, PRODUCT_FACTORS, model_path=model_path).tolist()
+    with pytest.raises(ValueError):
+        value_products(products, PRODUCT_FACTORS, model_path=model_path, factors=factors)
+
+
+SERVICE_FACTORS = ["certification_bonus", "specialization"]
+
+
+@pytest.mark.parametrize("value", [1035.455, 5634.685, 0.125, 2.675, -1.005, 1e15 + 0.5, 12.5, 0.0])
+def test_round_cents_matches_round(value):
+    assert round_cents([value]).tolist() == [round(value, 2)]
+
+
+def test_round_cents_on_many_halves():
+    values = np.arange(0, 1_000_000, 7) / 1000 + 0.005
+    assert round_cents(values).tolist() == [round(value, 2) for value in values.tolist()]
+    assert round_cents([np.inf, np.nan])[0] == np.inf
+
+
+def make_services(count, seed=3):
+    rng = np.random.default_rng(seed)
+    services = pd.DataFrame({
+        "id": np.arange(count) + 1000,
+        "category": rng.choice(["consulting", "legal", "general"], count),
+        "base_rate": rng.integers(1000, 50_000, count) / 100,
+        "hours": rng.integers(1, 80, count) / rng.choice([1, 2, 4], count),
+        "expertise_level": rng.uniform(0.8, 2.0, count).round(3),
+        "demand_factor": rng.uniform(0.7, 1.6, count).round(3),
+    })
+    for name in SERVICE_FACTORS:
+        values = rng.uniform(0.5, 2.0, count).round(2)
+        services[name] = np.where(rng.random(count) < 0.4, values, np.nan)
+    return services
+
+
+def scalar_service_valuations(services):
+    values = []
+    for row in services.to_dict("records"):
+        factors = {name: row[name] for name in SERVICE_FACTORS if not np.isnan(row[name])}
+        service = ServiceValuation(row["category"], row["base_rate"], row["hours"], row["expertise_level"],
+                                   row["demand_factor"], factors)
+        values.append(service.calculate_valuation())
+    return values
+
+
+@pytest.mark.usefixtures("category_defaults")
+@pytest.mark.parametrize("sparse", [False, True])
+def test_price_services_matches_scalar_path(sparse):
+    factor_registry.set_category_defaults("consulting", {"certification_bonus": 1.1, "customer_ratings": 1.02})
+    services = make_services(1000)
+    factors = factor_registry.table_matrix(services, SERVICE_FACTORS)
+    if sparse:
+        factors = scipy.sparse.csr_matrix(np.nan_to_num(factors, nan=0.0))
+    batch = price_services(services["base_rate"], services["hours"], services["expertise_level"],
+                           services["demand_factor"], factors, services["category"])
+    assert batch.tolist() == scalar_service_valuations(services)
+
+
+def test_stream_applies_only_factor_columns(tmp_path):
+    services = make_services(250, seed=4)
+    path = tmp_path / "services.csv"
+    services.to_csv(path, index=False)
+
+    chunks = list(price_services_stream(str(path), chunksize=100, factor_columns=SERVICE_FACTORS))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    streamed = pd.concat(chunks, ignore_index=True)
+    # The numeric id column is carried through untouched and not taken for a factor
+    assert streamed["id"].tolist() == services["id"].tolist()
+    assert streamed["valuation"].tolist() == scalar_service_valuations(services)
@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from math_based_approach.instrumentation import stage
+
+_STOP = object()
+
+
+class BatchPredictor:
+    """
+    In-process micro-batching in front of a model's predict().
+
+    Threads submit single feature rows and get a Future back. A worker thread
+    collects queued rows until it has `max_batch_size` of them or `max_delay`
+    seconds have passed since the first one arrived, runs one batched
+    model.predict, and resolves each caller's future with its own row.
+    Rows are checked at submit, so one bad row can't fail a whole batch.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_delay=0.002):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batches = 0
+        self.rows = 0
+        # sklearn models and FlatForest both know their input width
+        self.n_features = getattr(model, "n_features_in_", getattr(model, "n_features", None))
+        self._closed = False
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="batch-predictor", daemon=True)
+        self._worker.start()
+
+    def submit(self, features):
+        """Queue one feature row; the Future resolves to its prediction"""
+        row = np.asarray(features, dtype=float)  # ValueError/TypeError for non-numeric rows
+        if row.ndim != 1 or (self.n_features is not None and len(row) != self.n_features):
+            raise ValueError(f"expected one row of {self.n_features or 'n'} features, got shape {row.shape}")
+        if not np.isfinite(row).all():
+            raise ValueError(f"features must be finite numbers, got {features!r}")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchPredictor is closed")
+            self._queue.put((row, future))
+        return future
+
+    def predict(self, features, timeout=None):
+        """Blocking single-row predict that rides along in the next batch"""
+        return self.submit(features).result(timeout)
+
+    def close(self):
+        """Predict what is already queued, then stop; submit() raises RuntimeError afterwards"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)  # Finish this batch first, stop on the next loop
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [item for item in self._collect(first) if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                with stage("predict_batch"):
+                    predictions = self.model.predict(np.stack([features for features, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
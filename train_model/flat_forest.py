@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class FlatForest:
+    """
+    A tree ensemble flattened into contiguous NumPy arrays.
+
+    All trees share one node table (feature, threshold, left, right, value);
+    `roots` holds each tree's first node. Leaves point to themselves, so
+    prediction is at most `max_depth` rounds of one vectorised step over every
+    (tree, row) pair still on an internal node -- no sklearn needed at serving time.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.value, self.roots))
+
+    def predict(self, X):
+        # sklearn evaluates splits on float32 features; doing the same keeps predictions identical
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        n_rows = len(X)
+        flat_X = X.ravel()
+        # One cursor per (tree, row) pair; only pairs still on an internal node get advanced
+        node = np.repeat(self.roots, n_rows)
+        row_offset = np.tile(np.arange(n_rows) * X.shape[1], len(self.roots))
+        active = np.arange(node.size)
+        while active.size:
+            current = node[active]
+            go_left = flat_X[row_offset[active] + self.feature[current]] <= self.threshold[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            active = active[self.left[current] != current]
+        return self.value[node].reshape(len(self.roots), n_rows).sum(axis=0) / len(self.roots)
+
+    def save(self, path):
+        np.savez(
+            path, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            value=self.value, roots=self.roots, max_depth=self.max_depth, n_features=self.n_features
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls(**{name: arrays[name] for name in arrays.files})
+
+
+def export_forest(model):
+    """
+    Flatten a fitted sklearn forest regressor (RandomForestRegressor,
+    ExtraTreesRegressor, ...) into a FlatForest. Only reads `estimators_`
+    and each `tree_`, so it doesn't import sklearn itself.
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        own = np.arange(tree.node_count)
+        leaf = tree.children_left == -1
+        # Leaves loop back onto themselves; their feature/threshold are never acted on
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(leaf, own, tree.children_left) + offset)
+        rights.append(np.where(leaf, own, tree.children_right) + offset)
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    return FlatForest(
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.int32),
+        right=np.concatenate(rights).astype(np.int32),
+        value=np.concatenate(values).astype(np.float64),
+        roots=np.array(roots, dtype=np.int32),
+        max_depth=max_depth,
+        n_features=model.n_features_in_,
+    )
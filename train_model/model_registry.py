@@ -0,0 +1,69 @@
+import os
+import threading
+
+import joblib
+
+from math_based_approach.instrumentation import stage
+from train_model.flat_forest import FlatForest
+
+
+class ModelRegistry:
+    """Process-wide cache of unpickled models, keyed by path and file signature"""
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path):
+        # mtime + size is enough to notice a re-dumped pickle without hashing it
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path, mmap_mode=None):
+        """
+        Return the shared model stored at `path`, loading it on first use.
+
+        The model is reloaded transparently when the file on disk changes.
+        With mmap_mode="r" the numpy arrays inside the pickle are memory-mapped,
+        so forked workers share the same pages instead of holding a copy each.
+        A .npz path is read as a FlatForest export, which needs no sklearn.
+        """
+        path = os.path.abspath(path)
+        key = (path, mmap_mode)
+        signature = self._signature(path)
+
+        entry = self._models.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        with self._lock:
+            # Another thread may have loaded it while we were waiting
+            entry = self._models.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            with stage("model_load"):
+                if path.endswith(".npz"):
+                    model = FlatForest.load(path)
+                else:
+                    model = joblib.load(path, mmap_mode=mmap_mode)
+            self._models[key] = (signature, model)
+            return model
+
+    def evict(self, path=None):
+        """Drop one cached model (or all of them when no path is given)"""
+        with self._lock:
+            if path is None:
+                self._models.clear()
+                return
+            path = os.path.abspath(path)
+            for key in [k for k in self._models if k[0] == path]:
+                del self._models[key]
+
+
+registry = ModelRegistry()
+
+
+def load_model(path="depreciation_model.pkl", mmap_mode=None):
+    """Shortcut for the process-wide registry"""
+    return registry.get(path, mmap_mode=mmap_mode)
@@ -5,6 +5,23 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
 import joblib
 
+from train_model.flat_forest import export_forest
+
+FEATURES = ["uniqueness", "preciousness", "market_trend", "age"]
+TARGET = "depreciation_rate"
+
+
+def fit_depreciation_model(X, y, n_estimators=100, random_state=42):
+    """Fit one depreciation forest on a hold-out split; returns (model, test MSE)"""
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=random_state)
+    model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+    return model, mean_squared_error(y_test, y_pred)
+
+
 def train_depreciation_model():
     data = {
         "uniqueness": np.random.uniform(0, 1, 1000),
@@ -15,19 +32,15 @@ def train_depreciation_model():
     }
 
     df = pd.DataFrame(data)
-    X = df[["uniqueness", "preciousness", "market_trend", "age"]]
-    y = df["depreciation_rate"]
-
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X = df[FEATURES]
+    y = df[TARGET]
 
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_train, y_train)
-
-    y_pred = model.predict(X_test)
-    mse = mean_squared_error(y_test, y_pred)
+    model, mse = fit_depreciation_model(X, y)
     print(f"Trained depreciation model with MSE: {mse}")
 
     joblib.dump(model, "depreciation_model.pkl")
+    # Flattened copy for serving without sklearn (load it with FlatForest.load / load_model)
+    export_forest(model).save("depreciation_model.npz")
 
 # Uncomment the line below to train and save the model
 # train_depreciation_model()
\ No newline at end of file
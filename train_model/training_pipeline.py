@@ -0,0 +1,169 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from train_model.flat_forest import export_forest
+from train_model.model_registry import load_model
+from train_model.model_training import FEATURES, TARGET, fit_depreciation_model
+
+MANIFEST_NAME = "manifest.json"
+MIN_ROWS = 10  # Fewer rows leave nothing meaningful for the 20% hold-out split
+
+
+def load_dataset(path):
+    """Historical depreciation data from CSV or Parquet"""
+    if str(path).endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    # round_trip keeps re-exported files hashing the same as the original
+    return pd.read_csv(path, float_precision="round_trip")
+
+
+def data_fingerprint(df):
+    """Content hash of the training columns; row order does not matter"""
+    row_hashes = pd.util.hash_pandas_object(df[FEATURES + [TARGET]], index=False).to_numpy()
+    return hashlib.sha256(np.sort(row_hashes).tobytes()).hexdigest()
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"categories": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def category_dir_name(category):
+    """
+    Directory for a category's artifacts: the category made filesystem-safe
+    plus a short hash of the original, so "a/b" and "a b" don't share one.
+    """
+    if not category.strip(". "):
+        raise ValueError(f"category {category!r} can't name a model directory")
+    safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", category).strip("_") or "category"
+    return f"{safe_name}-{hashlib.sha256(category.encode()).hexdigest()[:8]}"
+
+
+def _train_category(category, X, y, artifact_path):
+    # Runs in a worker process: fit, then write the pickle and its flattened twin
+    model, mse = fit_depreciation_model(X, y)
+    os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+    joblib.dump(model, artifact_path)
+    flat_path = artifact_path[:-len(".pkl")] + ".npz"
+    export_forest(model).save(flat_path)
+    return category, mse, flat_path
+
+
+def train_category_models(data_path, output_dir="models", category_column="category", n_jobs=None, force=False,
+                          min_rows=MIN_ROWS):
+    """
+    Train one depreciation model per category, in parallel across processes.
+
+    Each category's rows are content-hashed and compared with the manifest from
+    the previous run; only categories whose data changed (or that are new) are
+    retrained, unless `force` is set. Artifacts are versioned as
+    <output_dir>/<category dir>/v<N>.pkl (+ .npz) and recorded in manifest.json.
+    Categories with fewer than `min_rows` rows, an unusable name or a failed
+    fit are listed under "skipped" (keeping any earlier model) instead of
+    stopping the run. Returns the updated manifest.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    entries = manifest["categories"]
+    skipped = manifest["skipped"] = {}
+    df = load_dataset(data_path)
+
+    jobs = []
+    for category, group in df.groupby(category_column, sort=True):
+        category = str(category)
+        if len(group) < min_rows:
+            skipped[category] = f"{len(group)} rows, need at least {min_rows}"
+            continue
+        fingerprint = data_fingerprint(group)
+        previous = entries.get(category)
+        if not force and previous is not None and previous["data_hash"] == fingerprint:
+            continue
+        try:
+            artifact_dir = category_dir_name(category)
+        except ValueError as e:
+            skipped[category] = str(e)
+            continue
+        version = previous["version"] + 1 if previous else 1
+        artifact_path = os.path.join(output_dir, artifact_dir, f"v{version}.pkl")
+        jobs.append((category, group[FEATURES], group[TARGET], artifact_path, fingerprint, version, len(group)))
+
+    for category, reason in skipped.items():
+        print(f"Skipped {category}: {reason}")
+    if not jobs:
+        print("All category models are up to date")
+        _save_manifest(output_dir, manifest)
+        return manifest
+
+    if n_jobs == 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append(_train_category(*job[:4]))
+            except Exception as e:
+                results.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [pool.submit(_train_category, *job[:4]) for job in jobs]
+            results = [future.exception() or future.result() for future in futures]
+
+    trained_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for job, result in zip(jobs, results):
+        category, _, _, artifact_path, fingerprint, version, rows = job
+        if isinstance(result, Exception):
+            skipped[category] = f"training failed: {type(result).__name__}: {result}"
+            print(f"Skipped {category}: {skipped[category]}")
+            continue
+        _, mse, flat_path = result
+        entries[category] = {
+            "version": version,
+            "data_hash": fingerprint,
+            "rows": rows,
+            "mse": mse,
+            "artifact": os.path.relpath(artifact_path, output_dir),
+            "flat_artifact": os.path.relpath(flat_path, output_dir),
+            "trained_at": trained_at,
+        }
+        print(f"Trained {category} v{version} on {rows} rows, MSE: {mse}")
+
+    _save_manifest(output_dir, manifest)
+    return manifest
+
+
+def load_category_model(category, output_dir="models", flat=False, mmap_mode=None):
+    """Latest model for `category` from the manifest, via the shared model registry"""
+    entry = load_manifest(output_dir)["categories"][category]
+    artifact = entry["flat_artifact"] if flat else entry["artifact"]
+    return load_model(os.path.join(output_dir, artifact), mmap_mode=mmap_mode)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train per-category depreciation models")
+    parser.add_argument("data_path", help="CSV or Parquet with a category column plus features and target")
+    parser.add_argument("--output-dir", default="models")
+    parser.add_argument("--category-column", default="category")
+    parser.add_argument("--n-jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="retrain every category")
+    parser.add_argument("--min-rows", type=int, default=MIN_ROWS, help="skip categories with fewer rows")
+    args = parser.parse_args()
+    train_category_models(args.data_path, args.output_dir, args.category_column, args.n_jobs, args.force,
+                          args.min_rows)
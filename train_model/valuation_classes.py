@@ -1,7 +1,14 @@
+import numpy as np
 import requests
 
+from math_based_approach.bulk import optional_text, require_number
+from math_based_approach.factors import factor_registry
+from math_based_approach.instrumentation import stage, timed
+from math_based_approach.vectorized_valuation import round_cents
+from train_model.model_registry import load_model
+
 class ProductValuation:
-    def __init__(self, category, original_value, years_used, uniqueness_score, preciousness_score, market_trend_factor, additional_factors=None):
+    def __init__(self, category, original_value, years_used, uniqueness_score, preciousness_score, market_trend_factor, additional_factors=None, model_path="depreciation_model.pkl", mmap_mode=None, predictor=None):
         self.original_value = original_value
         self.years_used = years_used
         self.uniqueness_score = uniqueness_score
@@ -9,9 +16,17 @@ class ProductValuation:
         self.market_trend_factor = market_trend_factor
         self.category = category
         self.additional_factors = additional_factors or {}
-        self.model = joblib.load("depreciation_model.pkl")
-
+        # Validated and collapsed once here, with the category defaults -> one multiply per valuation
+        self.factor_multiplier = factor_registry.multiplier(self.additional_factors, category)
+        # Optional BatchPredictor: concurrent valuations then share batched predict calls (and its model)
+        self.predictor = predictor
+        # Shared handle from the process-wide registry -> the pickle is only read once
+        self.model = predictor.model if predictor is not None else load_model(model_path, mmap_mode=mmap_mode)
+
+    @timed("predict")
     def predict_depreciation_rate(self):
+        if self.predictor is not None:
+            return self.predictor.predict([self.uniqueness_score, self.preciousness_score, self.market_trend_factor, self.years_used])
         input_features = np.array([[self.uniqueness_score, self.preciousness_score, self.market_trend_factor, self.years_used]])
         return self.model.predict(input_features)[0]
 
@@ -22,13 +37,55 @@ class ProductValuation:
         with_preciousness = with_uniqueness * (1 + self.preciousness_score * 0.3)
         with_market_trend = with_preciousness * self.market_trend_factor
 
-        final_value = with_market_trend
-        for factor, multiplier in self.additional_factors.items():
-            final_value *= multiplier
-
+        final_value = with_market_trend * self.factor_multiplier
         return round(final_value, 2)
 
 
+PRODUCT_FEATURES = ["uniqueness_score", "preciousness_score", "market_trend_factor", "years_used"]
+
+
+def value_products(products, factor_columns=(), model=None, model_path="depreciation_model.pkl", mmap_mode=None,
+                   factors=None):
+    """
+    Batched ProductValuation.calculate_valuation over a whole inventory.
+
+    `products` is a DataFrame (or dict of arrays) with the ProductValuation
+    fields as columns, and optionally a category column for category default
+    factors. Additional factors come either from `factor_columns`, extra
+    columns named after registered factors (NaN = not set), or from a
+    `factors` matrix as taken by price_services.
+    Makes one model.predict call for all rows and returns a float array
+    that matches the scalar path row for row.
+    """
+    if factor_columns:
+        if factors is not None:
+            raise ValueError("pass factor_columns or a factors matrix, not both")
+        factors = factor_registry.table_matrix(products, list(factor_columns))
+    categories = products["category"] if "category" in products else None
+    if model is None:
+        model = load_model(model_path, mmap_mode=mmap_mode)
+
+    original_value = np.asarray(products["original_value"], dtype=float)
+    years_used = np.asarray(products["years_used"], dtype=float)
+    uniqueness = np.asarray(products["uniqueness_score"], dtype=float)
+    preciousness = np.asarray(products["preciousness_score"], dtype=float)
+    market_trend = np.asarray(products["market_trend_factor"], dtype=float)
+
+    input_features = np.column_stack([uniqueness, preciousness, market_trend, years_used])
+    with stage("predict_batch"):
+        # sklearn rejects zero-row input; an empty inventory just values to an empty array
+        depreciation_rate = model.predict(input_features) if len(input_features) else np.empty(0)
+
+    # Same chain (and same operation order) as calculate_valuation
+    depreciated_value = original_value * (1 - depreciation_rate) ** years_used
+    with_uniqueness = depreciated_value * (1 + uniqueness * 0.5)
+    with_preciousness = with_uniqueness * (1 + preciousness * 0.3)
+    final_value = with_preciousness * market_trend
+    final_value = apply_factor_matrix(final_value, factors, categories)
+
+    return round_cents(final_value)  # Same cents as the scalar round(final_value, 2)
+
+
 class ServiceValuation:
     def __init__(self, category, base_rate, hours, expertise_level, demand_factor, additional_factors=None):
         self.base_rate = base_rate
@@ -37,19 +94,93 @@ class ServiceValuation:
         self.demand_factor = demand_factor
         self.category = category
         self.additional_factors = additional_factors or {}
+        self.factor_multiplier = factor_registry.multiplier(self.additional_factors, category)
 
     def calculate_valuation(self):
         base_value = self.base_rate * self.hours
         with_expertise = base_value * self.expertise_level
         with_demand = with_expertise * self.demand_factor
 
-        final_value = with_demand
-        for factor, multiplier in self.additional_factors.items():
-            final_value *= multiplier
-
+        final_value = with_demand * self.factor_multiplier
         return round(final_value, 2)
 
 
+SERVICE_COLUMNS = ["base_rate", "hours", "expertise_level", "demand_factor"]
+
+
+def value_service_record(record, factor_columns=()):
+    """
+    ServiceValuation for one bulk input row: the SERVICE_COLUMNS, an optional
+    category, and `factor_columns` applied as additional_factors.
+    """
+    base_rate, hours, expertise_level, demand_factor = (require_number(record, name) for name in SERVICE_COLUMNS)
+    factors = {name: require_number(record, name) for name in factor_columns}
+    service = ServiceValuation(
+        optional_text(record, "category", "general"), base_rate, hours, expertise_level, demand_factor, factors
+    )
+    return service.calculate_valuation()
+
+
+def apply_factor_matrix(final_value, factors=None, categories=None):
+    """
+    Multiply in a factor matrix whose columns are factor_registry's factors
+    (scipy.sparse, or dense with NaN for unset) plus the defaults of each row's
+    category: one vectorised multiplier per row, like factor_multiplier.
+    """
+    if factors is None and categories is None:
+        return final_value
+    return final_value * factor_registry.multipliers(factors, categories, size=len(final_value))
+
+
+def price_services(base_rate, hours, expertise_level, demand_factor, factors=None, categories=None):
+    """
+    Columnar ServiceValuation.calculate_valuation.
+
+    Takes equal-length arrays of rates, hours, expertise and demand plus an
+    optional factor matrix (columns = factor_registry factors; scipy.sparse,
+    or dense with NaN for missing factors, see factor_registry.factor_matrix)
+    and the rows' categories for category defaults, and prices the whole
+    batch in one pass.
+    """
+    base_rate = np.asarray(base_rate, dtype=float)
+    final_value = base_rate * np.asarray(hours, dtype=float)
+    final_value = final_value * np.asarray(expertise_level, dtype=float)
+    final_value = final_value * np.asarray(demand_factor, dtype=float)
+
+    final_value = apply_factor_matrix(final_value, factors, categories)
+
+    return round_cents(final_value)  # Same cents as the scalar round(final_value, 2)
+
+
+def _iter_service_chunks(path, chunksize):
+    if str(path).endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def price_services_stream(path, chunksize=100_000, factor_columns=()):
+    """
+    Price a CSV/Parquet file of engagements chunk by chunk with bounded memory.
+
+    `factor_columns` are applied as additional factors (empty cells = no
+    factor), like value_products; other columns (ids, notes, ...) are left
+    alone. A `category` column picks up category defaults. Yields each chunk
+    with a `valuation` column added.
+    """
+    factor_columns = list(factor_columns)
+    for chunk in _iter_service_chunks(path, chunksize):
+        factors = factor_registry.table_matrix(chunk, factor_columns) if factor_columns else None
+        categories = chunk["category"] if "category" in chunk else None
+        chunk["valuation"] = price_services(
+            chunk["base_rate"], chunk["hours"], chunk["expertise_level"], chunk["demand_factor"], factors, categories
+        )
+        yield chunk
+
+
 class Verification:
     @staticmethod
     def verify_product_valuation(product_value, market_value_range):
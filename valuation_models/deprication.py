@@ -3,46 +3,90 @@
 # to overall boost the accuracy of the suggested current valuation.
 # Atleast we're doing it "on paper";
 
-import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
-import pandas as pd
-
-# Historical data simulation (replace this with real data)
-data = {
-    "uniqueness": np.random.uniform(0, 1, 1000),
-    "preciousness": np.random.uniform(0, 1, 1000),
-    "market_trend": np.random.uniform(0.5, 1.5, 1000),
-    "age": np.random.uniform(0, 10, 1000),
-    "depreciation_rate": np.random.uniform(0, 0.2, 1000),  # Target variable
-}
-
-df = pd.DataFrame(data)
-
-# Train/test split
-X = df[["uniqueness", "preciousness", "market_trend", "age"]]
-y = df["depreciation_rate"]
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# Train a regression model
-depreciation_model = RandomForestRegressor(n_estimators=100, random_state=42)
-depreciation_model.fit(X_train, y_train)
-
-# Evaluate the model
-y_pred = depreciation_model.predict(X_test)
-print("Mean Squared Error:", mean_squared_error(y_test, y_pred))
+import os
+import threading
+
+from math_based_approach.instrumentation import timed
+
+# Nothing heavy is imported at module level: numpy, pandas, sklearn and joblib are
+# only loaded when a prediction actually needs the model.
+# Not train_model's depreciation_model.pkl: this model is trained on a different target range
+MODEL_PATH = "valuation_models_depreciation.pkl"
+
+_models = {}  # absolute path -> model
+_model_lock = threading.Lock()
+
+
+def _train_depreciation_model():
+    import numpy as np
+    import pandas as pd
+    from train_model.model_training import FEATURES, TARGET, fit_depreciation_model
+
+    # Historical data simulation (replace this with real data)
+    # Seeded, so every process that has to train ends up with the same model
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        "uniqueness": rng.uniform(0, 1, 1000),
+        "preciousness": rng.uniform(0, 1, 1000),
+        "market_trend": rng.uniform(0.5, 1.5, 1000),
+        "age": rng.uniform(0, 10, 1000),
+        "depreciation_rate": rng.uniform(0, 0.2, 1000),  # Target variable
+    })
+
+    depreciation_model, mse = fit_depreciation_model(df[FEATURES], df[TARGET])
+    print(f"Trained depreciation model with MSE: {mse}")
+    return depreciation_model
+
+
+def get_depreciation_model(path=MODEL_PATH):
+    """
+    The depreciation model stored at `path`, initialised on first use: loaded
+    if it has been persisted, otherwise trained once and saved there for next
+    time. A flattened .npz export next to the pickle is preferred, since
+    serving it never imports sklearn.
+    """
+    key = os.path.abspath(path)
+    model = _models.get(key)
+    if model is None:
+        with _model_lock:
+            model = _models.get(key)
+            if model is None:
+                from train_model.model_registry import load_model
+                flat_path = os.path.splitext(path)[0] + ".npz"
+                if not os.path.exists(path):
+                    import joblib
+                    from train_model.flat_forest import export_forest
+                    trained = _train_depreciation_model()
+                    joblib.dump(trained, path)
+                    export_forest(trained).save(flat_path)
+                if os.path.exists(flat_path) and os.path.getmtime(flat_path) >= os.path.getmtime(path):
+                    path = flat_path
+                model = _models[key] = load_model(path)
+    return model
+
+
+def __getattr__(name):
+    # Keeps `deprication.depreciation_model` working without training at import time
+    if name == "depreciation_model":
+        return get_depreciation_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class ProductValuation:
-    def __init__(self, uniqueness, preciousness, market_trend, age):
+    def __init__(self, uniqueness, preciousness, market_trend, age, predictor=None):
         self.uniqueness = uniqueness
         self.preciousness = preciousness
         self.market_trend = market_trend
         self.age = age
+        self.predictor = predictor  # Optional train_model.batch_predictor.BatchPredictor
 
+    @timed("predict")
     def predict_depreciation(self):
+        if self.predictor is not None:
+            return self.predictor.predict([self.uniqueness, self.preciousness, self.market_trend, self.age])
+        import numpy as np
         input_data = np.array([[self.uniqueness, self.preciousness, self.market_trend, self.age]])
-        predicted_depreciation = depreciation_model.predict(input_data)[0]
+        predicted_depreciation = get_depreciation_model().predict(input_data)[0]
         return predicted_depreciation
 
     def calculate_value(self):
@@ -1,3 +1,6 @@
+from math_based_approach.factors import factor_registry
+
+
 class ProductValuation:
     def __init__(self, category, original_value, years_used,  depreciation_rate, uniqueness_score, preciousness_score, market_trend_factor, additional_factors=None):
         # To Initialize the product valuation model
@@ -12,7 +15,9 @@ class ProductValuation:
         self.preciousness_score=preciousness_score
         self.market_trend_factor=market_trend_factor
         self.category=category
-        self.additional_factors=additional_factors
+        self.additional_factors=additional_factors or {}
+        # Names checked against the factor registry and collapsed (with category defaults) into one multiplier, once
+        self.factor_multiplier=factor_registry.multiplier(self.additional_factors, category)
 
    # Making a separate function for this bcoz i might hve to add some other computation or steps here:
     def calculate_depreciation(self):
@@ -39,6 +44,7 @@ class ProductValuation:
         # Fetch either via API or via tool
         # :param category: (str) Product category to fetch trends for.
         # :return: (dict) Market trend data.
+        import requests
         try:
             response = requests.get(f"https://api.example.com/market-trends/{category}")
             if response.status_code == 200:
@@ -50,11 +56,8 @@ class ProductValuation:
 
     def apply_additional_factors(self, base_value):
         # Adjust the value based on additional (user-defined + LLM + tool) factors.
-        # Each factor should be provided as a multiplier in the dictionary.
-        adjusted_value = base_value
-        for factor, multiplier in self.additional_factors.items():
-            adjusted_value *= multiplier
-        return adjusted_value
+        # Each factor should be provided as a multiplier in the dictionary; they were multiplied together in __init__.
+        return base_value * self.factor_multiplier
 
 
     def get_current_valuation(self):
@@ -69,6 +72,32 @@ class ProductValuation:
 
 
 
+def get_current_valuations(products, factor_columns=()):
+    # Vectorised ProductValuation.get_current_valuation for a whole inventory.
+    # products: DataFrame (or dict of arrays) with original_value, years_used, depreciation_rate,
+    #           uniqueness_score, preciousness_score and market_trend_factor columns.
+    # factor_columns: extra columns applied as additional factors (NaN = not set); a category
+    #                 column also applies the category defaults from the factor registry.
+    # :return: (np.ndarray) Rounded valuations, same values as the per-object path.
+    import numpy as np  # Imported here so the per-object classes stay dependency-free
+    original_value = np.asarray(products["original_value"], dtype=float)
+    years_used = np.asarray(products["years_used"], dtype=float)
+    depreciation_rate = np.asarray(products["depreciation_rate"], dtype=float)
+
+    depreciated_value = original_value * (1 - depreciation_rate) ** years_used
+    with_uniqueness = depreciated_value * (1 + np.asarray(products["uniqueness_score"], dtype=float) * 0.5)
+    with_preciousness = with_uniqueness * (1 + np.asarray(products["preciousness_score"], dtype=float) * 0.3)
+    final_value = with_preciousness * np.asarray(products["market_trend_factor"], dtype=float)
+
+    factors = factor_registry.table_matrix(products, list(factor_columns)) if factor_columns else None
+    categories = products["category"] if "category" in products else None
+    final_value = final_value * factor_registry.multipliers(factors, categories, size=len(final_value))
+    from math_based_approach.vectorized_valuation import round_cents
+    return round_cents(final_value)  # Same cents as the scalar round(final_value, 2)
+
+
+
+
 class ServiceValuation:
     def __init__(self,category, base_rate, hours, expertise_level, demand_factor, additional_factors=None):
         # Initialise the service valutation model.
@@ -83,6 +112,7 @@ class ServiceValuation:
         self.demand_factor = demand_factor
         self.category = category
         self.additional_factors = additional_factors or {}
+        self.factor_multiplier = factor_registry.multiplier(self.additional_factors, category)
 
 
     def calculate_base_value(self):
@@ -104,6 +134,7 @@ class ServiceValuation:
         :param category: (str) Service category to fetch trends for.
         :return: (dict) Market trend data.
         """
+        import requests
         try:
             response = requests.get(f"https://api.example.com/service-trends/{category}")
             if response.status_code == 200:
@@ -115,11 +146,8 @@ class ServiceValuation:
 
     def apply_additional_factors(self, base_value):
         # Adjust the value based on additional user-defined factors.
-        # Each factor should be provided as a multiplier in the dictionary.
-        adjusted_value = base_value
-        for factor, multiplier in self.additional_factors.items():
-            adjusted_value *= multiplier
-        return adjusted_value
+        # Each factor should be provided as a multiplier in the dictionary; they were multiplied together in __init__.
+        return base_value * self.factor_multiplier
 
     def get_current_valuation(self):
         # Compute the final valuation of the service.
@@ -167,6 +195,7 @@ if __name__ == "__main__":
     }
 
     product_valuation = ProductValuation(
+        "electronics",
         original_value,
         years_used,
         depreciation_rate,
@@ -190,6 +219,7 @@ if __name__ == "__main__":
     }
 
     service_valuation = ServiceValuation(
+        "consulting",
         base_rate,
         hours,
         expertise_level,